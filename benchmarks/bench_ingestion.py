@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+SpaceSense Pro - Ingestion throughput benchmark
+Streams the full Celestrak catalog and batches Space-Track lookups against
+the offline replay under several simulated network conditions, so runs are
+repeatable and never touch the real services
+
+Usage: python benchmarks/bench_ingestion.py [active_objects] [debris_per_group]
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# Keep benchmark caches out of the app's .cache directory
+_scratch = tempfile.mkdtemp(prefix="spacesense-bench-")
+os.environ["HTTP_CACHE_DIR"] = os.path.join(_scratch, "http")
+os.environ["CATALOG_SNAPSHOT_DIR"] = os.path.join(_scratch, "catalog")
+
+from src.celestrak_client import celestrak_client
+from src.debris_tracker import DebrisTracker
+from src.http_cache import http_cache
+from src.replay import ReplayService, ReplayTransport
+from src.spacetrack_client import spacetrack_client
+
+SCENARIOS = [
+    ("local", {}),
+    ("wan", {"latency_ms": 80, "latency_jitter_ms": 40, "bandwidth_kbps": 20000}),
+    ("slow link", {"latency_ms": 250, "latency_jitter_ms": 100, "bandwidth_kbps": 2000}),
+    ("lossy", {"latency_ms": 80, "latency_jitter_ms": 40, "bandwidth_kbps": 20000, "error_rate": 0.2}),
+]
+LOOKUPS = 2000
+
+
+async def use_replay(service: ReplayService):
+    """Point both clients at a fresh replay, dropping pooled connections"""
+    await celestrak_client.close()
+    await spacetrack_client.close()
+    celestrak_client.transport = ReplayTransport(service)
+    spacetrack_client.transport = ReplayTransport(service)
+    spacetrack_client.username = spacetrack_client.username or "replay"
+    spacetrack_client.password = spacetrack_client.password or "replay"
+    spacetrack_client.cache.clear()
+
+
+async def ingest(service: ReplayService, cold: bool) -> dict:
+    if cold:
+        http_cache.clear()
+    sent = service.stats["bytes_sent"]
+    requests = service.stats["requests"]
+    tracker = DebrisTracker()
+    started = time.perf_counter()
+    await tracker._ingest_full_catalog()
+    elapsed = time.perf_counter() - started
+    return {
+        "objects": len(tracker.catalog),
+        "megabytes": (service.stats["bytes_sent"] - sent) / 1e6,
+        "requests": service.stats["requests"] - requests,
+        "seconds": elapsed
+    }
+
+
+async def lookups(service: ReplayService, norad_ids) -> dict:
+    requests = service.stats["requests"]
+    started = time.perf_counter()
+    results = await spacetrack_client.get_objects_by_norad_ids(norad_ids)
+    return {
+        "found": sum(1 for value in results.values() if value),
+        "requests": service.stats["requests"] - requests,
+        "seconds": time.perf_counter() - started
+    }
+
+
+async def main():
+    objects = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    group_objects = int(sys.argv[2]) if len(sys.argv) > 2 else 1500
+
+    print(f"🛰️  Replay catalog: {objects} active + 4 x {group_objects} debris objects")
+    print(f"{'scenario':>10} {'cache':>6} {'objects':>8} {'MB':>7} {'requests':>9} {'seconds':>8} {'objects/s':>10}")
+
+    rng = random.Random(7)
+    for name, conditions in SCENARIOS:
+        service = ReplayService(objects=objects, group_objects=group_objects, **conditions)
+        await use_replay(service)
+        for cold in (True, False):
+            result = await ingest(service, cold)
+            rate = result["objects"] / result["seconds"] if result["seconds"] else 0.0
+            print(f"{name:>10} {'cold' if cold else 'warm':>6} {result['objects']:>8} {result['megabytes']:>7.1f} "
+                  f"{result['requests']:>9} {result['seconds']:>8.2f} {rate:>10.0f}")
+
+    print(f"\n🔎 {LOOKUPS} Space-Track NORAD lookups (batched)")
+    print(f"{'scenario':>10} {'found':>8} {'requests':>9} {'seconds':>8}")
+    for name, conditions in SCENARIOS[:2]:
+        service = ReplayService(objects=objects, group_objects=group_objects, **conditions)
+        await use_replay(service)
+        http_cache.clear()
+        catalog = service.spacetrack_catalog()
+        norad_ids = [int(row["NORAD_CAT_ID"]) for row in rng.sample(catalog, min(LOOKUPS, len(catalog)))]
+        result = await lookups(service, norad_ids)
+        print(f"{name:>10} {result['found']:>8} {result['requests']:>9} {result['seconds']:>8.2f}")
+
+    await celestrak_client.close()
+    await spacetrack_client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+SpaceSense Pro - Sharded propagation benchmark
+Measures how ShardedPropagator scales from 1 to N worker processes
+
+Usage: python benchmarks/bench_sharded_propagation.py [objects] [steps]
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.catalog_store import format_tle_lines
+from src.parallel_propagation import ShardedPropagator
+
+
+def synthetic_catalog(count: int, seed: int = 42):
+    """Generate TLE text for a LEO-heavy synthetic catalog"""
+    rng = random.Random(seed)
+    lines1, lines2 = [], []
+    for norad_id in range(1, count + 1):
+        fields = {
+            "norad_id": norad_id,
+            "classification": "U",
+            "intl_designator": "98067A",
+            "epoch_year": 24,
+            "epoch_day": 200.5,
+            "ndot": 0.00001,
+            "nddot": 0.0,
+            "nddot_field": " 00000-0",
+            "bstar": 0.0001,
+            "bstar_field": " 10000-3",
+            "ephemeris_type": 0,
+            "element_set": 999,
+            "checksum1": -1,
+            "inclination": rng.uniform(0, 110),
+            "raan": rng.uniform(0, 360),
+            "eccentricity": rng.uniform(0, 0.02),
+            "arg_perigee": rng.uniform(0, 360),
+            "mean_anomaly": rng.uniform(0, 360),
+            "mean_motion": rng.uniform(11.5, 15.8),
+            "rev_number": 1000,
+            "checksum2": -1,
+        }
+        line1, line2 = format_tle_lines(fields)
+        lines1.append(line1)
+        lines2.append(line2)
+    return lines1, lines2
+
+
+async def run(workers: int, lines1, lines2, times, shard_size: int) -> float:
+    propagator = ShardedPropagator(workers, shard_size)
+    propagator.start()
+    try:
+        await propagator.warm_up()
+        # First call parses shards in the workers; time the steady state
+        await propagator.propagate(("bench", 0), lines1, lines2, times[:1])
+        started = time.perf_counter()
+        await propagator.propagate(("bench", 0), lines1, lines2, times)
+        return time.perf_counter() - started
+    finally:
+        propagator.shutdown()
+
+
+async def main():
+    objects = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    steps = int(sys.argv[2]) if len(sys.argv) > 2 else 120
+    cpus = os.cpu_count() or 1
+
+    lines1, lines2 = synthetic_catalog(objects)
+    start = datetime(2024, 7, 19)
+    times = [start + timedelta(minutes=k) for k in range(steps)]
+
+    worker_counts = sorted({1, *[2 ** k for k in range(1, cpus.bit_length()) if 2 ** k <= cpus], cpus})
+
+    print(f"🛰️  {objects} objects x {steps} time steps, {cpus} CPUs available")
+    print(f"{'workers':>8} {'seconds':>10} {'speedup':>9} {'efficiency':>11}")
+
+    baseline = None
+    for workers in worker_counts:
+        shard_size = max(1, -(-objects // workers))  # one shard per worker
+        elapsed = await run(workers, lines1, lines2, times, shard_size)
+        baseline = baseline or elapsed
+        speedup = baseline / elapsed
+        print(f"{workers:>8} {elapsed:>10.3f} {speedup:>9.2f} {speedup / workers:>10.0%}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -4,9 +4,10 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse, FileResponse
 import json
 import asyncio
-import random
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Optional
 import uvicorn
 import io
 import csv
@@ -18,8 +19,23 @@ from src.websocket_manager import ConnectionManager
 from src.ml_predictor import ml_predictor
 from src.notification_system import notification_system
 from src.trajectory_planner import trajectory_planner
+from src.ground_track import GroundTrackService
 
-app = FastAPI(title="SpaceSense Pro", description="Professional Orbital Debris Intelligence System")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize the system, run the background refresh scheduler, clean up"""
+    app.state.started_at = time.time()
+    await debris_tracker.initialize()
+    await risk_analyzer.initialize()
+    await ml_predictor.initialize()
+    print("🚀 SpaceSense Pro initialized successfully!")
+    yield
+    await risk_analyzer.close()
+    await debris_tracker.close()
+    print("👋 SpaceSense Pro shutdown complete")
+
+app = FastAPI(title="SpaceSense Pro", description="Professional Orbital Debris Intelligence System",
+              lifespan=lifespan)
 
 # Static files and templates
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -27,23 +43,10 @@ templates = Jinja2Templates(directory="templates")
 
 # Initialize components
 debris_tracker = DebrisTracker()
-risk_analyzer = RiskAnalyzer()
+risk_analyzer = RiskAnalyzer(debris_tracker)
 ai_insights = AIInsights()
 manager = ConnectionManager()
-
-@app.on_event("startup")
-async def startup_event():
-    """Initialize the system on startup"""
-    await debris_tracker.initialize()
-    await risk_analyzer.initialize()
-    await ml_predictor.initialize()
-    print("🚀 SpaceSense Pro initialized successfully!")
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Clean up on shutdown"""
-    await debris_tracker.close()
-    print("👋 SpaceSense Pro shutdown complete")
+ground_tracks = GroundTrackService(debris_tracker)
 
 @app.get("/", response_class=HTMLResponse)
 @app.head("/")
@@ -65,6 +68,14 @@ async def get_risk_analysis():
     risk_data = await risk_analyzer.analyze_current_risks()
     return risk_data
 
+@app.get("/api/risk/screening")
+async def get_screening_status():
+    """Get configuration, timing and outcome of the latest conjunction screening"""
+    return {
+        **risk_analyzer.get_screening_stats(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
 @app.get("/api/satellites/tracked")
 async def get_tracked_satellites():
     """Get tracked satellites"""
@@ -83,14 +94,55 @@ async def health_check():
     """Health check endpoint for cloud platforms"""
     return {"status": "healthy", "service": "SpaceSense Pro"}
 
+@app.get("/api/catalog/statistics")
+async def get_catalog_statistics():
+    """Get catalog counts computed from the columnar store"""
+    return {
+        **debris_tracker.get_catalog_statistics(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+@app.get("/api/system/cache-stats")
+async def get_cache_stats():
+    """Get propagation cache hit/miss statistics"""
+    return {
+        **debris_tracker.get_cache_stats(),
+        "ground_track_cache": ground_tracks.get_stats(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+@app.get("/api/system/ephemeris")
+async def get_ephemeris_stats():
+    """Get ephemeris buffer coverage and interpolation error"""
+    return {
+        **debris_tracker.ephemeris.get_stats(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
 @app.post("/api/data/refresh")
-async def refresh_data():
-    """Manually refresh data from external sources"""
+async def refresh_data(source: Optional[str] = None):
+    """Queue a background refresh of one source (or all); returns the job id"""
     try:
-        await debris_tracker.refresh_data()
-        return {"status": "success", "message": "Data refreshed successfully"}
-    except Exception as e:
-        return {"status": "error", "message": str(e)}
+        job_id = debris_tracker.scheduler.enqueue([source] if source else None)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    return {"status": "queued", "job_id": job_id}
+
+@app.get("/api/data/refresh/{job_id}")
+async def get_refresh_job(job_id: str):
+    """Status and per-source outcome of a queued refresh"""
+    job = debris_tracker.scheduler.get_job(job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"error": "Refresh job not found"})
+    return job
+
+@app.get("/api/data/freshness")
+async def get_data_freshness():
+    """Age of each source's last refresh and of the element sets it supplied"""
+    return {
+        "sources": debris_tracker.get_data_freshness(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
 
 @app.get("/api/data/live-update")
 async def get_live_update():
@@ -111,32 +163,18 @@ async def get_live_update():
 async def get_statistics_overview():
     """Get comprehensive statistics overview"""
     try:
-        debris_data = await debris_tracker.get_live_debris()
+        catalog_stats = debris_tracker.get_catalog_statistics()
         risk_data = await risk_analyzer.analyze_current_risks()
         
-        # Calculate statistics
-        total_debris = len([d for d in debris_data if d.get('object_type') == 'debris'])
-        total_satellites = len([d for d in debris_data if d.get('object_type') == 'satellite'])
-        
-        # Altitude distribution
-        altitude_ranges = {
-            'LEO (200-2000km)': len([d for d in debris_data if 200 <= d.get('altitude', 0) <= 2000]),
-            'MEO (2000-35786km)': len([d for d in debris_data if 2000 < d.get('altitude', 0) <= 35786]),
-            'GEO (35786km+)': len([d for d in debris_data if d.get('altitude', 0) > 35786])
-        }
-        
         # Risk distribution
-        risk_distribution = {
-            'high': len([d for d in debris_data if d.get('risk_level') == 'high']),
-            'medium': len([d for d in debris_data if d.get('risk_level') == 'medium']),
-            'low': len([d for d in debris_data if d.get('risk_level') == 'low'])
-        }
+        risk_counts = catalog_stats["risk_distribution"]
+        risk_distribution = {level: risk_counts.get(level, 0) for level in ('high', 'medium', 'low')}
         
         return {
-            "total_objects": len(debris_data),
-            "total_debris": total_debris,
-            "total_satellites": total_satellites,
-            "altitude_distribution": altitude_ranges,
+            "total_objects": catalog_stats["total_objects"],
+            "total_debris": catalog_stats["object_types"].get('debris', 0),
+            "total_satellites": catalog_stats["object_types"].get('satellite', 0),
+            "altitude_distribution": catalog_stats["altitude_distribution"],
             "risk_distribution": risk_distribution,
             "collision_probability": risk_data.get('collision_probability', {}),
             "timestamp": datetime.utcnow().isoformat()
@@ -166,12 +204,17 @@ async def get_debris_heatmap():
     except Exception as e:
         return {"error": str(e)}
 
+def observer_from_query(lat: float = None, lon: float = None, alt: float = None):
+    """Observer tuple from query parameters, or None for the configured default"""
+    if lat is None or lon is None:
+        return None
+    return (lat, lon, alt or 0.0)
+
 @app.get("/api/satellites/details/{norad_id}")
-async def get_satellite_details(norad_id: int):
+async def get_satellite_details(norad_id: int, lat: float = None, lon: float = None, alt: float = None):
     """Get detailed information about a specific satellite"""
     try:
-        satellites = await debris_tracker.get_tracked_satellites()
-        satellite = next((s for s in satellites if s.get('id') == norad_id), None)
+        satellite = await debris_tracker.get_satellite(norad_id)
         
         if not satellite:
             return {"error": "Satellite not found"}
@@ -179,28 +222,80 @@ async def get_satellite_details(norad_id: int):
         # Add additional details
         satellite['orbital_period'] = 90 + (satellite.get('altitude', 400) / 10)
         satellite['velocity_ms'] = satellite.get('velocity', 7.66) * 1000
-        satellite['next_pass'] = (datetime.utcnow() + timedelta(minutes=45)).isoformat()
+
+        now = datetime.utcnow().isoformat()
+        passes = (await debris_tracker.predict_passes([norad_id], observer_from_query(lat, lon, alt))).get(norad_id, [])
+        upcoming = [p for p in passes if p['rise_time'] >= now]
+        satellite['next_pass'] = upcoming[0]['rise_time'] if upcoming else None
+        satellite['next_pass_details'] = upcoming[0] if upcoming else None
         
         return satellite
     except Exception as e:
         return {"error": str(e)}
 
+@app.get("/api/satellites/passes")
+async def get_satellite_passes(norad_ids: str = None, lat: float = None, lon: float = None,
+                               alt: float = None, hours: float = 48.0, min_elevation: float = 0.0):
+    """Predict passes over an observer for a comma-separated list of NORAD IDs"""
+    try:
+        if norad_ids:
+            ids = [int(value) for value in norad_ids.split(",") if value.strip()]
+        else:
+            ids = [sat["norad_id"] for sat in debris_tracker.satellites]
+        hours = min(max(hours, 1.0), 240.0)
+
+        passes = await debris_tracker.predict_passes(ids, observer_from_query(lat, lon, alt), hours, min_elevation)
+        return {
+            "passes": {str(norad_id): events for norad_id, events in passes.items()},
+            "hours": hours,
+            "min_elevation": min_elevation,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
+@app.get("/api/satellites/{norad_id}/tle-history")
+async def get_tle_history(norad_id: int):
+    """List the element set epochs stored for an object"""
+    epochs = debris_tracker.get_tle_history(norad_id)
+    if not epochs:
+        return JSONResponse(status_code=404, content={"error": "No element sets stored for this object"})
+    return {"norad_id": norad_id, "epochs": epochs, "count": len(epochs)}
+
+def parse_utc_timestamp(value: str) -> datetime:
+    """Parse an ISO-8601 timestamp into a naive UTC datetime"""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = (parsed - parsed.utcoffset()).replace(tzinfo=None)
+    return parsed
+
+@app.get("/api/satellites/{norad_id}/groundtrack")
+async def get_ground_track(norad_id: int, start: str = None, end: str = None, step: float = 60.0):
+    """Stream an object's ground track as NDJSON (one point per line)"""
+    try:
+        start_time = parse_utc_timestamp(start) if start else ground_tracks.default_start(step)
+        end_time = parse_utc_timestamp(end) if end else start_time + timedelta(minutes=90)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": f"Invalid timestamp: {e}"})
+
+    problem = ground_tracks.validate_window(start_time, end_time, step)
+    if problem:
+        return JSONResponse(status_code=400, content={"error": problem})
+
+    if debris_tracker.find_object(norad_id) is None:
+        return JSONResponse(status_code=404, content={"error": "Object not found"})
+
+    problem, track = await ground_tracks.open_stream(norad_id, start_time, end_time, step)
+    if problem:
+        return JSONResponse(status_code=422, content={"error": problem})
+
+    return StreamingResponse(track, media_type="application/x-ndjson")
+
 @app.get("/api/predictions/collision-forecast")
 async def get_collision_forecast():
-    """Get collision probability forecast for next 7 days"""
+    """Get collision probability forecast for next 7 days from the latest screening"""
     try:
-        forecast = []
-        base_probability = 0.02
-        
-        for day in range(7):
-            date = datetime.utcnow() + timedelta(days=day)
-            probability = base_probability + (day * 0.005) + (random.uniform(-0.01, 0.01))
-            
-            forecast.append({
-                "date": date.strftime("%Y-%m-%d"),
-                "probability": max(0, min(1, probability)),
-                "confidence": 0.75 + (random.uniform(-0.1, 0.1))
-            })
+        forecast = risk_analyzer.collision_forecast()
         
         return {
             "forecast": forecast,
@@ -224,7 +319,8 @@ async def get_active_alerts():
                     "id": conj.get('id'),
                     "type": "conjunction",
                     "severity": "high",
-                    "message": f"Critical conjunction: {conj.get('primary_object')} and {conj.get('secondary_object')}",
+                    "message": f"Critical conjunction: {conj.get('primary_object')} and {conj.get('secondary_object')} "
+                               f"(Pc {conj.get('collision_probability', 0):.1e}, miss {conj.get('miss_distance', 0):.2f} km)",
                     "time": conj.get('time_of_closest_approach'),
                     "details": conj
                 })
@@ -507,9 +603,11 @@ async def plan_multi_threat_avoidance(satellite_id: int):
         
         satellite = {"id": satellite_id, "altitude": 400, "velocity": 7.66, "mass": 1000}
         
-        # Add time_to_closest_approach to threats
+        # Hours from now to each threat's refined time of closest approach
+        now = datetime.utcnow()
         for threat in threats:
-            threat["time_to_closest_approach"] = random.uniform(2, 48)
+            tca = datetime.fromisoformat(threat["time_of_closest_approach"])
+            threat["time_to_closest_approach"] = max(0.0, (tca - now).total_seconds() / 3600.0)
         
         strategy = await trajectory_planner.plan_multi_threat_avoidance(satellite, threats)
         return strategy
@@ -519,19 +617,27 @@ async def plan_multi_threat_avoidance(satellite_id: int):
 @app.get("/api/analytics/comprehensive")
 async def get_comprehensive_analytics():
     """Get comprehensive analytics dashboard"""
+    started = time.perf_counter()
     try:
-        debris_data = await debris_tracker.get_live_debris()
+        catalog_stats = debris_tracker.get_catalog_statistics()
+        risk_counts = catalog_stats["risk_distribution"]
         risk_data = await risk_analyzer.analyze_current_risks()
         ml_stats = await ml_predictor.get_model_stats()
         notification_stats = await notification_system.get_alert_statistics()
         trajectory_stats = await trajectory_planner.get_maneuver_statistics()
         
+        # Minutes since each source last refreshed successfully (None if never)
+        freshness = {
+            source: round(stats["age_seconds"] / 60.0, 1) if stats["age_seconds"] is not None else None
+            for source, stats in debris_tracker.get_data_freshness().items()
+        }
+        
         return {
             "debris_tracking": {
-                "total_objects": len(debris_data),
-                "high_risk": len([d for d in debris_data if d.get("risk_level") == "high"]),
-                "medium_risk": len([d for d in debris_data if d.get("risk_level") == "medium"]),
-                "low_risk": len([d for d in debris_data if d.get("risk_level") == "low"])
+                "total_objects": catalog_stats["debris_objects"],
+                "high_risk": risk_counts.get("high", 0),
+                "medium_risk": risk_counts.get("medium", 0),
+                "low_risk": risk_counts.get("low", 0)
             },
             "risk_analysis": risk_data,
             "ml_predictions": ml_stats,
@@ -539,9 +645,9 @@ async def get_comprehensive_analytics():
             "trajectory_planning": trajectory_stats,
             "system_health": {
                 "status": "operational",
-                "uptime_hours": random.uniform(100, 1000),
-                "api_response_time_ms": random.uniform(10, 50),
-                "data_freshness_minutes": random.uniform(1, 5)
+                "uptime_hours": round((time.time() - app.state.started_at) / 3600.0, 2),
+                "api_response_time_ms": round((time.perf_counter() - started) * 1000.0, 1),  # building this response
+                "data_freshness_minutes": freshness
             },
             "timestamp": datetime.utcnow().isoformat()
         }
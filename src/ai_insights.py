@@ -1,10 +1,13 @@
 import google.generativeai as genai
+import asyncio
 import os
 import random
 from datetime import datetime
 from typing import Dict, List
 import json
 
+from .single_flight import single_flight
+
 class AIInsights:
     def __init__(self):
         # Configure Gemini API
@@ -15,6 +18,7 @@ class AIInsights:
         else:
             self.model = None
             
+    @single_flight()
     async def generate_insights(self) -> Dict:
         """Generate AI-powered insights about orbital debris"""
         
@@ -31,7 +35,8 @@ class AIInsights:
                 Provide a concise, technical analysis suitable for space mission operators.
                 """
                 
-                response = self.model.generate_content(prompt)
+                # Off the event loop, so concurrent callers can join this call
+                response = await asyncio.to_thread(self.model.generate_content, prompt)
                 ai_analysis = response.text
                 
             except Exception as e:
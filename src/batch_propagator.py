@@ -0,0 +1,109 @@
+"""
+Vectorized batch SGP4 propagation engine
+Propagates a whole catalog at one or more timestamps in a single call
+"""
+
+import math
+from datetime import datetime, timezone
+from typing import Dict, List, Sequence, Union
+
+import numpy as np
+
+from .frames import frame_cache
+
+try:
+    from sgp4.api import Satrec, SatrecArray, WGS72
+    HAS_SGP4 = True
+except ImportError:
+    HAS_SGP4 = False
+
+UNIX_EPOCH_JD = 2440587.5
+
+TimeInput = Union[datetime, Sequence[datetime]]
+
+
+class BatchPropagator:
+    """Propagates arrays of SGP4 element sets with one vectorized call"""
+
+    def __init__(self):
+        self.available = HAS_SGP4
+        if self.available:
+            print("✅ SGP4 batch propagation available")
+        else:
+            print("⚠️  SGP4 not available, batch propagation disabled")
+
+    def satrec_from_tle(self, line1: str, line2: str):
+        """Parse a TLE into an initialised SGP4 record"""
+        return Satrec.twoline2rv(line1, line2, WGS72)
+
+    def satrec_from_elements(self, norad_id: int, epoch: Union[datetime, float], elements: Dict):
+        """Initialise an SGP4 record from mean elements (degrees, rev/day)
+
+        ``epoch`` is a datetime or a Julian date.
+        """
+        satrec = Satrec()
+        epoch_jd = self._datetime_to_jd(epoch) if isinstance(epoch, datetime) else float(epoch)
+        epoch_days = epoch_jd - 2433281.5  # days since 1949 Dec 31 00:00 UT
+        satrec.sgp4init(
+            WGS72, 'i', int(norad_id), epoch_days,
+            float(elements.get("bstar", 0.0)),
+            float(elements.get("ndot", 0.0)),
+            float(elements.get("nddot", 0.0)),
+            float(elements["eccentricity"]),
+            math.radians(float(elements["arg_perigee"])),
+            math.radians(float(elements["inclination"])),
+            math.radians(float(elements["mean_anomaly"])),
+            float(elements["mean_motion"]) * 2.0 * math.pi / 1440.0,  # rad/min
+            math.radians(float(elements["raan"]))
+        )
+        return satrec
+
+    def build_array(self, satrecs: List):
+        """Pack SGP4 records into a SatrecArray for vectorized propagation"""
+        return SatrecArray(satrecs)
+
+    def propagate(self, satrec_array, times: TimeInput) -> Dict:
+        """Propagate every object in the array at every requested time
+
+        Returns arrays shaped (objects, times): TEME position/velocity,
+        geodetic latitude/longitude/altitude, speed and a validity mask.
+        """
+        time_list = [times] if isinstance(times, datetime) else list(times)
+        jd, fr = self.split_julian_dates(time_list)
+
+        error, position, velocity = satrec_array.sgp4(jd, fr)
+        latitude, longitude, altitude = frame_cache.teme_to_geodetic(position, jd + fr)
+        speed = np.sqrt(np.sum(velocity * velocity, axis=-1))
+
+        valid = (error == 0) & np.isfinite(altitude)
+
+        return {
+            "times": time_list,
+            "position": position,
+            "velocity_vector": velocity,
+            "latitude": latitude,
+            "longitude": longitude,
+            "altitude": altitude,
+            "velocity": speed,
+            "error": error,
+            "valid": valid
+        }
+
+    def split_julian_dates(self, time_list: List[datetime]):
+        """Julian dates split into whole and fractional parts for precision"""
+        days = np.array([self._unix_seconds(t) for t in time_list], dtype=np.float64) / 86400.0
+        whole = np.floor(days)
+        return whole + UNIX_EPOCH_JD, days - whole
+
+    def _datetime_to_jd(self, when: datetime) -> float:
+        return self._unix_seconds(when) / 86400.0 + UNIX_EPOCH_JD
+
+    def _unix_seconds(self, when: datetime) -> float:
+        # Naive datetimes are UTC throughout the app (datetime.utcnow())
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return when.timestamp()
+
+
+# Global instance
+batch_propagator = BatchPropagator()
@@ -0,0 +1,130 @@
+"""
+Versioned binary snapshots of the column catalog
+Each column is written as a .npy file next to a JSON string table, so a
+restart can memory-map the last ingested catalog instead of waiting on the
+network and re-parsing JSON
+"""
+
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+import numpy as np
+
+from .catalog_store import CatalogStore
+
+CATALOG_SNAPSHOT_DIR = os.getenv("CATALOG_SNAPSHOT_DIR", ".cache/catalog")
+
+# Bump when the column layout or file structure changes; older snapshots
+# are then ignored rather than misread
+SNAPSHOT_FORMAT_VERSION = 2
+
+CURRENT_FILE = "CURRENT"
+MANIFEST_FILE = "manifest.json"
+STRINGS_FILE = "strings.json"
+
+
+class CatalogSnapshot:
+    """Writes and memory-maps catalog snapshots under one directory
+
+    Every save goes to a fresh ``catalog-<ns>`` directory and is published
+    by atomically rewriting the ``CURRENT`` pointer, so a crash mid-write
+    never leaves a half-written snapshot in use. Older snapshots are
+    removed after the switch; mapped files stay valid until unmapped.
+    """
+
+    def __init__(self, directory: str = CATALOG_SNAPSHOT_DIR):
+        self.directory = directory
+        self.last_saved: Optional[Dict] = None
+        self.last_loaded: Optional[Dict] = None
+
+    def save(self, catalog: CatalogStore) -> Optional[str]:
+        """Write the catalog's columns and string table; returns the snapshot name"""
+        if len(catalog) == 0:
+            return None
+        started = time.perf_counter()
+        name = f"catalog-{time.time_ns()}"
+        path = os.path.join(self.directory, name)
+        os.makedirs(path)
+
+        columns = dict(catalog.columns)
+        for column, values in columns.items():
+            np.save(os.path.join(path, f"{column}.npy"), np.ascontiguousarray(values), allow_pickle=False)
+        with open(os.path.join(path, STRINGS_FILE), "w") as f:
+            json.dump(catalog.categories, f)
+
+        manifest = {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "created": datetime.utcnow().isoformat(),
+            "objects": len(catalog),
+            "columns": {column: values.dtype.str for column, values in columns.items()}
+        }
+        with open(os.path.join(path, MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f)
+
+        pointer = os.path.join(self.directory, CURRENT_FILE)
+        with open(pointer + ".tmp", "w") as f:
+            f.write(name)
+        os.replace(pointer + ".tmp", pointer)
+        self._remove_old(keep=name)
+
+        self.last_saved = {**manifest, "name": name, "seconds": round(time.perf_counter() - started, 4)}
+        return name
+
+    def load(self, catalog: CatalogStore) -> bool:
+        """Memory-map the current snapshot into ``catalog``; False if there is none usable"""
+        started = time.perf_counter()
+        try:
+            with open(os.path.join(self.directory, CURRENT_FILE)) as f:
+                name = f.read().strip()
+        except FileNotFoundError:
+            return False
+
+        path = os.path.join(self.directory, name)
+        try:
+            with open(os.path.join(path, MANIFEST_FILE)) as f:
+                manifest = json.load(f)
+            if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+                print(f"⚠️  Ignoring catalog snapshot {name}: format {manifest.get('format_version')}")
+                return False
+
+            expected = {column: values.dtype.str for column, values in catalog.columns.items()}
+            if manifest["columns"] != expected:
+                print(f"⚠️  Ignoring catalog snapshot {name}: column layout changed")
+                return False
+
+            # Plain ndarray views of the maps: same pages, without memmap's
+            # Python-level indexing overhead on every scalar read
+            columns = {
+                column: np.load(os.path.join(path, f"{column}.npy"), mmap_mode="r", allow_pickle=False).view(np.ndarray)
+                for column in expected
+            }
+            with open(os.path.join(path, STRINGS_FILE)) as f:
+                categories = json.load(f)
+            catalog.load_columns(columns, categories)
+        except Exception as e:
+            print(f"⚠️  Catalog snapshot {name} unreadable: {e}")
+            return False
+
+        self.last_loaded = {**manifest, "name": name, "seconds": round(time.perf_counter() - started, 4)}
+        return True
+
+    def _remove_old(self, keep: str):
+        for entry in os.listdir(self.directory):
+            if entry.startswith("catalog-") and entry != keep:
+                shutil.rmtree(os.path.join(self.directory, entry), ignore_errors=True)
+
+    def get_stats(self) -> Dict:
+        return {
+            "directory": self.directory,
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "last_saved": self.last_saved,
+            "last_loaded": self.last_loaded
+        }
+
+
+# Global instance
+catalog_snapshot = CatalogSnapshot()
@@ -0,0 +1,624 @@
+"""
+Columnar (struct-of-arrays) catalog store
+Holds orbital elements, derived quantities and categorical codes in NumPy
+arrays, with lightweight row views for the JSON endpoints
+"""
+
+import math
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+MU_EARTH = 398600.4418  # km^3/s^2
+EARTH_RADIUS = 6378.137  # km
+
+ALPHA5_LETTERS = "ABCDEFGHJKLMNPQRSTUVWXYZ"
+
+# TLE fields parsed into numeric columns. Angles only need the 4 decimals
+# a TLE carries, so they fit in float32; mean motion, eccentricity and the
+# epoch need float64 to reproduce the TLE text exactly.
+ELEMENT_COLUMNS = {
+    "norad_id": np.int32,
+    "epoch_year": np.int16,
+    "epoch_day": np.float64,
+    "ndot": np.float64,
+    "nddot": np.float32,
+    "bstar": np.float32,
+    "inclination": np.float32,
+    "raan": np.float32,
+    "eccentricity": np.float64,
+    "arg_perigee": np.float32,
+    "mean_anomaly": np.float32,
+    "mean_motion": np.float64,
+    "rev_number": np.int32,
+    "element_set": np.int16,
+    "ephemeris_type": np.int8,
+    "checksum1": np.int8,
+    "checksum2": np.int8,
+}
+
+# Quantities derived from the elements at load time
+DERIVED_COLUMNS = {
+    "semi_major_axis": np.float32,
+    "perigee": np.float32,
+    "apogee": np.float32,
+    "period": np.float32,
+}
+
+# Fixed-width byte strings
+STRING_COLUMNS = {
+    "name": "S24",
+    "intl_designator": "S8",
+    "classification": "S1",
+    "nddot_field": "S8",
+    "bstar_field": "S8",
+    "launch_date": "S10",
+    "decay_date": "S10",
+}
+
+# Low-cardinality strings stored as codes into a per-column category table.
+# Code 0 is reserved for "absent".
+CATEGORICAL_COLUMNS = (
+    "collection",
+    "object_type",
+    "risk_level",
+    "mission_type",
+    "country_code",
+    "rcs_size",
+    "data_source",
+)
+
+# Per-refresh timestamps, stored as POSIX seconds (NaN = absent) rather than
+# as categories: every refresh brings a new value, so a category table
+# would grow without bound
+TIMESTAMP_COLUMNS = ("last_updated",)
+
+# Fields that are omitted from row views when absent
+OPTIONAL_FIELDS = ("mission_type", "country_code", "rcs_size", "data_source", "last_updated")
+
+
+# Checksum value of every byte: digits count as themselves, '-' as 1
+_CHECKSUM_VALUES = bytes(
+    code - ord('0') if ord('0') <= code <= ord('9') else 1 if code == ord('-') else 0
+    for code in range(256)
+)
+
+
+def tle_checksum(line: str) -> int:
+    """Modulo-10 TLE checksum (digits count, '-' counts as 1)"""
+    # Byte translation and sum run in C; much faster than a per-character loop
+    return sum(line[:68].encode("ascii", "replace").translate(_CHECKSUM_VALUES)) % 10
+
+
+def parse_exponent_field(field: str) -> float:
+    """Parse TLE implied-decimal exponent fields such as ' 40768-4'"""
+    field = field.strip()
+    if not field:
+        return 0.0
+    sign = -1.0 if field[0] == '-' else 1.0
+    field = field.lstrip('+-')
+    mantissa = float("0." + field[:-2].strip())
+    exponent = int(field[-2:])
+    return sign * mantissa * 10.0 ** exponent
+
+
+def format_exponent_field(value: float) -> str:
+    """Format a value as an 8-character TLE exponent field"""
+    if value == 0.0 or not math.isfinite(value):
+        return " 00000-0"
+    sign = '-' if value < 0 else ' '
+    exponent = int(math.floor(math.log10(abs(value)))) + 1
+    mantissa = int(round(abs(value) / 10.0 ** exponent * 1e5))
+    if mantissa >= 100000:
+        mantissa //= 10
+        exponent += 1
+    exp_sign = '-' if exponent < 0 else '+'
+    return f"{sign}{mantissa:05d}{exp_sign}{abs(exponent)}"
+
+
+def _timestamp(value) -> float:
+    """POSIX seconds for an ISO-8601 timestamp (NaN when absent or unparsable)"""
+    if not value:
+        return math.nan
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        return math.nan
+
+
+def _isoformat(value: float) -> Optional[str]:
+    return None if math.isnan(value) else datetime.fromtimestamp(value).isoformat()
+
+
+def parse_satnum(field: str) -> int:
+    """Parse a catalog number, including Alpha-5 numbers above 99999"""
+    field = field.strip()
+    if field and field[0].isalpha():
+        return (ALPHA5_LETTERS.index(field[0].upper()) + 10) * 10000 + int(field[1:])
+    return int(field)
+
+
+def format_satnum(norad_id: int) -> str:
+    if norad_id < 100000:
+        return f"{norad_id:05d}"
+    return f"{ALPHA5_LETTERS[norad_id // 10000 - 10]}{norad_id % 10000:04d}"
+
+
+def parse_tle_fields(line1: str, line2: str) -> Dict:
+    """Parse the element fields of a TLE into numbers"""
+    checksum1 = line1[68:69]
+    checksum2 = line2[68:69]
+    return {
+        "norad_id": parse_satnum(line1[2:7]),
+        "classification": line1[7:8].strip() or "U",
+        "intl_designator": line1[9:17].strip(),
+        "epoch_year": int(line1[18:20]),
+        "epoch_day": float(line1[20:32]),
+        "ndot": float(line1[33:43].replace(' ', '') or 0.0),
+        "nddot": parse_exponent_field(line1[44:52]),
+        "nddot_field": line1[44:52],
+        "bstar": parse_exponent_field(line1[53:61]),
+        "bstar_field": line1[53:61],
+        "ephemeris_type": int(line1[62:63].strip() or 0),
+        "element_set": int(line1[64:68].strip() or 0),
+        "checksum1": int(checksum1) if checksum1.isdigit() else -1,
+        "inclination": float(line2[8:16]),
+        "raan": float(line2[17:25]),
+        "eccentricity": float("0." + line2[26:33].strip()),
+        "arg_perigee": float(line2[34:42]),
+        "mean_anomaly": float(line2[43:51]),
+        "mean_motion": float(line2[52:63]),
+        "rev_number": int(line2[63:68].strip() or 0),
+        "checksum2": int(checksum2) if checksum2.isdigit() else -1,
+    }
+
+
+def format_tle_lines(fields: Dict) -> tuple:
+    """Rebuild TLE line1/line2 text from parsed element fields
+
+    The original exponent-field text is reused when available so that
+    non-normalised fields round-trip exactly.
+    """
+    satnum = format_satnum(int(fields["norad_id"]))
+    ndot = float(fields["ndot"])
+    ndot_text = ('-' if ndot < 0 else ' ') + f"{abs(ndot):.8f}"[1:]
+    nddot_text = fields.get("nddot_field") or format_exponent_field(float(fields["nddot"]))
+    bstar_text = fields.get("bstar_field") or format_exponent_field(float(fields["bstar"]))
+
+    line1 = (
+        f"1 {satnum}{fields['classification'] or 'U'} {fields['intl_designator']:<8} "
+        f"{int(fields['epoch_year']):02d}{float(fields['epoch_day']):012.8f} "
+        f"{ndot_text} {nddot_text:>8} {bstar_text:>8} "
+        f"{int(fields['ephemeris_type'])} {int(fields['element_set']):4d}"
+    )
+    line2 = (
+        f"2 {satnum} {float(fields['inclination']):8.4f} {float(fields['raan']):8.4f} "
+        f"{int(round(float(fields['eccentricity']) * 1e7)):07d} "
+        f"{float(fields['arg_perigee']):8.4f} {float(fields['mean_anomaly']):8.4f} "
+        f"{float(fields['mean_motion']):11.8f}{int(fields['rev_number']) % 100000:5d}"
+    )
+
+    checksum1 = int(fields["checksum1"])
+    checksum2 = int(fields["checksum2"])
+    line1 += str(checksum1 if checksum1 >= 0 else tle_checksum(line1))
+    line2 += str(checksum2 if checksum2 >= 0 else tle_checksum(line2))
+    return line1, line2
+
+
+def omm_to_tle_lines(omm: Dict) -> tuple:
+    """Build TLE text from a CCSDS OMM record (Celestrak/Space-Track GP JSON)"""
+    epoch = datetime.fromisoformat(str(omm["EPOCH"]).rstrip("Z"))
+    start_of_year = datetime(epoch.year, 1, 1)
+    epoch_day = 1.0 + (epoch - start_of_year).total_seconds() / 86400.0
+
+    # "1998-067A" -> "98067A"
+    object_id = str(omm.get("OBJECT_ID") or "")
+    intl_designator = object_id[2:4] + object_id[5:] if len(object_id) > 5 else object_id
+
+    return format_tle_lines({
+        "norad_id": int(omm["NORAD_CAT_ID"]),
+        "classification": str(omm.get("CLASSIFICATION_TYPE") or "U"),
+        "intl_designator": intl_designator,
+        "epoch_year": epoch.year % 100,
+        "epoch_day": epoch_day,
+        "ndot": float(omm.get("MEAN_MOTION_DOT") or 0.0),
+        "nddot": float(omm.get("MEAN_MOTION_DDOT") or 0.0),
+        "bstar": float(omm.get("BSTAR") or 0.0),
+        "ephemeris_type": int(omm.get("EPHEMERIS_TYPE") or 0),
+        "element_set": int(omm.get("ELEMENT_SET_NO") or 0) % 10000,
+        "inclination": float(omm["INCLINATION"]),
+        "raan": float(omm["RA_OF_ASC_NODE"]),
+        "eccentricity": float(omm["ECCENTRICITY"]),
+        "arg_perigee": float(omm["ARG_OF_PERICENTER"]),
+        "mean_anomaly": float(omm["MEAN_ANOMALY"]),
+        "mean_motion": float(omm["MEAN_MOTION"]),
+        "rev_number": int(omm.get("REV_AT_EPOCH") or 0),
+        "checksum1": -1,
+        "checksum2": -1,
+    })
+
+
+class CatalogRow(Mapping):
+    """Read-only dict-like view of one catalog row"""
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store: "CatalogStore", index: int):
+        self._store = store
+        self._index = index
+
+    def __getitem__(self, key):
+        return self._store.get_value(key, self._index)
+
+    def __iter__(self):
+        return iter(self._store.row_keys(self._index))
+
+    def __len__(self):
+        return len(self._store.row_keys(self._index))
+
+    def to_dict(self) -> Dict:
+        return {key: self[key] for key in self}
+
+    def __repr__(self):
+        return f"CatalogRow({self.to_dict()!r})"
+
+
+class CatalogStore:
+    """Struct-of-arrays catalog of tracked objects"""
+
+    def __init__(self):
+        self.columns: Dict[str, np.ndarray] = {}
+        self.categories: Dict[str, List[str]] = {}
+        self._category_codes: Dict[str, Dict[str, int]] = {}
+        self.version = 0
+        self._line_cache: Dict[int, tuple] = {}
+
+        for name, dtype in {**ELEMENT_COLUMNS, **DERIVED_COLUMNS}.items():
+            self.columns[name] = np.zeros(0, dtype=dtype)
+        for name, dtype in STRING_COLUMNS.items():
+            self.columns[name] = np.zeros(0, dtype=dtype)
+        self.columns["size_estimate"] = np.zeros(0, dtype=np.float64)
+        for name in TIMESTAMP_COLUMNS:
+            self.columns[name] = np.zeros(0, dtype=np.float64)
+        for name in CATEGORICAL_COLUMNS:
+            self.columns[name] = np.zeros(0, dtype=np.int16)
+            self.categories[name] = [""]
+            self._category_codes[name] = {"": 0}
+
+    def __len__(self):
+        return len(self.columns["norad_id"])
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def replace_collection(self, collection: str, records: Iterable[Dict]) -> int:
+        """Replace every row of a collection with new records"""
+        return self.replace_collection_chunks(collection, [self.encode_records(collection, records)])
+
+    def replace_collection_chunks(self, collection: str, chunks: Sequence[Dict[str, np.ndarray]]) -> int:
+        """Replace a collection with column chunks from ``encode_records``
+
+        Streaming ingestion encodes a few thousand records at a time so the
+        per-record dicts never accumulate for the whole catalog.
+        """
+        keep = self.columns["collection"] != self.code("collection", collection)
+
+        for name in self.columns:
+            self.columns[name] = np.concatenate(
+                [self.columns[name][keep]] + [chunk[name] for chunk in chunks]
+            )
+
+        self._line_cache.clear()
+        self.version += 1
+        return sum(len(chunk["norad_id"]) for chunk in chunks)
+
+    def apply_updates(self, collection: str, chunks: Sequence[Dict[str, np.ndarray]],
+                      remove_missing: bool = True) -> Dict:
+        """Bring a collection in line with incoming chunks, touching only what changed
+
+        Objects are matched by NORAD ID. A matched object whose epoch
+        differs is overwritten in place, objects no longer listed are
+        removed and new ones appended. Pass ``remove_missing=False`` when
+        the chunks are not the complete collection (a partial download or a
+        limited backup query) so unlisted objects are kept. Returns a
+        change event describing the delta; the version only moves when
+        something changed.
+        """
+        incoming = {
+            name: np.concatenate([chunk[name] for chunk in chunks]) if chunks else column[:0]
+            for name, column in self.columns.items()
+        }
+        # One row per object; the first listing wins, as in streaming ingestion
+        _, first = np.unique(incoming["norad_id"], return_index=True)
+        if len(first) != len(incoming["norad_id"]):
+            first.sort()
+            incoming = {name: column[first] for name, column in incoming.items()}
+        incoming_ids = incoming["norad_id"]
+
+        current = self.indices(collection=collection)
+        order = np.argsort(self.columns["norad_id"][current], kind="stable")
+        sorted_ids = self.columns["norad_id"][current][order]
+        position = np.minimum(np.searchsorted(sorted_ids, incoming_ids), max(len(sorted_ids) - 1, 0))
+        found = (sorted_ids[position] == incoming_ids) if len(sorted_ids) else np.zeros(len(incoming_ids), bool)
+        target = current[order[position]] if len(current) else np.zeros(len(incoming_ids), dtype=np.int64)
+
+        changed = found.copy()
+        changed[found] = (
+            (self.columns["epoch_year"][target[found]] != incoming["epoch_year"][found])
+            | (self.columns["epoch_day"][target[found]] != incoming["epoch_day"][found])
+        )
+        added = ~found
+        present = np.zeros(len(current), dtype=bool)
+        present[order[position[found]]] = True
+        removed_rows = current[~present] if remove_missing else current[:0]
+
+        event = {
+            "collection": collection,
+            "previous_version": self.version,
+            "version": self.version,
+            "added": incoming_ids[added].astype(np.int64),
+            "changed": incoming_ids[changed].astype(np.int64),
+            # Duplicate rows of a still-listed object are dropped, not reported removed
+            "removed": np.setdiff1d(self.columns["norad_id"][removed_rows], incoming_ids).astype(np.int64),
+            "rows": np.zeros(0, dtype=np.int64),
+            "index_map": None,
+            "unchanged": int(np.count_nonzero(found & ~changed))
+        }
+        if not changed.any() and not added.any() and len(removed_rows) == 0:
+            return event
+
+        changed_rows = target[changed]
+        if len(changed_rows):
+            for name, column in self.columns.items():
+                if not column.flags.writeable:
+                    column = self.columns[name] = column.copy()
+                column[changed_rows] = incoming[name][changed]
+            for index in changed_rows.tolist():
+                self._line_cache.pop(index, None)
+
+        if len(removed_rows):
+            keep = np.ones(len(self), dtype=bool)
+            keep[removed_rows] = False
+            index_map = np.where(keep, np.cumsum(keep) - 1, -1)
+            self.columns = {name: column[keep] for name, column in self.columns.items()}
+            changed_rows = index_map[changed_rows]
+            event["index_map"] = index_map
+            self._line_cache.clear()
+
+        first_added = len(self)
+        if added.any():
+            self.columns = {
+                name: np.concatenate([column, incoming[name][added]])
+                for name, column in self.columns.items()
+            }
+
+        self.version += 1
+        event["version"] = self.version
+        event["rows"] = np.concatenate([changed_rows, np.arange(first_added, len(self))]).astype(np.int64)
+        return event
+
+    def load_columns(self, columns: Dict[str, np.ndarray], categories: Dict[str, List[str]]):
+        """Adopt complete column arrays and category tables (e.g. a mapped snapshot)
+
+        Arrays are used as given, read-only memory maps included; later
+        collection replacements build new arrays rather than writing in place.
+        """
+        if set(columns) != set(self.columns):
+            raise ValueError("column set does not match the catalog layout")
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) != 1:
+            raise ValueError("columns have different lengths")
+        for name in CATEGORICAL_COLUMNS:
+            table = categories.get(name)
+            if not table or table[0] != "":
+                raise ValueError(f"category table for {name} is missing or malformed")
+            if len(columns[name]) and int(columns[name].max()) >= len(table):
+                raise ValueError(f"codes in {name} exceed its category table")
+
+        self.columns = dict(columns)
+        self.categories = {name: list(categories[name]) for name in CATEGORICAL_COLUMNS}
+        self._category_codes = {
+            name: {value: code for code, value in enumerate(table)}
+            for name, table in self.categories.items()
+        }
+        self._line_cache.clear()
+        self.version += 1
+
+    def encode_records(self, collection: str, records: Iterable[Dict]) -> Dict[str, np.ndarray]:
+        """Encode records into new column arrays (interning their categories)"""
+        values: Dict[str, list] = {name: [] for name in self.columns}
+
+        for record in records:
+            try:
+                fields = parse_tle_fields(record["line1"], record["line2"])
+            except Exception as e:
+                print(f"⚠️  Skipping {record.get('name')}: invalid TLE ({e})")
+                continue
+
+            fields["norad_id"] = int(record.get("norad_id") or fields["norad_id"])
+            for name in ELEMENT_COLUMNS:
+                values[name].append(fields[name])
+            values["intl_designator"].append(fields["intl_designator"].encode("ascii", "replace"))
+            values["classification"].append(fields["classification"].encode("ascii", "replace"))
+            values["nddot_field"].append(fields["nddot_field"].encode("ascii", "replace"))
+            values["bstar_field"].append(fields["bstar_field"].encode("ascii", "replace"))
+            values["name"].append(str(record.get("name") or "UNKNOWN").encode("ascii", "replace"))
+            values["launch_date"].append((record.get("launch_date") or "").encode("ascii", "replace"))
+            values["decay_date"].append((record.get("decay_date") or "").encode("ascii", "replace"))
+            values["size_estimate"].append(float(record.get("size_estimate") or 0.0))
+            for name in TIMESTAMP_COLUMNS:
+                values[name].append(_timestamp(record.get(name)))
+
+            values["collection"].append(self._intern("collection", collection))
+            for name in CATEGORICAL_COLUMNS[1:]:
+                values[name].append(self._intern(name, record.get(name)))
+
+        encoded = {}
+        for name, column in self.columns.items():
+            if name in DERIVED_COLUMNS:
+                continue
+            encoded[name] = np.array(values[name], dtype=column.dtype)
+
+        encoded.update(self._derive(encoded["mean_motion"], encoded["eccentricity"]))
+        return encoded
+
+    def _derive(self, mean_motion: np.ndarray, eccentricity: np.ndarray) -> Dict[str, np.ndarray]:
+        """Semi-major axis, perigee/apogee altitude and period from the elements"""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            n_rad_s = mean_motion * 2.0 * np.pi / 86400.0
+            semi_major_axis = np.cbrt(MU_EARTH / (n_rad_s * n_rad_s))
+            period = 1440.0 / mean_motion
+        return {
+            "semi_major_axis": semi_major_axis.astype(np.float32),
+            "perigee": (semi_major_axis * (1.0 - eccentricity) - EARTH_RADIUS).astype(np.float32),
+            "apogee": (semi_major_axis * (1.0 + eccentricity) - EARTH_RADIUS).astype(np.float32),
+            "period": period.astype(np.float32),
+        }
+
+    def _intern(self, column: str, value: Optional[str]) -> int:
+        if value is None:
+            return 0
+        value = str(value)
+        codes = self._category_codes[column]
+        code = codes.get(value)
+        if code is None:
+            code = len(self.categories[column])
+            self.categories[column].append(value)
+            codes[value] = code
+        return code
+
+    # ------------------------------------------------------------------
+    # Filtering and counting
+    # ------------------------------------------------------------------
+
+    def code(self, column: str, value: str) -> int:
+        """Categorical code for a value (-1 if the value never occurs)"""
+        return self._category_codes[column].get(value, -1)
+
+    def mask(self, **filters) -> np.ndarray:
+        """Boolean mask for categorical equality filters (lists mean 'any of')"""
+        result = np.ones(len(self), dtype=bool)
+        for column, value in filters.items():
+            if value is None:
+                continue
+            if isinstance(value, (list, tuple, set)):
+                codes = [self.code(column, v) for v in value]
+                result &= np.isin(self.columns[column], codes)
+            else:
+                result &= self.columns[column] == self.code(column, value)
+        return result
+
+    def indices(self, **filters) -> np.ndarray:
+        """Row indexes matching categorical filters"""
+        return np.flatnonzero(self.mask(**filters))
+
+    def count_by(self, column: str, mask: Optional[np.ndarray] = None) -> Dict[str, int]:
+        """Count rows per category value"""
+        codes = self.columns[column] if mask is None else self.columns[column][mask]
+        counts = np.bincount(codes, minlength=len(self.categories[column]))
+        return {
+            value: int(count)
+            for value, count in zip(self.categories[column], counts)
+            if value and count
+        }
+
+    def decode(self, column: str, indices: Optional[Sequence[int]] = None) -> List:
+        """Decode a column into Python values for the given rows"""
+        data = self.columns[column] if indices is None else self.columns[column][indices]
+        if column in self.categories:
+            table = self.categories[column]
+            return [table[code] or None for code in data.tolist()]
+        if column in STRING_COLUMNS:
+            return [value.decode("ascii") or None for value in data.tolist()]
+        if column in TIMESTAMP_COLUMNS:
+            return [_isoformat(value) for value in data.tolist()]
+        return data.tolist()
+
+    # ------------------------------------------------------------------
+    # Row views
+    # ------------------------------------------------------------------
+
+    def row(self, index: int) -> CatalogRow:
+        return CatalogRow(self, int(index))
+
+    def rows(self, indices: Optional[Iterable[int]] = None) -> List[CatalogRow]:
+        if indices is None:
+            indices = range(len(self))
+        return [CatalogRow(self, int(index)) for index in indices]
+
+    def row_keys(self, index: int) -> List[str]:
+        keys = [
+            "name", "norad_id", "line1", "line2", "object_type", "size_estimate",
+            "risk_level", "launch_date", "decay_date"
+        ]
+        for name in OPTIONAL_FIELDS:
+            if self._present(name, index):
+                keys.append(name)
+        return keys
+
+    def _present(self, name: str, index: int) -> bool:
+        value = self.columns[name][index]
+        return not np.isnan(value) if name in TIMESTAMP_COLUMNS else bool(value)
+
+    def get_value(self, key: str, index: int):
+        if key in ("line1", "line2"):
+            line1, line2 = self.tle_lines(index)
+            return line1 if key == "line1" else line2
+        if key not in self.columns:
+            raise KeyError(key)
+        if key in OPTIONAL_FIELDS and not self._present(key, index):
+            raise KeyError(key)
+
+        value = self.columns[key][index]
+        if key in TIMESTAMP_COLUMNS:
+            return _isoformat(value)
+        if key in self.categories:
+            return self.categories[key][value] or None
+        if key in STRING_COLUMNS:
+            return value.decode("ascii") or None
+        return value.item()
+
+    def tle_lines(self, index: int) -> tuple:
+        """TLE text for a row, rebuilt from the element columns"""
+        lines = self._line_cache.get(index)
+        if lines is None:
+            fields = {name: self.columns[name][index] for name in ELEMENT_COLUMNS}
+            fields["classification"] = self.columns["classification"][index].decode("ascii")
+            fields["intl_designator"] = self.columns["intl_designator"][index].decode("ascii")
+            fields["nddot_field"] = self.columns["nddot_field"][index].decode("ascii")
+            fields["bstar_field"] = self.columns["bstar_field"][index].decode("ascii")
+            lines = format_tle_lines(fields)
+            if len(self._line_cache) < 4096:
+                self._line_cache[index] = lines
+        return lines
+
+    # ------------------------------------------------------------------
+    # Diagnostics
+    # ------------------------------------------------------------------
+
+    def epoch_jd(self, indices: Optional[Sequence[int]] = None) -> np.ndarray:
+        """TLE epochs as Julian dates"""
+        year = self.columns["epoch_year"].astype(np.int64)
+        day = self.columns["epoch_day"]
+        if indices is not None:
+            year = year[indices]
+            day = day[indices]
+        full_year = np.where(year < 57, 2000 + year, 1900 + year)
+        # Julian date of Jan 0.0 of each year
+        jan0 = 1721424.5 + 365 * (full_year - 1) + (full_year - 1) // 4 - (full_year - 1) // 100 + (full_year - 1) // 400
+        return jan0 + day
+
+    def memory_usage(self) -> Dict:
+        """Bytes held by the column arrays"""
+        total = sum(column.nbytes for column in self.columns.values())
+        return {
+            "objects": len(self),
+            "bytes": int(total),
+            "bytes_per_object": round(total / len(self), 1) if len(self) else 0.0
+        }
@@ -2,22 +2,96 @@ import httpx
 import asyncio
 import os
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional, Sequence, Tuple
 import re
 
+import numpy as np
+
+from .catalog_store import omm_to_tle_lines
+from .http_cache import http_cache
+from .json_stream import JSONArrayStream
+from .object_classifier import (
+    DEBRIS, DEBRIS_NAME, FRAGMENT, LOW, MISSION_TYPES, OBJECT_TYPES, RISK_LEVELS,
+    classify, field_array, gp_debris_risk, labels, name_flags
+)
+from .replay import replay_transport
+from .single_flight import single_flight
+
+# GP groups used for full-catalog ingestion
+FULL_CATALOG_SATELLITE_GROUPS = ["active"]
+FULL_CATALOG_DEBRIS_GROUPS = [
+    "cosmos-2251-debris",
+    "iridium-33-debris",
+    "fengyun-1c-debris",
+    "cosmos-1408-debris",
+]
+
+# Category downloads run concurrently over one pooled connection set
+CELESTRAK_MAX_CONCURRENCY = int(os.getenv("CELESTRAK_MAX_CONCURRENCY", "8"))
+CELESTRAK_CATEGORY_TIMEOUT = float(os.getenv("CELESTRAK_CATEGORY_TIMEOUT", "20"))
+
+# Point at a mirror or the local replay server (python -m src.replay serve)
+CELESTRAK_BASE_URL = os.getenv("CELESTRAK_BASE_URL", "https://celestrak.org").rstrip("/")
+
 class CelestrakClient:
     """Client for Celestrak.org API - No registration required!"""
     
     def __init__(self):
-        self.base_url = "https://celestrak.org"
+        self.base_url = CELESTRAK_BASE_URL
+        # None uses the network; ORBITAL_DATA_REPLAY swaps in the offline replay
+        self.transport = replay_transport()
         self.session = None
         self.cache = {}
         self.cache_duration = timedelta(hours=1)  # Cache for 1 hour
+        self.max_concurrency = max(1, CELESTRAK_MAX_CONCURRENCY)
+        self.category_timeout = CELESTRAK_CATEGORY_TIMEOUT
+        self._semaphore = None
         
     async def initialize(self):
-        """Initialize the HTTP client"""
-        self.session = httpx.AsyncClient(timeout=30.0)
+        """Initialize the shared HTTP client (kept across refreshes)"""
+        if self.session is not None and not self.session.is_closed:
+            return
+        limits = httpx.Limits(
+            max_connections=self.max_concurrency,
+            max_keepalive_connections=self.max_concurrency
+        )
+        self.session = httpx.AsyncClient(timeout=30.0, limits=limits, transport=self.transport)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
         print("✅ Celestrak client initialized (no registration required)")
+
+    async def fetch_categories(self, categories: Sequence[Tuple[str, str]]) -> List[Optional[List[Dict]]]:
+        """Fetch (category, url) pairs concurrently
+
+        Results come back in the order of ``categories`` regardless of which
+        request finished first; a category that failed or timed out is None.
+        """
+        if not self.session:
+            await self.initialize()
+        return await asyncio.gather(*(
+            self._fetch_category(category, url) for category, url in categories
+        ))
+
+    async def _fetch_category(self, category: str, url: str) -> Optional[List[Dict]]:
+        async with self._semaphore:
+            try:
+                response = await asyncio.wait_for(
+                    http_cache.get(self.session, url, self.cache_duration.total_seconds()),
+                    self.category_timeout
+                )
+            except asyncio.TimeoutError:
+                print(f"⚠️  Timed out fetching {category} after {self.category_timeout:.0f}s")
+                return None
+            except Exception as e:
+                print(f"⚠️  Error fetching {category}: {e}")
+                return None
+        if response.status_code != 200:
+            print(f"⚠️  Celestrak {category} returned HTTP {response.status_code}")
+            return None
+        try:
+            return response.json()
+        except ValueError as e:
+            print(f"⚠️  Invalid JSON for {category}: {e}")
+            return None
         
     async def get_cached_data(self, cache_key: str) -> Optional[List[Dict]]:
         """Get cached data if still valid"""
@@ -32,6 +106,7 @@ class CelestrakClient:
         """Cache data with timestamp"""
         self.cache[cache_key] = (data, datetime.now())
     
+    @single_flight()
     async def get_active_satellites(self, limit: int = 30) -> List[Dict]:
         """Get active satellites from Celestrak"""
         cache_key = f"celestrak_satellites_{limit}"
@@ -49,32 +124,24 @@ class CelestrakClient:
         try:
             # Get different satellite categories
             categories = [
-                ("stations", "https://celestrak.org/NORAD/elements/gp.php?GROUP=stations&FORMAT=json"),
-                ("starlink", "https://celestrak.org/NORAD/elements/gp.php?GROUP=starlink&FORMAT=json"),
-                ("gps-ops", "https://celestrak.org/NORAD/elements/gp.php?GROUP=gps-ops&FORMAT=json"),
-                ("weather", "https://celestrak.org/NORAD/elements/gp.php?GROUP=weather&FORMAT=json"),
+                ("stations", f"{self.base_url}/NORAD/elements/gp.php?GROUP=stations&FORMAT=json"),
+                ("starlink", f"{self.base_url}/NORAD/elements/gp.php?GROUP=starlink&FORMAT=json"),
+                ("gps-ops", f"{self.base_url}/NORAD/elements/gp.php?GROUP=gps-ops&FORMAT=json"),
+                ("weather", f"{self.base_url}/NORAD/elements/gp.php?GROUP=weather&FORMAT=json"),
             ]
             
-            for category, url in categories:
-                try:
-                    response = await self.session.get(url)
-                    if response.status_code == 200:
-                        data = response.json()
-                        
-                        # Convert and add to satellites list
-                        for item in data[:10]:  # Limit per category
-                            converted = self.convert_celestrak_to_tle(item, category)
-                            if converted:
-                                satellites.append(converted)
-                                
-                        print(f"✅ Retrieved {len(data[:10])} satellites from Celestrak ({category})")
-                        
-                        if len(satellites) >= limit:
-                            break
-                            
-                except Exception as e:
-                    print(f"⚠️  Error fetching {category}: {e}")
+            results = await self.fetch_categories(categories)
+            for (category, _), data in zip(categories, results):
+                if data is None:
                     continue
+
+                # Convert and add to satellites list
+                satellites.extend(self.convert_celestrak_batch(data[:10], category))  # Limit per category
+
+                print(f"✅ Retrieved {len(data[:10])} satellites from Celestrak ({category})")
+
+                if len(satellites) >= limit:
+                    break
             
             # Cache the results
             satellites = satellites[:limit]
@@ -87,6 +154,7 @@ class CelestrakClient:
             print(f"❌ Error fetching Celestrak satellites: {e}")
             return []
     
+    @single_flight()
     async def get_debris_objects(self, limit: int = 50) -> List[Dict]:
         """Get debris objects from Celestrak"""
         cache_key = f"celestrak_debris_{limit}"
@@ -103,58 +171,39 @@ class CelestrakClient:
         
         try:
             # Celestrak debris categories
-            debris_urls = [
-                "https://celestrak.org/NORAD/elements/gp.php?GROUP=cosmos-2251-debris&FORMAT=json",
-                "https://celestrak.org/NORAD/elements/gp.php?GROUP=iridium-33-debris&FORMAT=json",
-                "https://celestrak.org/NORAD/elements/gp.php?GROUP=fengyun-1c-debris&FORMAT=json",
+            debris_categories = [
+                ("cosmos-2251-debris", f"{self.base_url}/NORAD/elements/gp.php?GROUP=cosmos-2251-debris&FORMAT=json"),
+                ("iridium-33-debris", f"{self.base_url}/NORAD/elements/gp.php?GROUP=iridium-33-debris&FORMAT=json"),
+                ("fengyun-1c-debris", f"{self.base_url}/NORAD/elements/gp.php?GROUP=fengyun-1c-debris&FORMAT=json"),
             ]
             
-            for url in debris_urls:
-                try:
-                    response = await self.session.get(url)
-                    if response.status_code == 200:
-                        data = response.json()
-                        
-                        # Convert and add to debris list
-                        for item in data[:20]:  # Limit per category
-                            converted = self.convert_celestrak_to_tle(item, "debris")
-                            if converted:
-                                debris_objects.append(converted)
-                        
-                        print(f"✅ Retrieved {len(data[:20])} debris objects from Celestrak")
-                        
-                        if len(debris_objects) >= limit:
-                            break
-                            
-                except Exception as e:
-                    print(f"⚠️  Error fetching debris category: {e}")
+            results = await self.fetch_categories(debris_categories)
+            for data in results:
+                if data is None:
                     continue
+
+                # Convert and add to debris list
+                debris_objects.extend(self.convert_celestrak_batch(data[:20], "debris"))  # Limit per category
+
+                print(f"✅ Retrieved {len(data[:20])} debris objects from Celestrak")
+
+                if len(debris_objects) >= limit:
+                    break
             
-            # If not enough debris from specific categories, get from general catalog
+            # If not enough debris from specific categories (e.g. one failed),
+            # get debris-like objects from the supplemental catalog
             if len(debris_objects) < limit:
-                try:
-                    # Get supplemental objects and filter for debris-like names
-                    response = await self.session.get(
-                        "https://celestrak.org/NORAD/elements/gp.php?GROUP=supplemental&FORMAT=json"
-                    )
-                    if response.status_code == 200:
-                        data = response.json()
-                        
-                        # Filter for debris-like objects
-                        for item in data:
-                            name = item.get('OBJECT_NAME', '').upper()
-                            if any(keyword in name for keyword in ['DEB', 'DEBRIS', 'FRAG', 'FRAGMENT']):
-                                converted = self.convert_celestrak_to_tle(item, "debris")
-                                if converted:
-                                    debris_objects.append(converted)
-                                    
-                                if len(debris_objects) >= limit:
-                                    break
-                        
-                        print(f"✅ Added supplemental debris objects from Celestrak")
-                        
-                except Exception as e:
-                    print(f"⚠️  Error fetching supplemental debris: {e}")
+                data, = await self.fetch_categories([
+                    ("supplemental", f"{self.base_url}/NORAD/elements/gp.php?GROUP=supplemental&FORMAT=json")
+                ])
+                if data is not None:
+                    # Filter for debris-like objects
+                    flags = name_flags([item.get('OBJECT_NAME') or '' for item in data])
+                    debris_like = np.flatnonzero(flags & (DEBRIS_NAME | FRAGMENT))
+                    wanted = [data[i] for i in debris_like[:limit - len(debris_objects)]]
+                    debris_objects.extend(self.convert_celestrak_batch(wanted, "debris"))
+
+                    print(f"✅ Added supplemental debris objects from Celestrak")
             
             # Cache the results
             debris_objects = debris_objects[:limit]
@@ -167,15 +216,39 @@ class CelestrakClient:
             print(f"❌ Error fetching Celestrak debris: {e}")
             return []
     
+    async def stream_group(self, group: str, category: str) -> AsyncIterator[Dict]:
+        """Stream one GP group, yielding converted records as they are parsed
+
+        The body is parsed incrementally, from the network or the disk
+        cache, so only the current chunk and one partial record are held
+        at a time.
+        """
+        if not self.session:
+            await self.initialize()
+
+        url = f"{self.base_url}/NORAD/elements/gp.php?GROUP={group}&FORMAT=json"
+        parser = JSONArrayStream()
+        # One timestamp per download
+        fetched_at = datetime.now().isoformat()
+        # Long downloads rely on the client's per-read timeout, not a total deadline
+        async with self._semaphore:
+            async for chunk in http_cache.stream(self.session, url, self.cache_duration.total_seconds()):
+                # Classify each chunk's records together
+                for converted in self.convert_celestrak_batch(parser.feed(chunk), category):
+                    converted["last_updated"] = fetched_at
+                    yield converted
+        parser.close()
+        print(f"✅ Streamed {parser.items} records from Celestrak ({group}, {parser.bytes / 1e6:.1f} MB)")
+
+    @single_flight()
     async def get_iss_data(self) -> Optional[Dict]:
         """Get ISS data specifically"""
         try:
             if not self.session:
                 await self.initialize()
                 
-            response = await self.session.get(
-                "https://celestrak.org/NORAD/elements/gp.php?CATNR=25544&FORMAT=json"
-            )
+            url = f"{self.base_url}/NORAD/elements/gp.php?CATNR=25544&FORMAT=json"
+            response = await http_cache.get(self.session, url, self.cache_duration.total_seconds())
             
             if response.status_code == 200:
                 data = response.json()
@@ -190,147 +263,72 @@ class CelestrakClient:
             print(f"❌ Error fetching ISS data: {e}")
             return None
     
-    def convert_celestrak_to_tle(self, celestrak_data: Dict, category: str) -> Dict:
-        """Convert Celestrak format to our internal TLE format"""
-        try:
-            object_name = celestrak_data.get('OBJECT_NAME', 'UNKNOWN')
-            
-            # Determine if it's debris or satellite
-            is_debris = (
-                category == "debris" or 
-                any(keyword in object_name.upper() for keyword in ['DEB', 'DEBRIS', 'FRAG', 'FRAGMENT'])
+    def convert_celestrak_to_tle(self, celestrak_data: Dict, category: str) -> Optional[Dict]:
+        """Convert one Celestrak record to our internal TLE format"""
+        converted = self.convert_celestrak_batch([celestrak_data], category)
+        return converted[0] if converted else None
+
+    def convert_celestrak_batch(self, items: List[Dict], category: str) -> List[Dict]:
+        """Convert Celestrak GP records, classifying the whole batch in one pass"""
+        if not items:
+            return []
+        names = [item.get('OBJECT_NAME') or 'UNKNOWN' for item in items]
+        classes = classify(names, category)
+
+        # Risk only matters for debris; everything else is low
+        risk = np.full(len(items), LOW, dtype=np.int8)
+        debris_rows = np.flatnonzero(classes["object_type"] == DEBRIS)
+        if len(debris_rows):
+            debris_items = [items[i] for i in debris_rows]
+            risk[debris_rows] = gp_debris_risk(
+                field_array(debris_items, 'MEAN_MOTION', 15.0),
+                field_array(debris_items, 'ECCENTRICITY', 0.0),
+                field_array(debris_items, 'INCLINATION', 0.0),
+                classes["flags"][debris_rows]
             )
-            
-            # Calculate risk level for debris
-            if is_debris:
-                risk_level = self.calculate_debris_risk(celestrak_data)
-            else:
-                risk_level = 'low'
-            
-            # Convert to our format
-            tle_data = {
-                "name": object_name,
-                "norad_id": int(celestrak_data.get('NORAD_CAT_ID', 0)),
-                "line1": celestrak_data.get('TLE_LINE1', ''),
-                "line2": celestrak_data.get('TLE_LINE2', ''),
-                "object_type": "debris" if is_debris else "satellite",
-                "size_estimate": self.estimate_size_from_name(object_name),
-                "risk_level": risk_level,
-                "country_code": celestrak_data.get('COUNTRY_CODE', 'UNKNOWN'),
-                "launch_date": celestrak_data.get('LAUNCH_DATE'),
-                "decay_date": celestrak_data.get('DECAY_DATE'),
-                "last_updated": datetime.now().isoformat(),
-                "data_source": "celestrak"
-            }
-            
-            # Add mission type for satellites
-            if not is_debris:
-                tle_data["mission_type"] = self.determine_mission_type(object_name, category)
-            
-            return tle_data
-            
-        except Exception as e:
-            print(f"❌ Error converting Celestrak data: {e}")
-            return None
-    
-    def calculate_debris_risk(self, celestrak_data: Dict) -> str:
-        """Calculate risk level for debris objects"""
-        try:
-            # Get orbital parameters
-            mean_motion = float(celestrak_data.get('MEAN_MOTION', 15))
-            eccentricity = float(celestrak_data.get('ECCENTRICITY', 0))
-            inclination = float(celestrak_data.get('INCLINATION', 0))
-            
-            # Calculate approximate altitude from mean motion
-            # Higher mean motion = lower altitude = higher risk
-            altitude = (398600.4418 / (mean_motion * 2 * 3.14159 / 1440) ** 2) ** (1/3) - 6371
-            
-            risk_score = 0
-            
-            # Altitude risk (LEO is higher risk)
-            if 200 <= altitude <= 1000:  # LEO
-                risk_score += 3
-            elif 1000 < altitude <= 2000:  # Higher LEO
-                risk_score += 2
-            else:  # MEO/GEO
-                risk_score += 1
-            
-            # Eccentricity risk
-            if eccentricity > 0.1:
-                risk_score += 2
-            elif eccentricity > 0.05:
-                risk_score += 1
-            
-            # Inclination risk (polar orbits cross more paths)
-            if inclination > 80:
-                risk_score += 1
-            
-            # Name-based risk assessment
-            name = celestrak_data.get('OBJECT_NAME', '').upper()
-            if 'COSMOS' in name or 'IRIDIUM' in name:
-                risk_score += 2  # Known collision debris
-            
-            # Convert score to risk level
-            if risk_score >= 5:
-                return 'high'
-            elif risk_score >= 3:
-                return 'medium'
-            else:
-                return 'low'
-                
-        except Exception:
-            return 'medium'  # Default to medium if calculation fails
-    
-    def estimate_size_from_name(self, name: str) -> float:
-        """Estimate object size from name patterns"""
-        name_upper = name.upper()
-        
-        # Size estimates based on object type
-        if 'ISS' in name_upper or 'STATION' in name_upper:
-            return 50.0  # Large space station
-        elif 'STARLINK' in name_upper:
-            return 2.5   # Starlink satellite
-        elif 'GPS' in name_upper:
-            return 5.0   # GPS satellite
-        elif 'DEB' in name_upper or 'DEBRIS' in name_upper:
-            return 0.1   # Small debris
-        elif 'FRAG' in name_upper or 'FRAGMENT' in name_upper:
-            return 0.05  # Very small fragment
-        else:
-            return 1.0   # Default satellite size
-    
-    def determine_mission_type(self, name: str, category: str) -> str:
-        """Determine mission type for satellites"""
-        name_upper = name.upper()
-        
-        # Category-based classification
-        if category == "stations":
-            return 'crewed_station'
-        elif category == "starlink":
-            return 'communication'
-        elif category == "gps-ops":
-            return 'navigation'
-        elif category == "weather":
-            return 'weather'
-        
-        # Name-based classification
-        if 'ISS' in name_upper or 'STATION' in name_upper:
-            return 'crewed_station'
-        elif 'STARLINK' in name_upper or 'ONEWEB' in name_upper:
-            return 'communication'
-        elif 'GPS' in name_upper or 'GLONASS' in name_upper or 'GALILEO' in name_upper:
-            return 'navigation'
-        elif 'WEATHER' in name_upper or 'GOES' in name_upper or 'NOAA' in name_upper:
-            return 'weather'
-        elif 'HUBBLE' in name_upper or 'TELESCOPE' in name_upper:
-            return 'science'
-        else:
-            return 'other'
-    
+
+        object_types = labels(OBJECT_TYPES, classes["object_type"])
+        missions = labels(MISSION_TYPES, classes["mission_type"])
+        risk_levels = labels(RISK_LEVELS, risk)
+        sizes = classes["size_estimate"].tolist()
+        last_updated = datetime.now().isoformat()
+
+        converted = []
+        for i, item in enumerate(items):
+            try:
+                # GP JSON is OMM; build TLE text when the record carries none
+                line1 = item.get('TLE_LINE1')
+                line2 = item.get('TLE_LINE2')
+                if not line1 or not line2:
+                    line1, line2 = omm_to_tle_lines(item)
+
+                tle_data = {
+                    "name": names[i],
+                    "norad_id": int(item.get('NORAD_CAT_ID', 0)),
+                    "line1": line1,
+                    "line2": line2,
+                    "object_type": object_types[i],
+                    "size_estimate": sizes[i],
+                    "risk_level": risk_levels[i],
+                    "country_code": item.get('COUNTRY_CODE', 'UNKNOWN'),
+                    "launch_date": item.get('LAUNCH_DATE'),
+                    "decay_date": item.get('DECAY_DATE'),
+                    "last_updated": last_updated,
+                    "data_source": "celestrak"
+                }
+                # Mission type only for satellites
+                if missions[i] is not None:
+                    tle_data["mission_type"] = missions[i]
+                converted.append(tle_data)
+            except Exception as e:
+                print(f"❌ Error converting Celestrak data: {e}")
+        return converted
+
     async def close(self):
         """Close the HTTP session"""
         if self.session:
             await self.session.aclose()
+            self.session = None
             print("📴 Celestrak session closed")
 
 # Global instance
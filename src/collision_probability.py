@@ -0,0 +1,192 @@
+"""
+Batched short-encounter probability of collision
+Combined position covariances are projected onto the encounter plane (normal
+to the relative velocity at closest approach) and the 2D Gaussian is
+integrated over the hard-body circle, Foster-style by quadrature or Chan-style
+by series, for whole arrays of conjunctions at once
+"""
+
+import os
+from typing import Tuple
+
+import numpy as np
+
+COLLISION_PROBABILITY_METHOD = os.getenv("COLLISION_PROBABILITY_METHOD", "foster").lower()
+
+# Collision probability that puts a conjunction on watch / alert
+PROBABILITY_THRESHOLDS = {
+    "watch": 1e-7,
+    "alert": 1e-4
+}
+
+# Default TLE position uncertainty (1-sigma, km) along radial / in-track /
+# cross-track at the element set's epoch, and its growth per day of age
+TLE_SIGMA_AT_EPOCH_KM = np.array([0.1, 0.5, 0.2])
+TLE_SIGMA_GROWTH_KM_PER_DAY = np.array([0.05, 1.0, 0.1])
+DEFAULT_TLE_AGE_DAYS = 1.0
+
+# Objects smaller than the reference size are tracked less precisely; their
+# sigmas grow as sqrt(reference / size), up to the cap
+REFERENCE_SIZE_M = 1.0
+MAX_SIZE_SIGMA_SCALE = 3.0
+MIN_HARD_BODY_RADIUS_KM = 0.005
+
+FOSTER_RADIAL_NODES = 8     # Gauss-Legendre nodes across the hard-body radius
+FOSTER_ANGULAR_NODES = 16   # evenly spaced nodes around it
+CHAN_TERMS = 20
+PROBABILITY_BLOCK = 50000   # conjunctions evaluated at a time
+
+
+def ric_frame(position: np.ndarray, velocity: np.ndarray) -> np.ndarray:
+    """Radial, in-track and cross-track unit vectors (as rows) for each state, shape (n, 3, 3)"""
+    position = np.asarray(position, dtype=np.float64)
+    radial = position / np.linalg.norm(position, axis=1)[:, None]
+    cross = np.cross(position, velocity)
+    cross /= np.linalg.norm(cross, axis=1)[:, None]
+    return np.stack([radial, np.cross(cross, radial), cross], axis=1)
+
+
+def position_sigmas(size: np.ndarray, age_days: np.ndarray) -> np.ndarray:
+    """Default radial / in-track / cross-track sigmas (km) from object size (m) and element age (days)"""
+    size = np.asarray(size, dtype=np.float64)
+    size = np.where(np.isfinite(size) & (size > 0), size, REFERENCE_SIZE_M)
+    scale = np.clip(np.sqrt(REFERENCE_SIZE_M / size), 1.0, MAX_SIZE_SIGMA_SCALE)
+    age = np.abs(np.nan_to_num(np.asarray(age_days, dtype=np.float64), nan=DEFAULT_TLE_AGE_DAYS))
+    return (TLE_SIGMA_AT_EPOCH_KM + TLE_SIGMA_GROWTH_KM_PER_DAY * age[:, None]) * scale[:, None]
+
+
+def state_covariance(position: np.ndarray, velocity: np.ndarray, sigmas: np.ndarray) -> np.ndarray:
+    """Inertial position covariance (n, 3, 3) from per-axis RIC sigmas"""
+    frame = ric_frame(position, velocity)
+    return np.einsum("nki,nk,nkj->nij", frame, sigmas ** 2, frame)
+
+
+def hard_body_radius(first_size: np.ndarray, second_size: np.ndarray) -> np.ndarray:
+    """Combined hard-body radius (km) of two objects from their sizes (m)"""
+    total = np.nan_to_num(np.asarray(first_size, dtype=np.float64)) + np.nan_to_num(second_size)
+    return np.maximum(total / 2000.0, MIN_HARD_BODY_RADIUS_KM)
+
+
+def encounter_plane(relative_position: np.ndarray, relative_velocity: np.ndarray,
+                    covariance: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Miss vector (n, 2) and combined covariance (n, 2, 2) in the encounter plane
+
+    The plane's first axis points along the miss vector (perpendicular to
+    the relative velocity at closest approach); a zero miss gets an
+    arbitrary perpendicular axis.
+    """
+    r = np.asarray(relative_position, dtype=np.float64)
+    z = relative_velocity / np.linalg.norm(relative_velocity, axis=1)[:, None]
+    x = r - np.einsum("ij,ij->i", r, z)[:, None] * z
+    length = np.linalg.norm(x, axis=1)
+    degenerate = length < 1e-9
+    if degenerate.any():
+        # Any axis not parallel to the relative velocity will do
+        helper = np.where(np.abs(z[degenerate, :1]) < 0.9, [[1.0, 0.0, 0.0]], [[0.0, 1.0, 0.0]])
+        x[degenerate] = np.cross(z[degenerate], helper)
+        length[degenerate] = np.linalg.norm(x[degenerate], axis=1)
+    x /= length[:, None]
+    basis = np.stack([x, np.cross(z, x)], axis=1)
+    miss = np.einsum("nij,nj->ni", basis, r)
+    return miss, np.einsum("nik,nkl,njl->nij", basis, covariance, basis)
+
+
+def foster_probability(miss: np.ndarray, covariance: np.ndarray, radius: np.ndarray) -> np.ndarray:
+    """Integral of the 2D Gaussian over the hard-body circle by polar quadrature"""
+    nodes, weights = np.polynomial.legendre.leggauss(FOSTER_RADIAL_NODES)
+    fraction = (nodes + 1.0) / 2.0
+    weights = weights / 2.0
+    angle = (np.arange(FOSTER_ANGULAR_NODES) + 0.5) * (2.0 * np.pi / FOSTER_ANGULAR_NODES)
+
+    # Sample points around the miss vector, shape (n, radial, angular)
+    rho = radius[:, None, None] * fraction[None, :, None]
+    x = miss[:, 0, None, None] + rho * np.cos(angle)
+    y = miss[:, 1, None, None] + rho * np.sin(angle)
+    a = covariance[:, 0, 0, None, None]
+    b = covariance[:, 0, 1, None, None]
+    d = covariance[:, 1, 1, None, None]
+    det = a * d - b * b
+    density = np.exp(-0.5 * (d * x * x - 2.0 * b * x * y + a * y * y) / det) / (2.0 * np.pi * np.sqrt(det))
+
+    area = (weights * fraction)[None, :, None] * (2.0 * np.pi / FOSTER_ANGULAR_NODES)
+    return (density * area).sum(axis=(1, 2)) * radius ** 2
+
+
+def chan_probability(miss: np.ndarray, covariance: np.ndarray, radius: np.ndarray) -> np.ndarray:
+    """Chan's series for the same integral, with the circle scaled to an equal-area one
+
+    In principal axes, with u = R^2 / (sx sy) and v = (x/sx)^2 + (y/sy)^2:
+    Pc = e^(-v/2) sum_m (v/2)^m / m! * [1 - e^(-u/2) sum_(k<=m) (u/2)^k / k!]
+    """
+    variance, axes = np.linalg.eigh(covariance)
+    principal = np.einsum("nji,nj->ni", axes, miss)
+    u = radius ** 2 / np.sqrt(variance[:, 0] * variance[:, 1])
+    v = (principal ** 2 / variance).sum(axis=1)
+
+    outer = np.exp(-v / 2.0)
+    inner = np.exp(-u / 2.0)
+    tail = -np.expm1(-u / 2.0)  # 1 - e^(-u/2) sum_(k<=m), kept directly to avoid cancellation
+    probability = outer * tail
+    for m in range(1, CHAN_TERMS):
+        outer = outer * (v / 2.0) / m
+        inner = inner * (u / 2.0) / m
+        tail = np.maximum(tail - inner, 0.0)
+        probability += outer * tail
+    return probability
+
+
+def plane_probability(miss: np.ndarray, covariance: np.ndarray, radius: np.ndarray,
+                      method: str = COLLISION_PROBABILITY_METHOD) -> np.ndarray:
+    """Pc from encounter-plane miss vectors, 2x2 covariances and hard-body radii"""
+    integrate = chan_probability if method == "chan" else foster_probability
+    probability = np.empty(len(miss), dtype=np.float64)
+    for start in range(0, len(miss), PROBABILITY_BLOCK):
+        block = slice(start, start + PROBABILITY_BLOCK)
+        probability[block] = integrate(miss[block], covariance[block], radius[block])
+    return np.clip(probability, 0.0, 1.0)
+
+
+def conjunction_probability(position: np.ndarray, velocity: np.ndarray,
+                            relative_position: np.ndarray, relative_velocity: np.ndarray,
+                            sizes: Tuple[np.ndarray, np.ndarray], age_days: Tuple[np.ndarray, np.ndarray],
+                            method: str = COLLISION_PROBABILITY_METHOD) -> Tuple[np.ndarray, np.ndarray]:
+    """Pc and hard-body radius (km) for a batch of conjunctions
+
+    ``position``/``velocity`` are the first object's inertial state at
+    closest approach, ``relative_*`` the second object's state relative to
+    it. ``sizes`` (m) and ``age_days`` (element age at closest approach)
+    give each object's default covariance; the two are taken as
+    uncorrelated and summed.
+    """
+    if len(position) == 0:
+        empty = np.zeros(0, dtype=np.float64)
+        return empty, empty
+    position = np.asarray(position, dtype=np.float64)
+    velocity = np.asarray(velocity, dtype=np.float64)
+    covariance = state_covariance(position, velocity, position_sigmas(sizes[0], age_days[0]))
+    covariance += state_covariance(position + relative_position, velocity + relative_velocity,
+                                   position_sigmas(sizes[1], age_days[1]))
+    radius = hard_body_radius(*sizes)
+    miss, plane_covariance = encounter_plane(relative_position, relative_velocity, covariance)
+    return plane_probability(miss, plane_covariance, radius, method), radius
+
+
+def nominal_probability(miss_distance: np.ndarray, first_size: np.ndarray, second_size: np.ndarray,
+                        age_days: float = DEFAULT_TLE_AGE_DAYS,
+                        method: str = COLLISION_PROBABILITY_METHOD) -> np.ndarray:
+    """Pc when only the miss distance is known
+
+    Takes a head-on pass between near-circular orbits: the encounter plane
+    is the radial / cross-track plane and the miss lies along the radial.
+    """
+    miss_distance = np.atleast_1d(np.asarray(miss_distance, dtype=np.float64))
+    count = len(miss_distance)
+    first_size = np.broadcast_to(np.asarray(first_size, dtype=np.float64), (count,))
+    second_size = np.broadcast_to(np.asarray(second_size, dtype=np.float64), (count,))
+    age = np.full(count, age_days)
+    variance = position_sigmas(first_size, age) ** 2 + position_sigmas(second_size, age) ** 2
+    covariance = np.zeros((count, 2, 2))
+    covariance[:, 0, 0] = variance[:, 0]
+    covariance[:, 1, 1] = variance[:, 2]
+    miss = np.stack([miss_distance, np.zeros(count)], axis=1)
+    return plane_probability(miss, covariance, hard_body_radius(first_size, second_size), method)
@@ -0,0 +1,583 @@
+"""
+All-vs-all conjunction screening
+Propagates the whole catalog across a time window and, at every step, finds
+close pairs through a spatial index (k-d tree, or a uniform grid hash without
+SciPy) instead of comparing every pair of objects
+"""
+
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+import numpy as np
+
+from .batch_propagator import batch_propagator
+from .collision_probability import ric_frame
+from .ephemeris_grid import hermite_blend
+
+try:
+    from scipy.spatial import cKDTree
+    HAS_SCIPY = True
+except ImportError:
+    HAS_SCIPY = False
+
+# Report pairs passing within this distance of each other; the default
+# reaches the risk analyzer's safe threshold so every risk zone can fill
+SCREENING_RADIUS_KM = float(os.getenv("SCREENING_RADIUS_KM", "50"))
+SCREENING_WINDOW_HOURS = float(os.getenv("SCREENING_WINDOW_HOURS", "24"))
+SCREENING_STEP_SECONDS = float(os.getenv("SCREENING_STEP_SECONDS", "30"))
+# Extra distance the orbit prefilters allow for mean vs osculating radius and
+# decay over the window
+PREFILTER_MARGIN_KM = float(os.getenv("PREFILTER_MARGIN_KM", "25"))
+PREFILTER_BLOCK_PAIRS = 2000000  # pairs put through the orbit-path filter at a time
+# Closest-approach refinement stops once every bracket is this narrow
+REFINE_TOLERANCE_SECONDS = 1e-3
+REFINE_MAX_ITERATIONS = 30
+
+MU_EARTH = 398600.4418  # km^3/s^2
+EARTH_EQUATORIAL_RADIUS = 6378.137  # km
+J2 = 1.08262668e-3
+
+# Offsets to the 13 "forward" neighbour cells plus the cell itself, so each
+# unordered pair of neighbouring cells is visited once
+_HALF_NEIGHBOURS = [
+    (dx, dy, dz)
+    for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+    if (dx, dy, dz) >= (0, 0, 0)
+]
+
+
+def grid_pairs(positions: np.ndarray, radius: float) -> np.ndarray:
+    """Index pairs (i < j) closer than ``radius``, via a uniform grid hash
+
+    Cells are ``radius`` wide, so every close pair sits in the same or in
+    adjacent cells; objects are sorted by cell key and each cell is matched
+    against its forward neighbours with binary searches.
+    """
+    count = len(positions)
+    if count < 2:
+        return np.zeros((0, 2), dtype=np.int64)
+
+    cells = np.floor(positions / radius).astype(np.int64)
+    cells -= cells.min(axis=0)
+    dims = cells.max(axis=0) + 3  # one empty cell of padding on each side
+    keys = ((cells[:, 0] + 1) * dims[1] + cells[:, 1] + 1) * dims[2] + cells[:, 2] + 1
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+
+    firsts, seconds = [], []
+    for dx, dy, dz in _HALF_NEIGHBOURS:
+        neighbour = keys + (dx * dims[1] + dy) * dims[2] + dz
+        low = np.searchsorted(sorted_keys, neighbour, side="left")
+        counts = np.searchsorted(sorted_keys, neighbour, side="right") - low
+        total = int(counts.sum())
+        if total == 0:
+            continue
+        first = np.repeat(np.arange(count), counts)
+        # Ragged arange: 0..counts[k]-1 for every object k
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        second = order[np.repeat(low, counts) + offsets]
+        if (dx, dy, dz) == (0, 0, 0):
+            keep = first < second
+            first, second = first[keep], second[keep]
+        firsts.append(first)
+        seconds.append(second)
+
+    if not firsts:
+        return np.zeros((0, 2), dtype=np.int64)
+    first = np.concatenate(firsts)
+    second = np.concatenate(seconds)
+    delta = positions[first] - positions[second]
+    close = np.einsum("ij,ij->i", delta, delta) <= radius * radius
+    pairs = np.stack([np.minimum(first, second), np.maximum(first, second)], axis=1)
+    return pairs[close]
+
+
+def close_pairs(positions: np.ndarray, radius: float) -> np.ndarray:
+    """Index pairs (i < j) of ``positions`` closer than ``radius``"""
+    if HAS_SCIPY:
+        return cKDTree(positions).query_pairs(radius, output_type="ndarray").astype(np.int64)
+    return grid_pairs(positions, radius)
+
+
+def _linear_tca(dr: np.ndarray, dv: np.ndarray, limit: float) -> np.ndarray:
+    """Time of closest approach along straight-line relative motion, within +-``limit``"""
+    dv2 = np.einsum("ij,ij->i", dv, dv)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(dv2 > 0, -np.einsum("ij,ij->i", dr, dv) / dv2, 0.0)
+    return np.clip(t, -limit, limit)
+
+
+def _cross(a, b):
+    return (a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0])
+
+
+def _dot(a, b):
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def _orbit_geometry(elements: Dict[str, np.ndarray], window_days: float) -> Dict[str, np.ndarray]:
+    """Per-object shape, plane normals and eccentricity vectors for the prefilters
+
+    Planes are taken at the start and end of the window after J2 secular
+    precession from each element set's epoch. Vectors are stored as
+    separate x/y/z arrays so pairs can be gathered component-wise.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        n = elements["mean_motion"] * 2.0 * np.pi / 86400.0
+        e = np.clip(elements["eccentricity"].astype(np.float64), 0.0, 0.999)
+        a = np.cbrt(MU_EARTH / (n * n))
+        p = a * (1.0 - e * e)
+        rate = 1.5 * n * 86400.0 * J2 * (EARTH_EQUATORIAL_RADIUS / p) ** 2  # rad/day
+    inclination = np.radians(elements["inclination"].astype(np.float64))
+    sin_i, cos_i = np.sin(inclination), np.cos(inclination)
+    raan_rate = -rate * cos_i
+    perigee_rate = rate * (2.0 - 2.5 * sin_i ** 2)
+
+    geometry = {
+        "p": p.astype(np.float32),
+        "e": e.astype(np.float32),
+        "perigee": a * (1.0 - e),
+        "apogee": a * (1.0 + e),
+        # How far any in-plane direction can turn over the window
+        "drift": ((np.abs(raan_rate) + np.abs(perigee_rate)) * window_days).astype(np.float32)
+    }
+    with np.errstate(divide="ignore"):
+        geometry["inverse_perigee"] = (1.0 / geometry["perigee"]).astype(np.float32)
+    for stage, days in (("start", elements["age_days"]), ("end", elements["age_days"] + window_days)):
+        raan = np.radians(elements["raan"].astype(np.float64)) + raan_rate * days
+        node = (np.cos(raan), np.sin(raan), np.zeros_like(raan))
+        normal = (sin_i * np.sin(raan), -sin_i * np.cos(raan), cos_i)
+        for axis, component in zip("xyz", normal):
+            geometry[f"{stage}_normal_{axis}"] = component.astype(np.float32)
+        if stage == "start":
+            arg_perigee = np.radians(elements["arg_perigee"].astype(np.float64)) + perigee_rate * days
+            quarter = _cross(normal, node)
+            for axis, along_node, along_quarter in zip("xyz", node, quarter):
+                geometry[f"eccentricity_{axis}"] = (
+                    e * (np.cos(arg_perigee) * along_node + np.sin(arg_perigee) * along_quarter)
+                ).astype(np.float32)
+    return geometry
+
+
+def _orbit_paths_meet(geometry: Dict[str, np.ndarray], first: np.ndarray, second: np.ndarray,
+                      distance: float) -> np.ndarray:
+    """Orbit-path (geometric) filter: can the two orbit paths come within ``distance``?
+
+    Away from the mutual nodes a point of one orbit lies at least
+    r sin(I) |sin(du)| from the other orbit's plane (I = relative
+    inclination, du = angle from the node), so close approaches can only
+    happen within du <= (pi/2) d / (r sin I) of each node (d = ``distance``).
+    There the radius p / (1 + e cos f) is bounded from e cos f at the node
+    (the eccentricity vector dotted with the node direction), which changes
+    by at most e per radian of du plus node drift. A pair is ruled out when
+    at both nodes those radius ranges are more than ``distance`` apart.
+    """
+    nodes, sines = [], []
+    for stage in ("start", "end"):
+        mutual = _cross(
+            [geometry[f"{stage}_normal_{axis}"][first] for axis in "xyz"],
+            [geometry[f"{stage}_normal_{axis}"][second] for axis in "xyz"]
+        )
+        sin_relative = np.sqrt(_dot(mutual, mutual))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            nodes.append([component / sin_relative for component in mutual])
+        sines.append(sin_relative)
+    node = nodes[0]
+    sin_relative = np.minimum(sines[0], sines[1])
+    # The chord between the start and end node directions bounds the angle turned
+    shift = [end - begin for begin, end in zip(node, nodes[1])]
+    node_drift = np.float32(np.pi / 2.0) * np.sqrt(_dot(shift, shift))
+    with np.errstate(divide="ignore"):
+        window = np.float32(distance * np.pi / 2.0) / sin_relative
+
+    ranges, reach = [], 0.0
+    for index in (first, second):
+        e = geometry["e"][index]
+        e_cos = _dot([geometry[f"eccentricity_{axis}"][index] for axis in "xyz"], node)
+        half_width = np.minimum(np.float32(np.pi / 2.0), window * geometry["inverse_perigee"][index])
+        angle = half_width + node_drift + geometry["drift"][index]
+        reach = reach + angle
+        ranges.append((geometry["p"][index], e, e_cos, e * np.minimum(np.float32(2.0), angle)))
+
+    separated = np.ones(len(first), dtype=bool)
+    for sign in (1.0, -1.0):  # ascending, then descending mutual node
+        bounds = []
+        for p, e, e_cos, spread in ranges:
+            bounds.append((p / (1.0 + np.minimum(e, sign * e_cos + spread)),
+                           p / (1.0 + np.maximum(-e, sign * e_cos - spread))))
+        (low1, high1), (low2, high2) = bounds
+        separated &= (low1 - high2 > distance) | (low2 - high1 > distance)
+
+    # Wide windows could let one orbit's ascending-node region meet the
+    # other's descending-node region, and coplanar orbits have no node;
+    # both are left to the fine screen
+    narrow = reach <= np.float32(np.pi / 2.0)
+    return ~(narrow & separated)
+
+
+class CandidatePairs:
+    """Object pairs surviving the apogee/perigee and orbit-path prefilters
+
+    Objects are ranked by perigee; after the apogee/perigee filter each
+    object's remaining partners are the next few ranks, so the orbit-path
+    outcome is kept as one bit per such pair in that banded layout.
+    """
+
+    def __init__(self, rank: np.ndarray, reach: np.ndarray, offsets: np.ndarray,
+                 bits: np.ndarray, paired: np.ndarray):
+        self.rank = rank          # perigee rank per object (-1 = unusable elements)
+        self.reach = reach        # first rank past each rank's partners
+        self.offsets = offsets    # bit offset of each rank's partners
+        self.bits = bits          # packed orbit-path survivors
+        self.paired = paired      # objects with at least one surviving partner
+        self.stats: Dict = {}
+
+    def __len__(self) -> int:
+        return int(self.stats.get("surviving_pairs", 0))
+
+    def contains(self, first: np.ndarray, second: np.ndarray) -> np.ndarray:
+        """Whether each pair of objects survived both filters"""
+        if len(self.bits) == 0:
+            return np.zeros(len(first), dtype=bool)
+        a = self.rank[first]
+        b = self.rank[second]
+        low, high = np.minimum(a, b), np.maximum(a, b)
+        inside = (low >= 0) & (high < self.reach[np.maximum(low, 0)])
+        bit = self.offsets[np.maximum(low, 0)] + (high - low - 1)
+        bit = np.where(inside, bit, 0)
+        return inside & ((self.bits[bit >> 3] >> (7 - (bit & 7)).astype(np.uint8)) & 1).astype(bool)
+
+    def pairs(self, block_pairs: int = PREFILTER_BLOCK_PAIRS):
+        """Yield the surviving pairs as (first, second) object index arrays, a block at a time"""
+        order = np.empty(int(np.count_nonzero(self.rank >= 0)), dtype=np.int64)
+        order[self.rank[self.rank >= 0]] = np.flatnonzero(self.rank >= 0)
+        for first, second, start, stop in _band_blocks(self.reach, block_pairs):
+            skip = start & 7
+            survived = np.unpackbits(self.bits[start >> 3:(stop + 7) >> 3])[skip:skip + stop - start].astype(bool)
+            yield order[first[survived]], order[second[survived]]
+
+
+def _band_blocks(reach: np.ndarray, block_pairs: int):
+    """Ranks of every banded pair, in blocks, with their bit offsets"""
+    counts = reach - np.arange(len(reach)) - 1
+    cumulative = np.cumsum(counts)
+    first_rank = 0
+    while first_rank < len(reach):
+        done = int(cumulative[first_rank - 1]) if first_rank else 0
+        last_rank = max(int(np.searchsorted(cumulative, done + block_pairs, side="right")), first_rank + 1)
+        block = counts[first_rank:last_rank]
+        total = int(block.sum())
+        if total:
+            first = np.repeat(np.arange(first_rank, last_rank), block)
+            second = first + 1 + np.arange(total) - np.repeat(np.cumsum(block) - block, block)
+            yield first, second, done, done + total
+        first_rank = last_rank
+
+
+def orbit_prefilter(elements: Dict[str, np.ndarray], distance: float, window_days: float,
+                    block_pairs: int = PREFILTER_BLOCK_PAIRS) -> CandidatePairs:
+    """Rule out object pairs whose orbits can never come within ``distance``
+
+    ``elements`` holds mean elements per object (mean_motion in rev/day,
+    eccentricity, angles in degrees) and ``age_days``, the time from each
+    element set's epoch to the start of the screening window. The classic
+    apogee/perigee filter runs first, then the orbit-path filter on what it
+    leaves; the result records how many pairs each stage removed and the
+    time spent building it.
+    """
+    started = time.perf_counter()
+    count = len(elements["mean_motion"])
+    geometry = _orbit_geometry(elements, window_days)
+    perigee, apogee = geometry["perigee"], geometry["apogee"]
+
+    # Apogee/perigee filter: ranked by perigee, an object's shell can only
+    # overlap later-ranked objects whose perigee is below its apogee + distance
+    order = np.flatnonzero(np.isfinite(perigee) & np.isfinite(apogee))
+    order = order[np.argsort(perigee[order], kind="stable")]
+    reach = np.searchsorted(perigee[order], apogee[order] + distance, side="right")
+    counts = reach - np.arange(len(order)) - 1
+    offsets = np.cumsum(counts) - counts
+    rank = np.full(count, -1, dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    total_pairs = count * (count - 1) // 2
+    shell_pairs = int(counts.sum())
+
+    # Lay the geometry out by rank so each block reads nearby rows
+    ranked = {name: values[order] for name, values in geometry.items()}
+    survived = []
+    surviving = 0
+    paired = np.zeros(count, dtype=bool)
+    for first, second, _, _ in _band_blocks(reach, block_pairs):
+        meet = _orbit_paths_meet(ranked, first, second, distance)
+        surviving += int(np.count_nonzero(meet))
+        paired[order[first[meet]]] = True
+        paired[order[second[meet]]] = True
+        survived.append(meet)
+    bits = np.packbits(np.concatenate(survived)) if survived else np.zeros(0, dtype=np.uint8)
+
+    candidates = CandidatePairs(rank, reach, offsets, bits, paired)
+    candidates.stats = {
+        "distance_km": distance,
+        "total_pairs": total_pairs,
+        "apogee_perigee_removed": total_pairs - shell_pairs,
+        "orbit_path_removed": shell_pairs - surviving,
+        "surviving_pairs": surviving,
+        "seconds": round(time.perf_counter() - started, 3)
+    }
+    return candidates
+
+
+class ConjunctionScreener:
+    """Screens a packed SGP4 catalog for close approaches over a window"""
+
+    def __init__(self, radius_km: float = SCREENING_RADIUS_KM,
+                 window_hours: float = SCREENING_WINDOW_HOURS,
+                 step_seconds: float = SCREENING_STEP_SECONDS, chunk_steps: int = 30):
+        self.radius_km = radius_km
+        self.window_hours = window_hours
+        self.step_seconds = step_seconds
+        self.chunk_steps = chunk_steps
+        self.index = "kdtree" if HAS_SCIPY else "grid"
+
+    @property
+    def steps(self) -> int:
+        return int(self.window_hours * 3600.0 / self.step_seconds) + 1
+
+    def screen(self, satrec_array, row_indices: np.ndarray, start: datetime,
+               candidates: Optional[CandidatePairs] = None, primary: Optional[np.ndarray] = None) -> Dict:
+        """Find every pair passing within the screening radius (blocking; run in a thread)
+
+        Objects move up to ``step/2`` seconds either side of each sample, so
+        the index is queried with the radius padded by the largest possible
+        relative speed over that half step, and candidates whose straight-line
+        closest approach within the step is inside the radius are kept. Each
+        chunk's detections are then refined together (see ``_refine``) and
+        samples of the same pass are merged into one event.
+
+        ``candidates`` (from ``orbit_prefilter``, indexed by array position)
+        restricts the result to the pairs that survived the prefilters:
+        objects left without any partner are not indexed at all, and index
+        matches between other objects are dropped unless they survived.
+        Both objects of a match are usually in the index anyway, so this
+        narrows what gets refined rather than the index search. ``primary``
+        marks objects that should come first in a pair (e.g. payloads
+        against debris); miss components are given in the first object's
+        radial/in-track/cross-track frame.
+
+        Returns catalog rows of both objects, time of closest approach in
+        seconds after ``start``, miss distance (km), its radial, in-track and
+        cross-track components (km), relative speed (km/s), the first
+        object's TEME state and the second's relative to it at closest
+        approach, and screening statistics.
+        """
+        started = time.perf_counter()
+        row_indices = np.asarray(row_indices, dtype=np.int64)
+        count = len(row_indices)
+        half_step = self.step_seconds / 2.0
+        screened = candidates.paired if candidates is not None else np.ones(count, dtype=bool)
+
+        passes = []
+        tested = rejected = refined = 0
+        refine_seconds = 0.0
+        for first_step in range(0, self.steps, self.chunk_steps):
+            last_step = min(first_step + self.chunk_steps, self.steps)
+            # One extra sample either side so refinement can bracket the
+            # approach around detections at the chunk edges
+            low_step, high_step = max(first_step - 1, 0), min(last_step + 1, self.steps)
+            times = [start + timedelta(seconds=k * self.step_seconds) for k in range(low_step, high_step)]
+            jd, fr = batch_propagator.split_julian_dates(times)
+            error, position, velocity = satrec_array.sgp4(jd, fr)
+            usable = (error == 0) & np.isfinite(position[:, :, 0])
+
+            detected_steps, detected_firsts, detected_seconds = [], [], []
+            for step in range(first_step, last_step):
+                column = step - low_step
+                valid = np.flatnonzero(screened & usable[:, column])
+                if len(valid) < 2:
+                    continue
+                r = position[valid, column]
+                v = velocity[valid, column]
+                max_speed = float(np.sqrt(np.einsum("ij,ij->i", v, v).max()))
+                pairs = close_pairs(r, self.radius_km + 2.0 * max_speed * half_step)
+                if candidates is not None and len(pairs):
+                    allowed = candidates.contains(valid[pairs[:, 0]], valid[pairs[:, 1]])
+                    rejected += int(np.count_nonzero(~allowed))
+                    pairs = pairs[allowed]
+                if len(pairs) == 0:
+                    continue
+                tested += len(pairs)
+
+                dr = r[pairs[:, 1]] - r[pairs[:, 0]]
+                dv = v[pairs[:, 1]] - v[pairs[:, 0]]
+                miss = np.linalg.norm(dr + dv * _linear_tca(dr, dv, half_step)[:, None], axis=1)
+                close = miss <= self.radius_km
+                if not close.any():
+                    continue
+                detected_steps.append(np.full(int(close.sum()), step, dtype=np.int64))
+                detected_firsts.append(valid[pairs[close, 0]])
+                detected_seconds.append(valid[pairs[close, 1]])
+
+            if not detected_steps:
+                continue
+            step = np.concatenate(detected_steps)
+            first = np.concatenate(detected_firsts)
+            second = np.concatenate(detected_seconds)
+            if primary is not None:
+                swap = primary[second] & ~primary[first]
+                first, second = np.where(swap, second, first), np.where(swap, first, second)
+
+            refine_started = time.perf_counter()
+            event = self._refine(position, velocity, usable, low_step, first, second, step)
+            refine_seconds += time.perf_counter() - refine_started
+            refined += len(step)
+            close = event["miss_distance"] <= self.radius_km
+            passes.append({name: values[close] for name, values in event.items()})
+
+        events = self._merge_passes(count, passes)
+        events["rows"] = (row_indices[events.pop("first")], row_indices[events.pop("second")])
+        events["stats"] = {
+            "objects": count,
+            "steps": self.steps,
+            "step_seconds": self.step_seconds,
+            "window_hours": self.window_hours,
+            "radius_km": self.radius_km,
+            "index": self.index,
+            "candidate_pairs": tested,
+            "prefilter_rejected_pairs": rejected,
+            "refined_samples": refined,
+            "refine_seconds": round(refine_seconds, 3),
+            "conjunctions": len(events["miss_distance"]),
+            "seconds": round(time.perf_counter() - started, 3)
+        }
+        return events
+
+    def _refine(self, position: np.ndarray, velocity: np.ndarray, usable: np.ndarray, low_step: int,
+                first: np.ndarray, second: np.ndarray, step: np.ndarray) -> Dict[str, np.ndarray]:
+        """Time of closest approach by batched root finding on the range rate
+
+        The range rate dr.dv changes sign from negative to positive at the
+        closest approach. Its sign at each detection sample picks the step
+        before or after it; across that step both objects follow cubic
+        Hermite curves through the sampled states, and Illinois-style
+        regula falsi runs on all bracketed detections at once. Detections
+        without a usable bracket keep the straight-line estimate.
+        """
+        h = self.step_seconds
+        column = step - low_step
+        dr = (position[second, column] - position[first, column]).astype(np.float64)
+        dv = (velocity[second, column] - velocity[first, column]).astype(np.float64)
+        rate = np.einsum("ij,ij->i", dr, dv)
+
+        # Straight-line estimate from the detection sample
+        t = _linear_tca(dr, dv, h / 2.0)
+        tca = step * h + t
+        relative = dr + dv * t[:, None]
+        relative_velocity = dv
+        frame_position = position[first, column] + velocity[first, column] * t[:, None]
+        frame_velocity = velocity[first, column].astype(np.float64)
+
+        # Segment [left, left + 1] in chunk columns that should hold the root
+        left = np.where(rate > 0, column - 1, column)
+        inside = (left >= 0) & (left + 1 < usable.shape[1])
+        left = np.where(inside, left, 0)
+        bracket = inside & usable[first, left] & usable[second, left]
+        bracket &= usable[first, left + 1] & usable[second, left + 1]
+        index = np.flatnonzero(bracket)
+        a, b = first[index], second[index]
+        p0, p1 = left[index], left[index] + 1
+        r0 = position[b, p0] - position[a, p0]
+        v0 = velocity[b, p0] - velocity[a, p0]
+        r1 = position[b, p1] - position[a, p1]
+        v1 = velocity[b, p1] - velocity[a, p1]
+
+        def range_rate(s):
+            r, v = hermite_blend(s[:, None], r0, v0, r1, v1, h)
+            return np.einsum("ij,ij->i", r, v)
+
+        low = np.zeros(len(index))
+        high = np.ones(len(index))
+        f_low = range_rate(low)
+        f_high = range_rate(high)
+        solvable = (f_low < 0) & (f_high > 0)
+        low, high = low[solvable], high[solvable]
+        f_low, f_high = f_low[solvable], f_high[solvable]
+        r0, v0, r1, v1 = r0[solvable], v0[solvable], r1[solvable], v1[solvable]
+        index, a, b, p0, p1 = index[solvable], a[solvable], b[solvable], p0[solvable], p1[solvable]
+
+        tolerance = REFINE_TOLERANCE_SECONDS / h
+        side = np.zeros(len(index), dtype=np.int8)
+        for _ in range(REFINE_MAX_ITERATIONS):
+            if len(index) == 0 or np.all(high - low <= tolerance):
+                break
+            s = (low * f_high - high * f_low) / (f_high - f_low)
+            f = range_rate(s)
+            # Illinois: when the same end survives twice in a row, halve its
+            # value so the false-position step keeps closing in from both sides
+            rising = f > 0
+            f_low = np.where(rising & (side > 0), f_low * 0.5, np.where(rising, f_low, f))
+            f_high = np.where(~rising & (side < 0), f_high * 0.5, np.where(rising, f, f_high))
+            low = np.where(rising, low, s)
+            high = np.where(rising, s, high)
+            side = np.where(rising, 1, -1).astype(np.int8)
+        s = (low * f_high - high * f_low) / (f_high - f_low)
+
+        r, v = hermite_blend(s[:, None], r0, v0, r1, v1, h)
+        tca[index] = (low_step + p0 + s) * h
+        relative[index] = r
+        relative_velocity[index] = v
+        frame_position[index], frame_velocity[index] = hermite_blend(
+            s[:, None], position[a, p0], velocity[a, p0], position[a, p1], velocity[a, p1], h
+        )
+
+        # Miss along the radial / in-track / cross-track axes of the first object
+        components = np.einsum("nij,nj->ni", ric_frame(frame_position, frame_velocity), relative)
+        return {
+            "first": first,
+            "second": second,
+            "step": step,
+            "tca_seconds": tca,
+            "miss_distance": np.linalg.norm(relative, axis=1),
+            "radial": components[:, 0],
+            "in_track": components[:, 1],
+            "cross_track": components[:, 2],
+            "relative_velocity": np.linalg.norm(relative_velocity, axis=1),
+            "position": frame_position,
+            "velocity": frame_velocity,
+            "relative_position": relative,
+            "relative_velocity_vector": relative_velocity
+        }
+
+    def _merge_passes(self, count: int, passes) -> Dict:
+        """Collapse consecutive-step detections of a pair into its closest approach"""
+        if not passes:
+            empty = np.zeros(0, dtype=np.float64)
+            none = np.zeros(0, dtype=np.int64)
+            vectors = np.zeros((0, 3), dtype=np.float64)
+            return {"first": none, "second": none, "tca_seconds": empty, "miss_distance": empty,
+                    "radial": empty, "in_track": empty, "cross_track": empty, "relative_velocity": empty,
+                    "position": vectors, "velocity": vectors, "relative_position": vectors,
+                    "relative_velocity_vector": vectors}
+
+        events = {name: np.concatenate([event[name] for event in passes]) for name in passes[0]}
+        step = events.pop("step")
+        pair = events["first"] * count + events["second"]
+        order = np.lexsort((step, pair))
+        pair, step = pair[order], step[order]
+        # A new pass starts when the pair changes or a step was skipped
+        new_pass = np.ones(len(order), dtype=bool)
+        new_pass[1:] = (pair[1:] != pair[:-1]) | (step[1:] - step[:-1] > 1)
+        pass_id = np.cumsum(new_pass) - 1
+
+        best = np.lexsort((events["miss_distance"][order], pass_id))
+        best = order[best[np.r_[True, pass_id[best][1:] != pass_id[best][:-1]]]]
+        return {name: values[best] for name, values in events.items()}
+
+    def get_config(self) -> Dict:
+        return {
+            "radius_km": self.radius_km,
+            "window_hours": self.window_hours,
+            "step_seconds": self.step_seconds,
+            "index": self.index
+        }
@@ -1,40 +1,113 @@
 import asyncio
 import httpx
+import os
 import random
 import math
+import time
+import numpy as np
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional, Tuple
+from pymongo import ReplaceOne
 from .database import get_database
 from .spacetrack_client import spacetrack_client
-from .celestrak_client import celestrak_client
-
-# Try to import scientific packages, use fallbacks if not available
-try:
-    import numpy as np
-    HAS_NUMPY = True
-except ImportError:
-    HAS_NUMPY = False
-    print("⚠️  NumPy not available, using Python math")
-
-try:
-    from skyfield.api import load, EarthSatellite
-    from skyfield.timelib import Time
-    HAS_SKYFIELD = True
-    print("✅ Skyfield available for orbital mechanics")
-except ImportError:
-    HAS_SKYFIELD = False
-    print("⚠️  Skyfield not available, using simplified orbital mechanics")
-    from .orbital_simple import simple_orbital
+from .celestrak_client import celestrak_client, FULL_CATALOG_SATELLITE_GROUPS, FULL_CATALOG_DEBRIS_GROUPS
+from .http_cache import http_cache
+
+from .batch_propagator import batch_propagator
+from .frames import frame_cache
+from .catalog_store import CatalogStore, CatalogRow
+from .catalog_snapshot import catalog_snapshot
+from .ephemeris_grid import EphemerisGrid
+from .parallel_propagation import ShardedPropagator
+from .tle_cache import satrec_cache
+from .tle_history import TLEHistory
+from .pass_predictor import pass_predictor, serialize_pass
+from .refresh_scheduler import RefreshScheduler
+from .single_flight import single_flight, get_stats as single_flight_stats
+from .orbital_simple import simple_orbital
+
+# Rolling ephemeris buffer used for live position lookups
+EPHEMERIS_WINDOW_HOURS = float(os.getenv("EPHEMERIS_WINDOW_HOURS", "6"))
+EPHEMERIS_STEP_SECONDS = float(os.getenv("EPHEMERIS_STEP_SECONDS", "60"))
+EPHEMERIS_CHECK_INTERVAL = 60  # seconds
+
+# Live positions served to the API/WebSocket are recomputed on this cadence
+SNAPSHOT_INTERVAL_SECONDS = float(os.getenv("SNAPSHOT_INTERVAL_SECONDS", "5"))
+
+# Optional process-pool propagation for very large catalogs (0 = in-process)
+PROPAGATION_WORKERS = int(os.getenv("PROPAGATION_WORKERS", "0"))
+PROPAGATION_SHARD_SIZE = int(os.getenv("PROPAGATION_SHARD_SIZE", "5000"))
+
+# Stream the full Celestrak GP catalog instead of the small demo subset
+CELESTRAK_FULL_CATALOG = os.getenv("CELESTRAK_FULL_CATALOG", "false").lower() == "true"
+INGEST_CHUNK_SIZE = 2000  # records encoded into columns at a time
+DB_WRITE_BATCH = 1000
+
+# Background refresh cadence per source; failures retry after
+# REFRESH_RETRY_SECONDS, doubling up to the normal interval
+CELESTRAK_REFRESH_MINUTES = float(os.getenv("CELESTRAK_REFRESH_MINUTES", "120"))
+SPACETRACK_REFRESH_MINUTES = float(os.getenv("SPACETRACK_REFRESH_MINUTES", "60"))
+REFRESH_JITTER = float(os.getenv("REFRESH_JITTER", "0.1"))
+REFRESH_RETRY_SECONDS = float(os.getenv("REFRESH_RETRY_SECONDS", "60"))
+
+# Element sets kept per object for propagating to past/future times
+TLE_HISTORY_DEPTH = int(os.getenv("TLE_HISTORY_DEPTH", "8"))
+
+# Element columns used by the two-body fallback propagator
+FALLBACK_ELEMENTS = ("mean_motion", "eccentricity", "inclination", "raan", "arg_perigee", "mean_anomaly", "ndot")
+
+# Default ground observer for pass predictions (degrees, km)
+DEFAULT_OBSERVER = (
+    float(os.getenv("OBSERVER_LATITUDE", "0")),
+    float(os.getenv("OBSERVER_LONGITUDE", "0")),
+    float(os.getenv("OBSERVER_ALTITUDE_KM", "0"))
+)
 
 class DebrisTracker:
     def __init__(self):
-        if HAS_SKYFIELD:
-            self.ts = load.timescale()
-        else:
-            self.ts = None
         self.db = None
-        self.debris_objects = []
-        self.satellites = []
+        self.catalog = CatalogStore()
+        self.ephemeris = EphemerisGrid(EPHEMERIS_WINDOW_HOURS, EPHEMERIS_STEP_SECONDS)
+        self._ephemeris_task = None
+        # Front buffer of live positions; replaced whole by the snapshot ticker
+        self._snapshot: Optional[Dict] = None
+        self._snapshot_task = None
+        self._refresh_task = None
+        self._snapshot_lock = asyncio.Lock()
+        self.snapshot_seconds = 0.0
+        self.snapshot_ticks = 0
+        self.sharded = ShardedPropagator(PROPAGATION_WORKERS, PROPAGATION_SHARD_SIZE) if PROPAGATION_WORKERS > 0 else None
+        self._tle_text = (None, [], [])
+        self.history = TLEHistory(TLE_HISTORY_DEPTH)
+        # Consumers of catalog change events, called in order for every delta
+        self._catalog_listeners: List[Callable] = [self._apply_catalog_change, self._write_catalog_change]
+        self._db_synced = set()
+        self._unsaved_changes = False
+        self.change_counts = {"events": 0, "added": 0, "changed": 0, "removed": 0, "unchanged": 0}
+        # Each source refreshes on its own timer, never on a request's path
+        self.scheduler = RefreshScheduler()
+        self.scheduler.add_source("celestrak", self._refresh_celestrak, CELESTRAK_REFRESH_MINUTES * 60,
+                                  REFRESH_JITTER, REFRESH_RETRY_SECONDS)
+        self.scheduler.add_source("spacetrack", self._refresh_spacetrack, SPACETRACK_REFRESH_MINUTES * 60,
+                                  REFRESH_JITTER, REFRESH_RETRY_SECONDS)
+
+    @property
+    def debris_objects(self) -> List[CatalogRow]:
+        """Row views of the debris collection"""
+        return self.catalog.rows(self.catalog.indices(collection="debris"))
+
+    @debris_objects.setter
+    def debris_objects(self, records: List[Dict]):
+        self.catalog.replace_collection("debris", records)
+
+    @property
+    def satellites(self) -> List[CatalogRow]:
+        """Row views of the tracked satellites collection"""
+        return self.catalog.rows(self.catalog.indices(collection="satellites"))
+
+    @satellites.setter
+    def satellites(self, records: List[Dict]):
+        self.catalog.replace_collection("satellites", records)
     
     def validate_json_safe(self, data: Dict) -> Dict:
         """Ensure all values in dict are JSON-safe (no NaN, inf, etc.)"""
@@ -62,14 +135,50 @@ class DebrisTracker:
     async def initialize(self):
         """Initialize the debris tracker"""
         self.db = await get_database()
+
+        if self.sharded and batch_propagator.available:
+            self.sharded.start()
+            await self.sharded.warm_up()
         
-        # Try to load real data from Space-Track.org first
-        await self.load_real_data()
-        
+        # Serve the last ingested catalog straight from its memory-mapped
+        # snapshot; the scheduler then refreshes every source in the background
+        if catalog_snapshot.load(self.catalog):
+            loaded = catalog_snapshot.last_loaded
+            print(f"💾 Catalog snapshot mapped: {loaded['objects']} objects "
+                  f"from {loaded['created']} in {loaded['seconds']:.3f}s")
+            self._refresh_propagation_cache()
+            await self.refresh_snapshot()
+            self._ephemeris_task = asyncio.create_task(self._ephemeris_loop())
+            self._snapshot_task = asyncio.create_task(self._snapshot_loop())
+            self._refresh_task = asyncio.create_task(self._warm_start_refresh())
+            return
+
+        # First load runs through the scheduler so its freshness is recorded
+        for source in self.scheduler.sources:
+            await self.scheduler.run_source(source)
+
         # If no real data available, use sample data
         if not self.debris_objects or not self.satellites:
+            print("⚠️  No real data sources available, will use sample data")
             await self.load_sample_data()
+
+        # Precompute the ephemeris buffer and keep it rolling in the background
+        await self.refresh_ephemeris()
+        self._ephemeris_task = asyncio.create_task(self._ephemeris_loop())
+
+        # Serve live positions from a snapshot refreshed in the background
+        await self.refresh_snapshot()
+        self._snapshot_task = asyncio.create_task(self._snapshot_loop())
+        self.scheduler.start()
         
+    async def _warm_start_refresh(self):
+        """Build the ephemeris buffer, then refresh every source, after a snapshot start"""
+        try:
+            await self.refresh_ephemeris()
+        except Exception as e:
+            print(f"⚠️  Ephemeris build failed: {e}")
+        self.scheduler.start(immediate=True)
+
     async def load_sample_data(self):
         """Load sample TLE data for demonstration"""
         # Sample debris objects with realistic orbital parameters
@@ -136,144 +245,661 @@ class DebrisTracker:
         # Always keep in-memory copy for fallback
         self.debris_objects = sample_debris
         self.satellites = sample_satellites
+        self._refresh_propagation_cache()
         
-    async def load_real_data(self):
-        """Load real TLE data from multiple sources"""
-        try:
-            print("🌐 Loading real orbital data...")
-            
-            # Initialize Celestrak client (no registration required)
-            await celestrak_client.initialize()
-            
-            # Try Celestrak first (instant access, no registration)
-            print("🛰️  Trying Celestrak.org (no registration required)...")
-            celestrak_debris = await celestrak_client.get_debris_objects(limit=30)
-            celestrak_satellites = await celestrak_client.get_active_satellites(limit=20)
-            
-            data_loaded = False
-            
+    async def load_celestrak(self) -> bool:
+        """Load TLE data from Celestrak (no registration required)"""
+        await celestrak_client.initialize()
+        print("🛰️  Loading orbital data from Celestrak.org...")
+        data_loaded = False
+
+        if CELESTRAK_FULL_CATALOG:
+            data_loaded = await self._ingest_full_catalog()
+        else:
+            # Both category sets share the client's connection pool
+            celestrak_debris, celestrak_satellites = await asyncio.gather(
+                celestrak_client.get_debris_objects(limit=30),
+                celestrak_client.get_active_satellites(limit=20)
+            )
+
             if celestrak_debris:
-                self.debris_objects = celestrak_debris
+                await self.update_collection("debris", celestrak_debris)
                 print(f"✅ Loaded {len(celestrak_debris)} debris objects from Celestrak")
                 data_loaded = True
-            
+
             if celestrak_satellites:
-                self.satellites = celestrak_satellites
+                await self.update_collection("satellites", celestrak_satellites)
                 print(f"✅ Loaded {len(celestrak_satellites)} satellites from Celestrak")
                 data_loaded = True
-            
-            # Try Space-Track.org as secondary source (if credentials available)
-            if not data_loaded:
-                print("🛰️  Trying Space-Track.org as backup...")
-                if await spacetrack_client.login():
-                    # Get real debris data
-                    debris_data = await spacetrack_client.get_debris_objects(limit=30)
-                    satellite_data = await spacetrack_client.get_active_satellites(limit=20)
-                    
-                    if debris_data:
-                        # Convert Space-Track format to our format
-                        converted_debris = []
-                        for item in debris_data:
-                            converted = spacetrack_client.convert_spacetrack_to_tle(item)
-                            if converted:
-                                converted_debris.append(converted)
-                        
-                        if converted_debris:
-                            self.debris_objects = converted_debris
-                            print(f"✅ Loaded {len(converted_debris)} debris objects from Space-Track")
-                            data_loaded = True
-                    
-                    if satellite_data:
-                        # Convert satellite data
-                        converted_satellites = []
-                        for item in satellite_data:
-                            converted = spacetrack_client.convert_spacetrack_to_tle(item)
-                            if converted:
-                                converted_satellites.append(converted)
-                        
-                        if converted_satellites:
-                            self.satellites = converted_satellites
-                            print(f"✅ Loaded {len(converted_satellites)} satellites from Space-Track")
-                            data_loaded = True
-                else:
-                    print("⚠️  Space-Track.org credentials not available")
-            
-            # Store real data in database if available
-            if self.db is not None and data_loaded:
-                try:
-                    if hasattr(self, 'debris_objects') and self.debris_objects:
-                        await self.db.debris.delete_many({})
-                        await self.db.debris.insert_many(self.debris_objects)
-                    
-                    if hasattr(self, 'satellites') and self.satellites:
-                        await self.db.satellites.delete_many({})
-                        await self.db.satellites.insert_many(self.satellites)
-                    
-                    print("✅ Real data stored in MongoDB Atlas")
-                except Exception as e:
-                    print(f"⚠️  Database storage warning: {e}")
-            
-            if not data_loaded:
-                print("⚠️  No real data sources available, will use sample data")
-                
+
+        # Caches, ephemeris and database already followed the change events
+        if data_loaded and self._unsaved_changes:
+            await self.save_catalog_snapshot()
+        return data_loaded
+
+    async def load_spacetrack(self) -> bool:
+        """Load TLE data from Space-Track.org (requires credentials)"""
+        print("🛰️  Loading orbital data from Space-Track.org...")
+        if not await spacetrack_client.login():
+            print("⚠️  Space-Track.org credentials not available")
+            return False
+
+        data_loaded = False
+        # Limited queries never list a whole collection, so they only add or
+        # update objects; removals come from complete Celestrak listings
+        debris_data = await spacetrack_client.get_debris_objects(limit=30)
+        satellite_data = await spacetrack_client.get_active_satellites(limit=20)
+
+        if debris_data:
+            # Convert Space-Track format to our format
+            converted_debris = spacetrack_client.convert_spacetrack_batch(debris_data)
+            if converted_debris:
+                await self.update_collection("debris", converted_debris, remove_missing=False)
+                print(f"✅ Loaded {len(converted_debris)} debris objects from Space-Track")
+                data_loaded = True
+
+        if satellite_data:
+            # Convert satellite data
+            converted_satellites = spacetrack_client.convert_spacetrack_batch(satellite_data)
+            if converted_satellites:
+                await self.update_collection("satellites", converted_satellites, remove_missing=False)
+                print(f"✅ Loaded {len(converted_satellites)} satellites from Space-Track")
+                data_loaded = True
+
+        if data_loaded and self._unsaved_changes:
+            await self.save_catalog_snapshot()
+        return data_loaded
+
+    async def _refresh_celestrak(self) -> bool:
+        """Scheduled Celestrak refresh"""
+        data_loaded = await self.load_celestrak()
+        if data_loaded:
+            await self._refresh_derived()
+        return data_loaded
+
+    async def _refresh_spacetrack(self) -> Optional[bool]:
+        """Scheduled Space-Track refresh; only a backup while Celestrak fails"""
+        if self.scheduler.sources["celestrak"]["last_outcome"] != "failed":
+            return None
+        data_loaded = await self.load_spacetrack()
+        if data_loaded:
+            await self._refresh_derived()
+        return data_loaded
+
+    async def _refresh_derived(self):
+        """Roll the ephemeris buffer and live positions onto the new catalog"""
+        await self.refresh_ephemeris()
+        await self.refresh_snapshot()
+
+    async def save_catalog_snapshot(self):
+        """Persist the freshly ingested catalog for the next start"""
+        try:
+            name = await asyncio.to_thread(catalog_snapshot.save, self.catalog)
+            if name:
+                self._unsaved_changes = False
+                saved = catalog_snapshot.last_saved
+                print(f"💾 Catalog snapshot written: {saved['objects']} objects in {saved['seconds']:.2f}s")
         except Exception as e:
-            print(f"⚠️  Error loading real data: {e}")
-            print("📝 Falling back to sample data")
-        
+            print(f"⚠️  Catalog snapshot not written: {e}")
+
+    async def _ingest_full_catalog(self) -> bool:
+        """Stream the Celestrak GP groups straight into the column store
+
+        All groups download concurrently, each encoding column chunks every
+        INGEST_CHUNK_SIZE objects, so memory is bounded by the catalog arrays
+        plus one chunk per group. Chunks are merged in the configured group
+        order, with an object listed by several groups kept from the first.
+        """
+        sources = (
+            ("satellites", FULL_CATALOG_SATELLITE_GROUPS, "active"),
+            ("debris", FULL_CATALOG_DEBRIS_GROUPS, "debris"),
+        )
+        jobs = [(collection, group, category) for collection, groups, category in sources for group in groups]
+        results = await asyncio.gather(*(self._ingest_group(*job) for job in jobs))
+
+        loaded = False
+        for collection, _, _ in sources:
+            chunks, seen = [], np.zeros(0, dtype=np.int64)
+            complete = True
+            for (target, _, _), (group_chunks, group_complete) in zip(jobs, results):
+                if target != collection:
+                    continue
+                complete &= group_complete
+                for chunk in group_chunks:
+                    fresh = ~np.isin(chunk["norad_id"], seen)
+                    if not fresh.all():
+                        chunk = {name: column[fresh] for name, column in chunk.items()}
+                    seen = np.concatenate([seen, chunk["norad_id"]])
+                    chunks.append(chunk)
+
+            if chunks:
+                # Objects missing from an incomplete download are not gone;
+                # only a complete listing may remove them
+                if not complete:
+                    print(f"⚠️  Celestrak {collection} incomplete; applying additions and changes only")
+                await self.update_collection_chunks(collection, chunks, remove_missing=complete)
+                print(f"✅ Ingested {sum(len(chunk['norad_id']) for chunk in chunks)} {collection} "
+                      f"from the Celestrak full catalog")
+                loaded = True
+        return loaded
+
+    async def _ingest_group(self, collection: str, group: str, category: str) -> Tuple[List[Dict], bool]:
+        """Column chunks for one GP group and whether it streamed to completion
+
+        An error keeps the chunks received so far but marks the group incomplete.
+        """
+        chunks, batch, seen = [], [], set()
+        complete = True
+        try:
+            async for record in celestrak_client.stream_group(group, category):
+                if record["norad_id"] in seen:
+                    continue
+                seen.add(record["norad_id"])
+                batch.append(record)
+                if len(batch) >= INGEST_CHUNK_SIZE:
+                    chunks.append(self.catalog.encode_records(collection, batch))
+                    batch = []
+        except Exception as e:
+            print(f"⚠️  Error streaming Celestrak {group}: {e}")
+            complete = False
+        if batch:
+            chunks.append(self.catalog.encode_records(collection, batch))
+        return chunks, complete
+
+    # ------------------------------------------------------------------
+    # Delta updates and change events
+    # ------------------------------------------------------------------
+
+    def add_catalog_listener(self, listener: Callable):
+        """Register a consumer of catalog change events (sync or async callable)
+
+        Events are dicts with the collection, the catalog version before and
+        after, NORAD IDs that were ``added``/``changed``/``removed``, the new
+        catalog ``rows`` of added and changed objects, and an ``index_map``
+        from old to new row numbers when removals shifted rows (else None).
+        """
+        self._catalog_listeners.append(listener)
+
+    async def update_collection(self, collection: str, records: List[Dict], remove_missing: bool = True) -> Dict:
+        """Apply freshly fetched records to a collection as a delta"""
+        return await self.update_collection_chunks(
+            collection, [self.catalog.encode_records(collection, records)], remove_missing
+        )
+
+    async def update_collection_chunks(self, collection: str, chunks: List[Dict],
+                                       remove_missing: bool = True) -> Dict:
+        """Apply encoded column chunks as a delta and publish the change event
+
+        ``remove_missing`` drops objects the chunks do not list; only pass
+        True for a complete listing of the collection.
+        """
+        event = self.catalog.apply_updates(collection, chunks, remove_missing)
+        for key in ("added", "changed", "removed"):
+            self.change_counts[key] += len(event[key])
+        self.change_counts["unchanged"] += event["unchanged"]
+        print(f"🔁 {collection}: {len(event['added'])} added, {len(event['changed'])} changed, "
+              f"{len(event['removed'])} removed, {event['unchanged']} unchanged")
+        if event["version"] != event["previous_version"]:
+            self.change_counts["events"] += 1
+            self._unsaved_changes = True
+            await self._publish_catalog_change(event)
+        return event
+
+    async def _publish_catalog_change(self, event: Dict):
+        for listener in self._catalog_listeners:
+            try:
+                result = listener(event)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                print(f"⚠️  Catalog change listener {getattr(listener, '__name__', listener)} failed: {e}")
+
+    async def _apply_catalog_change(self, event: Dict):
+        """Bring the propagation caches and ephemeris buffer up to the new version"""
+        rows = event["rows"]
+        self._patch_tle_text(event)
+        added = self.history.record(self.catalog, rows) if len(rows) else 0
+        if added:
+            print(f"🗂️  TLE history: {added} new element sets ({len(self.history)} stored)")
+        if not batch_propagator.available:
+            return
+
+        satrec_cache.discard(event["removed"].tolist())
+        satrec_cache.warm(self._tle_records(rows))
+        satrec_cache.invalidate_arrays()
+        await self._patch_ephemeris(event)
+
+    def _patch_tle_text(self, event: Dict):
+        """Carry the per-row TLE text over a delta instead of rebuilding it"""
+        version, lines1, lines2 = self._tle_text
+        if version != event["previous_version"]:
+            return
+        if event["index_map"] is not None:
+            survivors = np.flatnonzero(event["index_map"] >= 0).tolist()
+            lines1 = [lines1[i] for i in survivors]
+            lines2 = [lines2[i] for i in survivors]
+        else:
+            lines1, lines2 = list(lines1), list(lines2)
+        # Changed rows come first, then added rows in ascending order
+        for row in event["rows"].tolist():
+            line1, line2 = self.catalog.tle_lines(row)
+            if row < len(lines1):
+                lines1[row], lines2[row] = line1, line2
+            else:
+                lines1.append(line1)
+                lines2.append(line2)
+        self._tle_text = (event["version"], lines1, lines2)
+
+    async def _patch_ephemeris(self, event: Dict):
+        """Re-propagate only added and changed objects into the ephemeris buffer"""
+        grid = self.ephemeris
+        if grid.start is None or grid.version != event["previous_version"]:
+            return
+        rows, satrecs = [], []
+        for row, record in zip(event["rows"].tolist(), self._tle_records(event["rows"])):
+            try:
+                satrecs.append(satrec_cache.get(record))
+                rows.append(row)
+            except Exception as e:
+                print(f"Error parsing TLE for {record.get('name')}: {e}")
+        satrec_array = batch_propagator.build_array(satrecs) if satrecs else None
+        patched = await asyncio.to_thread(
+            grid.patched, event["index_map"], event["rows"], satrec_array,
+            np.asarray(rows, dtype=np.int64), event["version"]
+        )
+        # Only swap if nothing rebuilt or patched the buffer meanwhile
+        if self.ephemeris is grid:
+            self.ephemeris = patched
+            print(f"🗺️  Ephemeris buffer patched: {len(rows)} objects re-propagated "
+                  f"in {patched.build_seconds:.2f}s")
+
+    async def _write_catalog_change(self, event: Dict):
+        """Mirror a delta into MongoDB with upserts and targeted deletes
+
+        The first write of a process replaces the collection so the
+        database starts from the same state as memory.
+        """
+        if self.db is None:
+            return
+        collection = event["collection"]
+        try:
+            if collection not in self._db_synced:
+                await self._store_collection(collection)
+                self._db_synced.add(collection)
+                print(f"✅ {collection} stored in MongoDB Atlas")
+                return
+
+            target = self.db[collection]
+            rows = event["rows"]
+            for first in range(0, len(rows), DB_WRITE_BATCH):
+                documents = [row.to_dict() for row in self.catalog.rows(rows[first:first + DB_WRITE_BATCH])]
+                await target.bulk_write([
+                    ReplaceOne({"norad_id": document["norad_id"]}, document, upsert=True)
+                    for document in documents
+                ], ordered=False)
+            if len(event["removed"]):
+                await target.delete_many({"norad_id": {"$in": event["removed"].tolist()}})
+        except Exception as e:
+            print(f"⚠️  Database storage warning: {e}")
+
+    async def _store_collection(self, collection: str):
+        """Replace a MongoDB collection with the catalog rows, in batches"""
+        indices = self.catalog.indices(collection=collection)
+        if len(indices) == 0:
+            return
+        target = self.db[collection]
+        await target.delete_many({})
+        for first in range(0, len(indices), DB_WRITE_BATCH):
+            documents = [row.to_dict() for row in self.catalog.rows(indices[first:first + DB_WRITE_BATCH])]
+            await target.insert_many(documents)
+
+    def _refresh_propagation_cache(self):
+        """Parse new element sets once so propagation never touches TLE text"""
+        added = self.history.record(self.catalog)
+        if added:
+            print(f"🗂️  TLE history: {added} new element sets ({len(self.history)} stored)")
+        if not batch_propagator.available:
+            return
+        parsed = satrec_cache.warm(self._tle_records())
+        satrec_cache.prune(self.catalog["norad_id"].tolist())
+        satrec_cache.invalidate_arrays()
+        print(f"🛰️  SGP4 record cache ready ({parsed} element sets parsed)")
+
+    def _catalog_tle_text(self):
+        """TLE text for every catalog row, rebuilt once per catalog version"""
+        version, lines1, lines2 = self._tle_text
+        if version != self.catalog.version:
+            lines = [self.catalog.tle_lines(index) for index in range(len(self.catalog))]
+            lines1 = [line[0] for line in lines]
+            lines2 = [line[1] for line in lines]
+            self._tle_text = (self.catalog.version, lines1, lines2)
+        return lines1, lines2
+
+    def catalog_satrecs(self):
+        """Catalog rows that parsed and their packed SGP4 array, for the current version"""
+        return satrec_cache.get_array("catalog", self.catalog.version, self._tle_records)
+
+    def _tle_records(self, indices=None) -> List[Dict]:
+        """Name, NORAD ID and TLE text per row, from the once-per-version text"""
+        lines1, lines2 = self._catalog_tle_text()
+        if indices is None:
+            indices = np.arange(len(self.catalog))
+        names = self.catalog["name"][indices].tolist()
+        norad_ids = self.catalog["norad_id"][indices].tolist()
+        return [
+            {"name": name.decode("ascii"), "norad_id": norad_id, "line1": lines1[i], "line2": lines2[i]}
+            for i, name, norad_id in zip(np.asarray(indices).tolist(), names, norad_ids)
+        ]
+
+    async def _propagate_sharded(self, collection: str, when: datetime) -> Dict:
+        """Propagate a collection across the worker pool"""
+        indices = self.catalog.indices(collection=collection)
+        lines1, lines2 = self._catalog_tle_text()
+        result = await self.sharded.propagate(
+            (collection, self.catalog.version),
+            [lines1[i] for i in indices], [lines2[i] for i in indices], [when]
+        )
+        jd, fr = batch_propagator.split_julian_dates([when])
+        latitude, longitude, altitude = frame_cache.teme_to_geodetic(
+            result["position"].astype(np.float64), jd + fr
+        )
+        valid = (result["error"][:, 0] == 0) & np.isfinite(altitude[:, 0])
+        return {
+            "indices": indices[valid],
+            "latitude": latitude[valid, 0],
+            "longitude": longitude[valid, 0],
+            "altitude": altitude[valid, 0],
+            "velocity": np.linalg.norm(result["velocity_vector"][valid, 0].astype(np.float64), axis=-1)
+        }
+
+    async def _propagate_collection(self, collection: str, when: datetime) -> Dict:
+        """Compute positions for every object of a catalog collection at one instant
+
+        Returns the catalog row indexes that propagated successfully and
+        matching latitude/longitude/altitude/velocity arrays.
+        """
+        if self.ephemeris.covers(when, self.catalog.version):
+            return self._interpolate_collection(collection, when)
+
+        indices = self.catalog.indices(collection=collection)
+        jd, fr = batch_propagator.split_julian_dates([when])
+        selection = self._nearest_element_sets(indices, jd[0] + fr[0])
+        replay = bool((selection >= 0).any())
+
+        if self.sharded and self.sharded.enabled and not replay:
+            return await self._propagate_sharded(collection, when)
+
+        if not batch_propagator.available:
+            # Vectorized two-body + J2 fallback straight from the element columns
+            result = simple_orbital.propagate_elements(self._select_elements(indices, selection), when)
+            valid = result["valid"]
+            return {
+                "indices": indices[valid],
+                "latitude": result["latitude"][valid],
+                "longitude": result["longitude"][valid],
+                "altitude": result["altitude"][valid],
+                "velocity": result["velocity"][valid]
+            }
+
+        if replay:
+            # Some objects have an older element set nearer the target time
+            rows = np.arange(len(indices))
+            satrec_array = batch_propagator.build_array(self._select_satrecs(indices, selection))
+        else:
+            rows, satrec_array = satrec_cache.get_array(
+                collection, self.catalog.version, lambda: self._tle_records(indices)
+            )
+        if satrec_array is None:
+            empty = np.zeros(0, dtype=np.float64)
+            return {"indices": indices[:0], "latitude": empty, "longitude": empty, "altitude": empty, "velocity": empty}
+
+        result = batch_propagator.propagate(satrec_array, when)
+        valid = result["valid"][:, 0]
+        if not valid.all():
+            print(f"⚠️  SGP4 failed for {int((~valid).sum())} {collection} objects")
+
+        return {
+            "indices": indices[rows][valid],
+            "latitude": result["latitude"][valid, 0],
+            "longitude": result["longitude"][valid, 0],
+            "altitude": result["altitude"][valid, 0],
+            "velocity": result["velocity"][valid, 0]
+        }
+
+    def _interpolate_collection(self, collection: str, when: datetime) -> Dict:
+        """Read a collection's positions from the ephemeris buffer"""
+        grid = self.ephemeris
+        rows = np.flatnonzero(self.catalog.mask(collection=collection)[grid.row_indices])
+        sample = grid.interpolate(when, rows)
+        valid = sample["valid"]
+
+        jd, fr = batch_propagator.split_julian_dates([when])
+        latitude, longitude, altitude = frame_cache.teme_to_geodetic(
+            sample["position"][valid][:, None, :], jd + fr
+        )
+        return {
+            "indices": grid.row_indices[rows][valid],
+            "latitude": latitude[:, 0],
+            "longitude": longitude[:, 0],
+            "altitude": altitude[:, 0],
+            "velocity": np.linalg.norm(sample["velocity"][valid], axis=-1)
+        }
+
+    async def refresh_ephemeris(self, force: bool = False) -> bool:
+        """Rebuild the ephemeris buffer in a worker thread when it goes stale"""
+        if not batch_propagator.available or len(self.catalog) == 0:
+            return False
+
+        now = datetime.utcnow()
+        version = self.catalog.version
+        if not force and not self.ephemeris.needs_rebuild(now, version):
+            return False
+
+        rows, satrec_array = self.catalog_satrecs()
+        if satrec_array is None:
+            return False
+
+        grid = EphemerisGrid(self.ephemeris.window_hours, self.ephemeris.step_seconds)
+        row_indices = np.asarray(rows, dtype=np.int64)
+
+        if self.sharded and self.sharded.enabled:
+            started = time.perf_counter()
+            lines1, lines2 = self._catalog_tle_text()
+            result = await self.sharded.propagate(
+                ("catalog", version),
+                [lines1[i] for i in rows], [lines2[i] for i in rows], grid.sample_times(now)
+            )
+            grid.load(result["error"], result["position"], result["velocity_vector"],
+                      row_indices, now, version, time.perf_counter() - started)
+            await asyncio.to_thread(grid.measure_error, satrec_array)
+        else:
+            def build():
+                grid.build(satrec_array, row_indices, now, version)
+                grid.measure_error(satrec_array)
+
+            await asyncio.to_thread(build)
+        # Swap in the finished buffer; readers never see a partial build
+        self.ephemeris = grid
+        error = grid.error_report.get("max_error_km")
+        print(f"🗺️  Ephemeris buffer rebuilt: {len(rows)} objects, {grid.steps} steps "
+              f"in {grid.build_seconds:.2f}s (max interpolation error {error} km)")
+        return True
+
+    async def _ephemeris_loop(self):
+        """Keep the ephemeris window rolling ahead of the current time"""
+        while True:
+            await asyncio.sleep(EPHEMERIS_CHECK_INTERVAL)
+            try:
+                await self.refresh_ephemeris()
+            except Exception as e:
+                print(f"⚠️  Ephemeris refresh failed: {e}")
+
+    async def refresh_snapshot(self) -> Dict:
+        """Recompute every live position into a new buffer, then swap it in"""
+        async with self._snapshot_lock:
+            started = time.perf_counter()
+            current_time = datetime.utcnow()
+            snapshot = {
+                "debris": await self._compute_live_debris(current_time),
+                "satellites": await self._compute_tracked_satellites(current_time),
+                "timestamp": current_time.isoformat(),
+                "catalog_version": self.catalog.version
+            }
+            # Readers hold the previous buffer until this single assignment
+            self._snapshot = snapshot
+            self.snapshot_seconds = time.perf_counter() - started
+            self.snapshot_ticks += 1
+            return snapshot
+
+    async def _snapshot_loop(self):
+        """Keep the live position snapshot fresh"""
+        while True:
+            await asyncio.sleep(SNAPSHOT_INTERVAL_SECONDS)
+            try:
+                await self.refresh_snapshot()
+            except Exception as e:
+                print(f"⚠️  Snapshot refresh failed: {e}")
+
+    async def _current_snapshot(self) -> Dict:
+        """Front buffer, computed on demand before the ticker's first run"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = await self._first_snapshot()
+        return snapshot
+
+    @single_flight()
+    async def _first_snapshot(self) -> Dict:
+        """One on-demand build shared by every request that finds no snapshot"""
+        return self._snapshot or await self.refresh_snapshot()
+
+    def find_object(self, norad_id: int, collection: Optional[str] = None) -> Optional[int]:
+        """Catalog row index for a NORAD ID (optionally within one collection)"""
+        mask = self.catalog["norad_id"] == norad_id
+        if collection is not None:
+            mask &= self.catalog.mask(collection=collection)
+        matches = np.flatnonzero(mask)
+        return int(matches[0]) if len(matches) else None
+
+    def propagate_track(self, index: int, times: List[datetime]) -> Dict:
+        """Positions of one catalog object at many times
+
+        Reads from the ephemeris buffer when it spans every requested time,
+        otherwise propagates directly, using the stored element set whose
+        epoch is nearest each time.
+        """
+        jd, fr = batch_propagator.split_julian_dates(times) if times else (np.zeros(0), np.zeros(0))
+        grid = self.ephemeris
+
+        if times and grid.covers(times[0], self.catalog.version) and grid.covers(times[-1], self.catalog.version):
+            buffer_rows = np.flatnonzero(grid.row_indices == index)
+            if len(buffer_rows):
+                sample = grid.interpolate_track(int(buffer_rows[0]), times)
+                latitude, longitude, altitude = frame_cache.teme_to_geodetic(
+                    sample["position"][None, :, :], jd + fr
+                )
+                return {
+                    "latitude": latitude[0],
+                    "longitude": longitude[0],
+                    "altitude": altitude[0],
+                    "velocity": np.linalg.norm(sample["velocity"], axis=-1),
+                    "valid": sample["valid"] & np.isfinite(altitude[0])
+                }
+
+        # Propagate each run of times from the element set nearest to it
+        selection = self._nearest_element_sets(np.full(len(times), index), jd + fr)
+        track = {key: np.full(len(times), np.nan) for key in ("latitude", "longitude", "altitude", "velocity")}
+        track["valid"] = np.zeros(len(times), dtype=bool)
+
+        for choice in np.unique(selection):
+            part = selection == choice
+            part_times = [when for when, selected in zip(times, part) if selected]
+            if not batch_propagator.available:
+                elements = self._select_elements(np.array([index]), np.array([choice]))
+                result = simple_orbital.propagate_elements(elements, part_times)
+            else:
+                satrec = self._select_satrecs([index], [choice])[0]
+                result = batch_propagator.propagate(batch_propagator.build_array([satrec]), part_times)
+            for key in track:
+                track[key][part] = result[key][0]
+        return track
+
+    def _nearest_element_sets(self, indices, target_jd) -> np.ndarray:
+        """History rows to propagate from, or -1 where the current element set is nearest"""
+        norad_ids = self.catalog["norad_id"][indices]
+        rows = self.history.nearest(norad_ids, target_jd)
+        current = np.broadcast_to(
+            self.history.make_keys(norad_ids, self.catalog.epoch_jd(indices)), rows.shape
+        )
+        found = rows >= 0
+        historical = np.zeros(rows.shape, dtype=bool)
+        historical[found] = self.history.keys[rows[found]] != current[found]
+        return np.where(historical, rows, -1)
+
+    def _select_elements(self, indices, selection) -> Dict[str, np.ndarray]:
+        """Element columns for catalog rows, with history element sets substituted"""
+        elements = {name: self.catalog[name][indices].astype(np.float64) for name in FALLBACK_ELEMENTS}
+        elements["epoch_jd"] = self.catalog.epoch_jd(indices)
+        replaced = np.asarray(selection) >= 0
+        if replaced.any():
+            history = self.history.elements(np.asarray(selection)[replaced])
+            for name in elements:
+                elements[name][replaced] = history[name]
+        return elements
+
+    def _select_satrecs(self, indices, selection) -> List:
+        """SGP4 records for catalog rows, with history element sets substituted"""
+        return [
+            self.history.satrec(int(row)) if row >= 0 else satrec_cache.get(self.catalog.row(int(index)))
+            for index, row in zip(np.asarray(indices).tolist(), np.asarray(selection).tolist())
+        ]
+
+    def get_tle_history(self, norad_id: int) -> List[str]:
+        """Epochs of the stored element sets for one object"""
+        return [
+            (datetime(1970, 1, 1) + timedelta(milliseconds=round((float(jd) - 2440587.5) * 86400000))).isoformat()
+            for jd in self.history.epochs(norad_id)
+        ]
+
     async def get_live_debris(self) -> List[Dict]:
-        """Get live debris positions"""
+        """Get live debris positions from the current snapshot"""
+        return (await self._current_snapshot())["debris"]
+
+    async def get_tracked_satellites(self) -> List[Dict]:
+        """Get tracked satellite positions from the current snapshot"""
+        return (await self._current_snapshot())["satellites"]
+
+    async def _compute_live_debris(self, current_time: datetime) -> List[Dict]:
+        """Propagate the debris collection into API records"""
         live_debris = []
-        current_time = datetime.utcnow()
+        timestamp = current_time.isoformat()
         
-        for debris in self.debris_objects:
-            try:
-                if HAS_SKYFIELD and self.ts:
-                    # Use Skyfield for accurate calculations
-                    skyfield_time = self.ts.now()
-                    satellite = EarthSatellite(debris["line1"], debris["line2"], debris["name"], self.ts)
-                    geocentric = satellite.at(skyfield_time)
-                    subpoint = geocentric.subpoint()
-                    
-                    # Add some realistic variation for demo
-                    lat_variation = random.uniform(-0.1, 0.1)
-                    lon_variation = random.uniform(-0.1, 0.1)
-                    
-                    debris_info = {
-                        "id": debris["norad_id"],
-                        "name": debris["name"],
-                        "latitude": float(subpoint.latitude.degrees) + lat_variation,
-                        "longitude": float(subpoint.longitude.degrees) + lon_variation,
-                        "altitude": float(subpoint.elevation.km),
-                        "velocity": random.uniform(7.5, 7.8),  # km/s
-                        "risk_level": debris["risk_level"],
-                        "size_estimate": debris["size_estimate"],
-                        "object_type": debris["object_type"],
-                        "timestamp": skyfield_time.utc_iso()
-                    }
-                    debris_info = self.validate_json_safe(debris_info)
-                else:
-                    # Use simplified orbital mechanics
-                    position = simple_orbital.tle_to_position(debris["line1"], debris["line2"])
-                    
-                    debris_info = {
-                        "id": debris["norad_id"],
-                        "name": debris["name"],
-                        "latitude": position["latitude"],
-                        "longitude": position["longitude"],
-                        "altitude": position["altitude"],
-                        "velocity": position["velocity"],
-                        "risk_level": debris["risk_level"],
-                        "size_estimate": debris["size_estimate"],
-                        "object_type": debris["object_type"],
-                        "timestamp": current_time.isoformat()
-                    }
-                    debris_info = self.validate_json_safe(debris_info)
-                
-                live_debris.append(debris_info)
-                
-            except Exception as e:
-                print(f"Error processing debris {debris['name']}: {e}")
-                continue
+        positions = await self._propagate_collection("debris", current_time)
+        indices = positions["indices"]
+        columns = zip(
+            self.catalog.decode("norad_id", indices),
+            self.catalog.decode("name", indices),
+            positions["latitude"].tolist(),
+            positions["longitude"].tolist(),
+            positions["altitude"].tolist(),
+            positions["velocity"].tolist(),
+            self.catalog.decode("risk_level", indices),
+            self.catalog.decode("size_estimate", indices),
+            self.catalog.decode("object_type", indices)
+        )
+        for norad_id, name, lat, lon, alt, velocity, risk_level, size_estimate, object_type in columns:
+            debris_info = {
+                "id": norad_id,
+                "name": name,
+                "latitude": lat,
+                "longitude": lon,
+                "altitude": alt,
+                "velocity": velocity,  # km/s
+                "risk_level": risk_level,
+                "size_estimate": size_estimate,
+                "object_type": object_type,
+                "timestamp": timestamp
+            }
+            live_debris.append(self.validate_json_safe(debris_info))
                 
         # Add some simulated debris for better visualization
         for i in range(20):
@@ -287,71 +913,184 @@ class DebrisTracker:
                 "risk_level": random.choice(["low", "medium", "high"]),
                 "size_estimate": random.uniform(0.01, 0.5),
                 "object_type": "debris",
-                "timestamp": current_time.isoformat()
+                "timestamp": timestamp
             }
             simulated_debris = self.validate_json_safe(simulated_debris)
             live_debris.append(simulated_debris)
             
         return live_debris
         
-    async def get_tracked_satellites(self) -> List[Dict]:
-        """Get tracked satellites positions"""
+    async def _compute_tracked_satellites(self, current_time: datetime) -> List[Dict]:
+        """Propagate the satellites collection into API records"""
         live_satellites = []
-        current_time = datetime.utcnow()
+        timestamp = current_time.isoformat()
         
-        for sat in self.satellites:
-            try:
-                if HAS_SKYFIELD and self.ts:
-                    # Use Skyfield for accurate calculations
-                    skyfield_time = self.ts.now()
-                    satellite = EarthSatellite(sat["line1"], sat["line2"], sat["name"], self.ts)
-                    geocentric = satellite.at(skyfield_time)
-                    subpoint = geocentric.subpoint()
-                    
-                    sat_info = {
-                        "id": sat["norad_id"],
-                        "name": sat["name"],
-                        "latitude": float(subpoint.latitude.degrees),
-                        "longitude": float(subpoint.longitude.degrees),
-                        "altitude": float(subpoint.elevation.km),
-                        "mission_type": sat["mission_type"],
-                        "object_type": sat["object_type"],
-                        "timestamp": skyfield_time.utc_iso()
-                    }
-                    sat_info = self.validate_json_safe(sat_info)
-                else:
-                    # Use simplified orbital mechanics
-                    position = simple_orbital.tle_to_position(sat["line1"], sat["line2"])
-                    
-                    sat_info = {
-                        "id": sat["norad_id"],
-                        "name": sat["name"],
-                        "latitude": position["latitude"],
-                        "longitude": position["longitude"],
-                        "altitude": position["altitude"],
-                        "mission_type": sat["mission_type"],
-                        "object_type": sat["object_type"],
-                        "timestamp": current_time.isoformat()
-                    }
-                    sat_info = self.validate_json_safe(sat_info)
-                
-                live_satellites.append(sat_info)
-                
-            except Exception as e:
-                print(f"Error processing satellite {sat['name']}: {e}")
-                continue
+        positions = await self._propagate_collection("satellites", current_time)
+        indices = positions["indices"]
+        columns = zip(
+            self.catalog.decode("norad_id", indices),
+            self.catalog.decode("name", indices),
+            positions["latitude"].tolist(),
+            positions["longitude"].tolist(),
+            positions["altitude"].tolist(),
+            positions["velocity"].tolist(),
+            self.catalog.decode("mission_type", indices),
+            self.catalog.decode("object_type", indices)
+        )
+        for norad_id, name, lat, lon, alt, velocity, mission_type, object_type in columns:
+            sat_info = {
+                "id": norad_id,
+                "name": name,
+                "latitude": lat,
+                "longitude": lon,
+                "altitude": alt,
+                "velocity": velocity,  # km/s
+                "mission_type": mission_type or "other",
+                "object_type": object_type,
+                "timestamp": timestamp
+            }
+            live_satellites.append(self.validate_json_safe(sat_info))
                 
         return live_satellites
         
+    async def get_satellite(self, norad_id: int) -> Optional[Dict]:
+        """Get the live position of one tracked satellite"""
+        index = self.find_object(norad_id, collection="satellites")
+        if index is None:
+            return None
+        sat = self.catalog.row(index)
+
+        current_time = datetime.utcnow()
+        track = self.propagate_track(index, [current_time])
+        if not track["valid"][0]:
+            return None
+        position = {key: float(track[key][0]) for key in ("latitude", "longitude", "altitude", "velocity")}
+
+        sat_info = {
+            "id": sat["norad_id"],
+            "name": sat["name"],
+            "latitude": position["latitude"],
+            "longitude": position["longitude"],
+            "altitude": position["altitude"],
+            "velocity": position["velocity"],  # km/s
+            "mission_type": sat.get("mission_type", "other"),
+            "object_type": sat["object_type"],
+            "timestamp": current_time.isoformat()
+        }
+        return self.validate_json_safe(sat_info)
+
+    async def predict_passes(self, norad_ids: List[int], observer: Optional[tuple] = None,
+                             hours: float = 48.0, min_elevation: float = 0.0,
+                             start: Optional[datetime] = None) -> Dict[int, List[Dict]]:
+        """Rise/culmination/set passes over an observer for many objects at once
+
+        Rows, epochs and SGP4 records are resolved on the event loop, where
+        catalog deltas are applied; only the search runs in a worker thread.
+        """
+        if not batch_propagator.available:
+            return {}
+
+        objects = []
+        for norad_id in norad_ids:
+            index = self.find_object(norad_id)
+            if index is None:
+                continue
+            # The epoch identifies the element set, so a new TLE invalidates cached passes
+            epoch_key = (int(self.catalog["epoch_year"][index]), float(self.catalog["epoch_day"][index]))
+            objects.append((int(norad_id), epoch_key, satrec_cache.get(self.catalog.row(index))))
+
+        passes = await asyncio.to_thread(
+            pass_predictor.predict, objects, observer or DEFAULT_OBSERVER, start or datetime.utcnow(),
+            hours, min_elevation
+        )
+        return {
+            norad_id: [serialize_pass(event) for event in events]
+            for norad_id, events in passes.items()
+        }
+
+    def get_catalog_statistics(self) -> Dict:
+        """Object counts by type, risk level and altitude band"""
+        catalog = self.catalog
+        mean_altitude = (catalog["perigee"] + catalog["apogee"]) / 2.0
+        debris_mask = catalog.mask(collection="debris")
+
+        return {
+            "total_objects": len(catalog),
+            "object_types": catalog.count_by("object_type"),
+            "risk_distribution": catalog.count_by("risk_level", debris_mask),
+            "mission_types": catalog.count_by("mission_type"),
+            "altitude_distribution": {
+                'LEO (200-2000km)': int(np.count_nonzero((mean_altitude >= 200) & (mean_altitude <= 2000))),
+                'MEO (2000-35786km)': int(np.count_nonzero((mean_altitude > 2000) & (mean_altitude <= 35786))),
+                'GEO (35786km+)': int(np.count_nonzero(mean_altitude > 35786))
+            },
+            "debris_objects": int(np.count_nonzero(debris_mask)),
+            "memory": catalog.memory_usage()
+        }
+
+    def get_cache_stats(self) -> Dict:
+        """Get propagation cache statistics"""
+        return {
+            "satrec_cache": satrec_cache.get_stats(),
+            "sharded_propagation": self.sharded.get_stats() if self.sharded else {"enabled": False},
+            "pass_prediction": pass_predictor.get_stats(),
+            "tle_history": self.history.get_stats(),
+            "frame_transforms": frame_cache.get_stats(),
+            "position_snapshot": self.get_snapshot_stats(),
+            "http_cache": http_cache.get_stats(),
+            "spacetrack_requests": spacetrack_client.get_stats(),
+            "catalog_snapshot": catalog_snapshot.get_stats(),
+            "catalog_changes": dict(self.change_counts, version=self.catalog.version),
+            "single_flight": single_flight_stats()
+        }
+
+    def get_snapshot_stats(self) -> Dict:
+        """Age and build cost of the live position snapshot"""
+        snapshot = self._snapshot
+        return {
+            "interval_seconds": SNAPSHOT_INTERVAL_SECONDS,
+            "timestamp": snapshot["timestamp"] if snapshot else None,
+            "objects": len(snapshot["debris"]) + len(snapshot["satellites"]) if snapshot else 0,
+            "build_seconds": round(self.snapshot_seconds, 4),
+            "ticks": self.snapshot_ticks
+        }
+        
     async def refresh_data(self):
-        """Refresh data from Space-Track.org (called periodically)"""
-        try:
-            print("🔄 Refreshing data from Space-Track.org...")
-            await self.load_real_data()
-        except Exception as e:
-            print(f"⚠️  Data refresh failed: {e}")
+        """Refresh every source now and wait for it (the API queues jobs instead)"""
+        for source in self.scheduler.sources:
+            await self.scheduler.run_source(source)
+
+    def get_data_freshness(self) -> Dict:
+        """Refresh schedule per source plus the age of the element sets it supplied"""
+        freshness = self.scheduler.get_freshness()
+        catalog = self.catalog
+        if len(catalog):
+            jd, fr = batch_propagator.split_julian_dates([datetime.utcnow()])
+            age_hours = (jd[0] + fr[0] - catalog.epoch_jd()) * 24.0
+            for source, stats in freshness.items():
+                mask = catalog.mask(data_source=source) if source in catalog.categories["data_source"] else None
+                count = int(np.count_nonzero(mask)) if mask is not None else 0
+                stats["objects"] = count
+                if count:
+                    ages = age_hours[mask]
+                    stats["element_age_hours"] = {
+                        "min": round(float(ages.min()), 2),
+                        "median": round(float(np.median(ages)), 2),
+                        "max": round(float(ages.max()), 2)
+                    }
+        return freshness
     
     async def close(self):
         """Clean up resources"""
+        if self._ephemeris_task:
+            self._ephemeris_task.cancel()
+        if self._snapshot_task:
+            self._snapshot_task.cancel()
+        if self._refresh_task:
+            self._refresh_task.cancel()
+        await self.scheduler.stop()
+        if self.sharded:
+            self.sharded.shutdown()
         await spacetrack_client.close()
-        await celestrak_client.close()
\ No newline at end of file
+        await celestrak_client.close()
+        http_cache.flush()
\ No newline at end of file
@@ -0,0 +1,263 @@
+"""
+Precomputed ephemeris grid with cubic Hermite interpolation
+Propagates the whole catalog over a rolling window so live position lookups
+interpolate instead of running SGP4
+"""
+
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .batch_propagator import batch_propagator
+
+
+def hermite_blend(s, p0, v0, p1, v1, step_seconds: float):
+    """Cubic Hermite position and derivative for fraction ``s`` of a step
+
+    ``p0``/``v0`` and ``p1``/``v1`` are the states at the two ends of the
+    step (km, km/s); ``s`` broadcasts against them.
+    """
+    h = step_seconds
+    p0 = p0.astype(np.float64)
+    p1 = p1.astype(np.float64)
+    v0 = v0.astype(np.float64)
+    v1 = v1.astype(np.float64)
+
+    s2 = s * s
+    s3 = s2 * s
+    position = (
+        (2 * s3 - 3 * s2 + 1) * p0
+        + (s3 - 2 * s2 + s) * h * v0
+        + (-2 * s3 + 3 * s2) * p1
+        + (s3 - s2) * h * v1
+    )
+    velocity = (
+        (6 * s2 - 6 * s) * p0
+        + (3 * s2 - 4 * s + 1) * h * v0
+        + (-6 * s2 + 6 * s) * p1
+        + (3 * s2 - 2 * s) * h * v1
+    ) / h
+    return position, velocity
+
+
+class EphemerisGrid:
+    """Rolling float32 buffer of TEME positions and velocities for the catalog"""
+
+    def __init__(self, window_hours: float = 6.0, step_seconds: float = 60.0, chunk_steps: int = 30):
+        self.window_hours = window_hours
+        self.step_seconds = step_seconds
+        self.chunk_steps = chunk_steps
+
+        self.start: Optional[datetime] = None
+        self.version: Optional[int] = None
+        self.row_indices = np.zeros(0, dtype=np.int64)
+        # Laid out (time, object, xyz) so one time slice is contiguous
+        self.positions = np.zeros((0, 0, 3), dtype=np.float32)
+        self.velocities = np.zeros((0, 0, 3), dtype=np.float32)
+        self.valid = np.zeros((0, 0), dtype=bool)
+
+        self.build_seconds = 0.0
+        self.built_at: Optional[datetime] = None
+        self.error_report: Dict = {}
+        self.lookups = 0
+
+    @property
+    def steps(self) -> int:
+        return int(self.window_hours * 3600.0 / self.step_seconds) + 1
+
+    @property
+    def end(self) -> Optional[datetime]:
+        if self.start is None:
+            return None
+        return self.start + timedelta(seconds=(self.positions.shape[0] - 1) * self.step_seconds)
+
+    def covers(self, when: datetime, version: int) -> bool:
+        """True if the buffer was built for this catalog version and spans ``when``"""
+        return (
+            self.start is not None
+            and self.version == version
+            and self.start <= when <= self.end
+        )
+
+    def needs_rebuild(self, now: datetime, version: int) -> bool:
+        """Rebuild when the catalog changed or half the window has elapsed"""
+        if self.start is None or self.version != version:
+            return True
+        return now >= self.start + timedelta(hours=self.window_hours / 2.0)
+
+    def sample_times(self, start: datetime) -> List[datetime]:
+        """Grid timestamps for a window starting at ``start``"""
+        return [start + timedelta(seconds=k * self.step_seconds) for k in range(self.steps)]
+
+    def load(self, error: np.ndarray, position: np.ndarray, velocity: np.ndarray,
+             row_indices: np.ndarray, start: datetime, version: int, build_seconds: float):
+        """Fill the buffer from arrays propagated elsewhere, shaped (objects, times[, 3])"""
+        self.positions = np.ascontiguousarray(position.transpose(1, 0, 2), dtype=np.float32)
+        self.velocities = np.ascontiguousarray(velocity.transpose(1, 0, 2), dtype=np.float32)
+        self.valid = np.ascontiguousarray((error == 0).T & np.isfinite(self.positions[..., 0]))
+        self.row_indices = np.asarray(row_indices, dtype=np.int64)
+        self.start = start
+        self.version = version
+        self.build_seconds = build_seconds
+        self.built_at = datetime.utcnow()
+
+    def build(self, satrec_array, row_indices: np.ndarray, start: datetime, version: int):
+        """Propagate every object across the window (blocking; run in a thread)"""
+        started = time.perf_counter()
+        self.positions, self.velocities, self.valid = self._propagate(satrec_array, start)
+        self.row_indices = np.asarray(row_indices, dtype=np.int64)
+        self.start = start
+        self.version = version
+        self.build_seconds = time.perf_counter() - started
+        self.built_at = datetime.utcnow()
+
+    def patched(self, index_map: Optional[np.ndarray], replaced_rows: np.ndarray,
+                satrec_array, new_rows: np.ndarray, version: int) -> "EphemerisGrid":
+        """Copy of this buffer carried over a catalog delta (blocking; run in a thread)
+
+        Surviving rows are renumbered through ``index_map``, rows listed in
+        ``replaced_rows`` (new catalog numbering) are dropped, and the objects
+        in ``satrec_array`` are propagated over the same window and appended
+        as ``new_rows``. Only the changed objects run through SGP4.
+        """
+        started = time.perf_counter()
+        row_indices = self.row_indices if index_map is None else index_map[self.row_indices]
+        keep = (row_indices >= 0) & ~np.isin(row_indices, replaced_rows)
+
+        grid = EphemerisGrid(self.window_hours, self.step_seconds, self.chunk_steps)
+        grid.start = self.start
+        grid.version = version
+        grid.error_report = self.error_report
+        if satrec_array is not None and len(new_rows):
+            positions, velocities, valid = self._propagate(satrec_array, self.start)
+            grid.positions = np.concatenate([self.positions[:, keep], positions], axis=1)
+            grid.velocities = np.concatenate([self.velocities[:, keep], velocities], axis=1)
+            grid.valid = np.concatenate([self.valid[:, keep], valid], axis=1)
+            grid.row_indices = np.concatenate([row_indices[keep], np.asarray(new_rows, dtype=np.int64)])
+        else:
+            grid.positions = self.positions[:, keep]
+            grid.velocities = self.velocities[:, keep]
+            grid.valid = self.valid[:, keep]
+            grid.row_indices = row_indices[keep]
+        grid.build_seconds = time.perf_counter() - started
+        grid.built_at = datetime.utcnow()
+        return grid
+
+    def _propagate(self, satrec_array, start: datetime):
+        """Positions, velocities and validity shaped (time, object[, 3]) over the window"""
+        steps = self.steps
+        count = len(satrec_array)
+
+        positions = np.empty((steps, count, 3), dtype=np.float32)
+        velocities = np.empty((steps, count, 3), dtype=np.float32)
+        valid = np.empty((steps, count), dtype=bool)
+
+        # Propagate in time chunks to bound the float64 scratch arrays
+        for first in range(0, steps, self.chunk_steps):
+            last = min(first + self.chunk_steps, steps)
+            times = [start + timedelta(seconds=k * self.step_seconds) for k in range(first, last)]
+            jd, fr = batch_propagator.split_julian_dates(times)
+            error, r, v = satrec_array.sgp4(jd, fr)
+            positions[first:last] = r.transpose(1, 0, 2)
+            velocities[first:last] = v.transpose(1, 0, 2)
+            valid[first:last] = (error == 0).T & np.isfinite(r[..., 0]).T
+        return positions, velocities, valid
+
+    def interpolate(self, when: datetime, rows: Optional[np.ndarray] = None) -> Dict:
+        """Cubic Hermite interpolation of position/velocity at ``when``
+
+        ``rows`` selects positions within the buffer (not catalog indexes).
+        """
+        self.lookups += 1
+        return self._hermite(when, rows)
+
+    def _hermite(self, when: datetime, rows=None) -> Dict:
+        offset = (when - self.start).total_seconds() / self.step_seconds
+        k = min(max(int(np.floor(offset)), 0), self.positions.shape[0] - 2)
+
+        if rows is None:
+            rows = slice(None)
+        position, velocity = self._hermite_blend(
+            offset - k,
+            self.positions[k, rows], self.velocities[k, rows],
+            self.positions[k + 1, rows], self.velocities[k + 1, rows]
+        )
+        return {
+            "position": position,
+            "velocity": velocity,
+            "valid": self.valid[k, rows] & self.valid[k + 1, rows]
+        }
+
+    def interpolate_track(self, row: int, times: List[datetime]) -> Dict:
+        """Interpolate one buffered object at many times (for ground tracks)"""
+        offsets = np.array([(when - self.start).total_seconds() for when in times]) / self.step_seconds
+        k = np.clip(np.floor(offsets).astype(np.int64), 0, self.positions.shape[0] - 2)
+        s = (offsets - k)[:, None]
+
+        position, velocity = self._hermite_blend(
+            s,
+            self.positions[k, row], self.velocities[k, row],
+            self.positions[k + 1, row], self.velocities[k + 1, row]
+        )
+        self.lookups += 1
+        return {
+            "position": position,
+            "velocity": velocity,
+            "valid": self.valid[k, row] & self.valid[k + 1, row]
+        }
+
+    def _hermite_blend(self, s, p0, v0, p1, v1):
+        return hermite_blend(s, p0, v0, p1, v1, self.step_seconds)
+
+    def measure_error(self, satrec_array, samples: int = 8) -> Dict:
+        """Compare interpolation at mid-step times against direct SGP4
+
+        Mid-step points are where cubic Hermite error peaks, so this is a
+        worst-case estimate for tuning ``step_seconds``.
+        """
+        steps = self.positions.shape[0]
+        picks = np.linspace(0, steps - 2, num=min(samples, steps - 1)).astype(int)
+        times = [self.start + timedelta(seconds=(k + 0.5) * self.step_seconds) for k in picks]
+
+        jd, fr = batch_propagator.split_julian_dates(times)
+        error, direct, _ = satrec_array.sgp4(jd, fr)
+
+        errors = []
+        for column, when in enumerate(times):
+            sample = self._hermite(when)
+            ok = sample["valid"] & (error[:, column] == 0)
+            diff = np.linalg.norm(sample["position"][ok] - direct[ok, column], axis=-1)
+            errors.append(diff)
+
+        errors = np.concatenate(errors) if errors else np.zeros(0)
+        if errors.size == 0:
+            self.error_report = {"step_seconds": self.step_seconds, "samples": 0}
+            return self.error_report
+
+        self.error_report = {
+            "step_seconds": self.step_seconds,
+            "samples": int(errors.size),
+            "max_error_km": round(float(errors.max()), 6),
+            "rms_error_km": round(float(np.sqrt(np.mean(errors ** 2))), 6),
+            "p99_error_km": round(float(np.percentile(errors, 99)), 6)
+        }
+        return self.error_report
+
+    def get_stats(self) -> Dict:
+        """Buffer coverage, size and interpolation error"""
+        nbytes = self.positions.nbytes + self.velocities.nbytes + self.valid.nbytes
+        return {
+            "window_hours": self.window_hours,
+            "step_seconds": self.step_seconds,
+            "objects": int(len(self.row_indices)),
+            "start": self.start.isoformat() if self.start else None,
+            "end": self.end.isoformat() if self.end else None,
+            "catalog_version": self.version,
+            "memory_mb": round(nbytes / 1e6, 2),
+            "build_seconds": round(self.build_seconds, 4),
+            "built_at": self.built_at.isoformat() if self.built_at else None,
+            "lookups": self.lookups,
+            "interpolation_error": self.error_report
+        }
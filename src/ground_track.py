@@ -0,0 +1,149 @@
+"""
+Ground-track streaming for a single object over a time window
+Propagates in chunks and emits NDJSON so long windows never build a huge
+response in memory
+"""
+
+import asyncio
+import json
+import math
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from .lru_cache import LRUCache
+
+MAX_GROUND_TRACK_POINTS = 100000
+CACHEABLE_POINTS = 20000  # longer tracks are streamed but not cached
+UNIX_EPOCH = datetime(1970, 1, 1)
+
+
+class GroundTrackService:
+    """Builds NDJSON ground tracks on top of DebrisTracker batch propagation"""
+
+    def __init__(self, debris_tracker, chunk_size: int = 500, cache_entries: int = 64):
+        self.tracker = debris_tracker
+        self.chunk_size = chunk_size
+        self.cache = LRUCache(cache_entries)
+
+    def validate_window(self, start: datetime, end: datetime, step_seconds: float) -> Optional[str]:
+        """Return an error message if the requested window is unusable"""
+        if step_seconds <= 0:
+            return "step must be positive"
+        if end <= start:
+            return "end must be after start"
+        points = int((end - start).total_seconds() // step_seconds) + 1
+        if points > MAX_GROUND_TRACK_POINTS:
+            return f"window has {points} points; the limit is {MAX_GROUND_TRACK_POINTS}"
+        return None
+
+    def default_start(self, step_seconds: float) -> datetime:
+        """Current UTC time floored to a multiple of the step, so default windows share cache entries"""
+        now = datetime.utcnow()
+        if step_seconds <= 0:
+            return now
+        elapsed = (now - UNIX_EPOCH).total_seconds()
+        return UNIX_EPOCH + timedelta(seconds=math.floor(elapsed / step_seconds) * step_seconds)
+
+    def _cache_key(self, index: int, start: datetime, end: datetime, step_seconds: float) -> tuple:
+        catalog = self.tracker.catalog
+        return (
+            int(catalog["norad_id"][index]),
+            int(catalog["epoch_year"][index]),
+            float(catalog["epoch_day"][index]),
+            start.isoformat(),
+            end.isoformat(),
+            step_seconds
+        )
+
+    async def open_stream(self, norad_id: int, start: datetime, end: datetime,
+                          step_seconds: float) -> Tuple[Optional[str], Optional[AsyncIterator[bytes]]]:
+        """Start a ground-track stream, propagating until its first valid points
+
+        Returns an error message instead of a stream when no point in the
+        window propagates (e.g. a window far outside the element set's
+        usable range), so callers can reject it before sending a response.
+        """
+        track = self.stream(norad_id, start, end, step_seconds)
+        async for first in track:
+            return None, self._resume(first, track)
+        if self.tracker.find_object(norad_id) is None:
+            return "Object not found", None
+        return "The object's element set cannot be propagated anywhere in this window", None
+
+    async def _resume(self, first: bytes, track: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        yield first
+        async for chunk in track:
+            yield chunk
+
+    async def stream(self, norad_id: int, start: datetime, end: datetime,
+                     step_seconds: float) -> AsyncIterator[bytes]:
+        """Yield NDJSON chunks of ground-track points
+
+        Points SGP4 cannot propagate are left out and chunks without any
+        points are skipped. Catalog deltas can move or drop rows between
+        chunks, so the object's row is looked up again whenever the catalog
+        version changes; the stream ends early if the object is gone, and a
+        track that spans versions is not cached.
+        """
+        catalog = self.tracker.catalog
+        version = catalog.version
+        index = self.tracker.find_object(norad_id)
+        if index is None:
+            return
+        key = self._cache_key(index, start, end, step_seconds)
+        cached = self.cache.get(key)
+        if cached is not None:
+            for chunk in cached:
+                yield chunk
+            return
+
+        total = int((end - start).total_seconds() // step_seconds) + 1
+        chunks: Optional[List[bytes]] = [] if total <= CACHEABLE_POINTS else None
+
+        for first in range(0, total, self.chunk_size):
+            if catalog.version != version:
+                version = catalog.version
+                index = self.tracker.find_object(norad_id)
+                chunks = None
+                if index is None:
+                    return
+            last = min(first + self.chunk_size, total)
+            times = [start + timedelta(seconds=k * step_seconds) for k in range(first, last)]
+            chunk = self._encode_chunk(times, self.tracker.propagate_track(index, times))
+            if chunk:
+                if chunks is not None:
+                    chunks.append(chunk)
+                yield chunk
+            # Let other requests run between chunks of a long window
+            await asyncio.sleep(0)
+
+        if chunks is not None:
+            self.cache.put(key, chunks)
+
+    def _encode_chunk(self, times: List[datetime], track: Dict) -> bytes:
+        lines = []
+        columns = zip(
+            times,
+            track["latitude"].tolist(),
+            track["longitude"].tolist(),
+            track["altitude"].tolist(),
+            track["velocity"].tolist(),
+            track["valid"].tolist()
+        )
+        for when, latitude, longitude, altitude, velocity, valid in columns:
+            if not valid:
+                continue
+            lines.append(json.dumps({
+                "timestamp": when.isoformat(),
+                "latitude": round(latitude, 6),
+                "longitude": round(longitude, 6),
+                "altitude": round(altitude, 4),
+                "velocity": round(velocity, 6)
+            }))
+        return ("\n".join(lines) + "\n").encode("utf-8") if lines else b""
+
+    def get_stats(self) -> Dict:
+        return {
+            "chunk_size": self.chunk_size,
+            "cache": self.cache.get_stats()
+        }
@@ -0,0 +1,309 @@
+"""
+Persistent HTTP response cache shared by the orbital data clients
+Bodies are stored gzip-compressed on disk with their ETag/Last-Modified
+validators, so a restart comes up warm and revalidation costs a 304
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, Optional
+
+import httpx
+
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", ".cache/http")
+HTTP_CACHE_MAX_MB = float(os.getenv("HTTP_CACHE_MAX_MB", "256"))
+# How long a stale entry waits on revalidation before it is served anyway
+HTTP_CACHE_STALE_TIMEOUT = float(os.getenv("HTTP_CACHE_STALE_TIMEOUT", "3"))
+
+STREAM_CHUNK_BYTES = 1 << 16
+INDEX_FILE = "index.json"
+
+
+class HTTPDiskCache:
+    """Disk-backed GET cache with conditional revalidation and LRU eviction
+
+    Entries younger than the caller's ``max_age`` are served without any
+    network. Older entries are revalidated with If-None-Match /
+    If-Modified-Since; if the upstream is slow the stale body is returned
+    and the revalidation finishes in the background, and if it fails the
+    stale body is served until a later request succeeds.
+    """
+
+    def __init__(self, directory: str = HTTP_CACHE_DIR, max_bytes: int = int(HTTP_CACHE_MAX_MB * 1e6),
+                 stale_timeout: float = HTTP_CACHE_STALE_TIMEOUT):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stale_timeout = stale_timeout
+        self._entries: Optional[OrderedDict] = None
+        self._dirty = False  # access times / revalidations not yet written to the index
+        self._revalidations: Dict[str, asyncio.Task] = {}
+        self.stats = {
+            "fresh_hits": 0,
+            "revalidated": 0,
+            "stale_served": 0,
+            "downloads": 0,
+            "evictions": 0,
+            "errors": 0
+        }
+
+    # -- index ---------------------------------------------------------------
+
+    @property
+    def entries(self) -> OrderedDict:
+        """Entry metadata in least- to most-recently-used order (loaded lazily)"""
+        if self._entries is None:
+            self._entries = OrderedDict()
+            try:
+                with open(os.path.join(self.directory, INDEX_FILE)) as f:
+                    stored = json.load(f)
+                for entry in sorted(stored.values(), key=lambda e: e["last_access"]):
+                    if os.path.exists(self._body_path(entry["file"])):
+                        self._entries[entry["url"]] = entry
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"⚠️  HTTP cache index unreadable, starting empty: {e}")
+        return self._entries
+
+    def _save_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, INDEX_FILE)
+        temporary = path + ".tmp"
+        with open(temporary, "w") as f:
+            json.dump(dict(self.entries), f)
+        os.replace(temporary, path)
+        self._dirty = False
+
+    def flush(self):
+        """Write access times and revalidations held in memory to the index"""
+        if self._dirty:
+            self._save_index()
+
+    def _body_path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _touch(self, url: str):
+        # Kept in memory on the hit path; the index is written on the next
+        # store, eviction or flush
+        entry = self.entries[url]
+        entry["last_access"] = time.time()
+        self.entries.move_to_end(url)
+        self._dirty = True
+
+    def _evict(self):
+        total = sum(entry["size"] for entry in self.entries.values())
+        while total > self.max_bytes and len(self.entries) > 1:
+            _, entry = self.entries.popitem(last=False)
+            total -= entry["size"]
+            self.stats["evictions"] += 1
+            try:
+                os.remove(self._body_path(entry["file"]))
+            except FileNotFoundError:
+                pass
+
+    # -- bodies --------------------------------------------------------------
+
+    def _read_body(self, entry: Dict) -> bytes:
+        with gzip.open(self._body_path(entry["file"]), "rb") as f:
+            return f.read()
+
+    def _commit(self, url: str, temporary: str, response: httpx.Response):
+        """Move a finished compressed body into place and index it"""
+        name = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32] + ".gz"
+        os.replace(temporary, self._body_path(name))
+        now = time.time()
+        self.entries[url] = {
+            "url": url,
+            "file": name,
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "content_type": response.headers.get("content-type", "application/json"),
+            "size": os.path.getsize(self._body_path(name)),
+            "stored_at": now,
+            "last_access": now
+        }
+        self.entries.move_to_end(url)
+        self._evict()
+        self._save_index()
+
+    def _write_body(self, url: str, response: httpx.Response):
+        os.makedirs(self.directory, exist_ok=True)
+        temporary = self._body_path(f".{os.getpid()}.{id(response)}.tmp")
+        with gzip.open(temporary, "wb", compresslevel=6) as f:
+            f.write(response.content)
+        self._commit(url, temporary, response)
+
+    def _response(self, url: str, entry: Dict, body: bytes, state: str) -> httpx.Response:
+        return httpx.Response(
+            200,
+            content=body,
+            headers={"content-type": entry["content_type"], "x-cache": state},
+            request=httpx.Request("GET", url)
+        )
+
+    def _conditional_headers(self, entry: Optional[Dict]) -> Dict[str, str]:
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def is_fresh(self, url: str, max_age: float) -> bool:
+        entry = self.entries.get(url)
+        return entry is not None and time.time() - entry["stored_at"] < max_age
+
+    # -- buffered requests ---------------------------------------------------
+
+    async def get(self, session: httpx.AsyncClient, url: str, max_age: float,
+                  offline: bool = False) -> httpx.Response:
+        """GET through the cache; returns a 200 from disk or the upstream response
+
+        ``offline`` serves any stored copy without touching the network
+        (e.g. when the upstream session cannot be opened).
+        """
+        entry = self.entries.get(url)
+        fresh = entry is not None and time.time() - entry["stored_at"] < max_age
+        if fresh or (offline and entry is not None):
+            self.stats["fresh_hits" if fresh else "stale_served"] += 1
+            body = await asyncio.to_thread(self._read_body, entry)
+            self._touch(url)
+            return self._response(url, entry, body, "HIT")
+        if offline:
+            return httpx.Response(504, request=httpx.Request("GET", url))
+
+        # One revalidation per URL at a time; later callers share it
+        task = self._revalidations.get(url)
+        if task is None:
+            task = asyncio.create_task(self._fetch(session, url))
+            self._revalidations[url] = task
+            task.add_done_callback(lambda done: self._finish(url, done))
+
+        if entry is None:
+            return await asyncio.shield(task)
+
+        done, _ = await asyncio.wait({task}, timeout=self.stale_timeout)
+        if task in done and task.exception() is None and task.result().status_code == 200:
+            return task.result()
+
+        # Slow or failing upstream: serve the stale copy, keep revalidating
+        self.stats["stale_served"] += 1
+        body = await asyncio.to_thread(self._read_body, entry)
+        self._touch(url)
+        return self._response(url, entry, body, "STALE")
+
+    def _finish(self, url: str, task: asyncio.Task):
+        self._revalidations.pop(url, None)
+        # Background revalidations may fail with nobody awaiting them
+        if not task.cancelled() and task.exception() is not None:
+            print(f"⚠️  Revalidation of {url} failed: {task.exception()}")
+
+    async def _fetch(self, session: httpx.AsyncClient, url: str) -> httpx.Response:
+        entry = self.entries.get(url)
+        try:
+            response = await session.get(url, headers=self._conditional_headers(entry))
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+
+        if response.status_code == 304 and entry is not None:
+            self.stats["revalidated"] += 1
+            entry["stored_at"] = time.time()
+            body = await asyncio.to_thread(self._read_body, entry)
+            self._touch(url)
+            return self._response(url, entry, body, "REVALIDATED")
+
+        if response.status_code == 200:
+            self.stats["downloads"] += 1
+            await asyncio.to_thread(self._write_body, url, response)
+        return response
+
+    # -- streamed requests ---------------------------------------------------
+
+    async def stream(self, session: httpx.AsyncClient, url: str, max_age: float) -> AsyncIterator[bytes]:
+        """Yield the body of a large GET in chunks, via the cache
+
+        A fresh or revalidated entry is decompressed from disk chunk by
+        chunk; a new download is compressed to disk as it streams. If the
+        upstream fails before sending a body, a stale copy is used instead.
+        """
+        entry = self.entries.get(url)
+        if entry is not None and time.time() - entry["stored_at"] < max_age:
+            self.stats["fresh_hits"] += 1
+            async for chunk in self._stream_entry(url, entry):
+                yield chunk
+            return
+
+        started = False
+        try:
+            async with session.stream("GET", url, headers=self._conditional_headers(entry)) as response:
+                if response.status_code == 304 and entry is not None:
+                    self.stats["revalidated"] += 1
+                    entry["stored_at"] = time.time()
+                elif response.status_code != 200:
+                    raise httpx.HTTPStatusError(
+                        f"HTTP {response.status_code}", request=response.request, response=response
+                    )
+                else:
+                    self.stats["downloads"] += 1
+                    os.makedirs(self.directory, exist_ok=True)
+                    temporary = self._body_path(f".{os.getpid()}.{id(response)}.tmp")
+                    try:
+                        with gzip.open(temporary, "wb", compresslevel=6) as f:
+                            async for chunk in response.aiter_bytes():
+                                f.write(chunk)
+                                started = True
+                                yield chunk
+                        self._commit(url, temporary, response)
+                    finally:
+                        if os.path.exists(temporary):
+                            os.remove(temporary)
+                    return
+        except Exception as e:
+            self.stats["errors"] += 1
+            # Part of the new body already went out; a restart would corrupt it
+            if entry is None or started:
+                raise
+            print(f"⚠️  Upstream unavailable, serving cached copy of {url}: {e}")
+            self.stats["stale_served"] += 1
+
+        async for chunk in self._stream_entry(url, entry):
+            yield chunk
+
+    async def _stream_entry(self, url: str, entry: Dict) -> AsyncIterator[bytes]:
+        self._touch(url)
+        with gzip.open(self._body_path(entry["file"]), "rb") as f:
+            while True:
+                chunk = f.read(STREAM_CHUNK_BYTES)
+                if not chunk:
+                    break
+                yield chunk
+                await asyncio.sleep(0)
+
+    def clear(self):
+        for entry in self.entries.values():
+            try:
+                os.remove(self._body_path(entry["file"]))
+            except FileNotFoundError:
+                pass
+        self.entries.clear()
+        self._save_index()
+
+    def get_stats(self) -> Dict:
+        return {
+            "directory": self.directory,
+            "entries": len(self.entries),
+            "size_mb": round(sum(entry["size"] for entry in self.entries.values()) / 1e6, 2),
+            "max_mb": round(self.max_bytes / 1e6, 2),
+            **self.stats
+        }
+
+
+# Global instance
+http_cache = HTTPDiskCache()
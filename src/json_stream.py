@@ -0,0 +1,77 @@
+"""
+Incremental parser for large top-level JSON arrays
+Yields each element as soon as its bytes have arrived, so a catalog
+download never has to be held in memory as one document
+"""
+
+import codecs
+import json
+import re
+from typing import Any, List
+
+_SEPARATORS = re.compile(r"[\s,]*")
+_WHITESPACE = re.compile(r"\s*")
+
+# An element that still fails to decode past this size is malformed, not partial
+MAX_ELEMENT_CHARS = 1 << 20
+
+
+class JSONArrayStream:
+    """Feed raw bytes of a JSON array, get back the completed elements
+
+    Elements are expected to be objects or arrays (as in GP/OMM responses),
+    so a decode failure at the end of the buffer means "wait for more data".
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._opened = False
+        self.closed = False
+        self.items = 0
+        self.bytes = 0
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Consume a chunk and return every element it completed"""
+        self.bytes += len(chunk)
+        buffer = self._buffer + self._text.decode(chunk)
+        position = 0
+        items = []
+
+        if not self._opened:
+            position = _WHITESPACE.match(buffer, position).end()
+            if position == len(buffer):
+                self._buffer = ""
+                return items
+            if buffer[position] != "[":
+                raise ValueError("Expected a JSON array")
+            self._opened = True
+            position += 1
+
+        while not self.closed:
+            position = _SEPARATORS.match(buffer, position).end()
+            if position == len(buffer):
+                break
+            if buffer[position] == "]":
+                self.closed = True
+                position += 1
+                break
+            try:
+                value, end = self._decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if len(buffer) - position > MAX_ELEMENT_CHARS:
+                    raise ValueError("Malformed JSON array element")
+                break
+            items.append(value)
+            position = end
+
+        self._buffer = buffer[position:]
+        self.items += len(items)
+        return items
+
+    def close(self):
+        """Check that the array was complete"""
+        trailing = self._buffer + self._text.decode(b"", final=True)
+        if not self.closed or trailing.strip():
+            raise ValueError(f"JSON array truncated after {self.items} elements")
@@ -9,6 +9,8 @@ from typing import Dict, List, Tuple
 import json
 import random
 
+from .collision_probability import nominal_probability, REFERENCE_SIZE_M, PROBABILITY_THRESHOLDS
+
 class MLCollisionPredictor:
     """ML-based collision prediction engine"""
     
@@ -51,28 +53,29 @@ class MLCollisionPredictor:
                                            relative_velocity: float,
                                            altitude: float,
                                            object_size: float) -> Dict:
-        """Predict collision probability using ML model"""
-        
-        # Feature engineering
+        """Predict collision probability for a single close approach"""
+        probability = float(self._collision_probabilities([miss_distance], [object_size])[0])
         features = self._extract_features(miss_distance, relative_velocity, altitude, object_size)
+        return self._prediction(features, probability)
+    
+    def _collision_probabilities(self, miss_distances: List[float], object_sizes: List[float]) -> np.ndarray:
+        """Short-encounter collision probability against a reference-size primary
         
-        # ML prediction (simulated with realistic logic)
-        base_probability = self._calculate_base_probability(miss_distance, relative_velocity)
-        
-        # Adjust based on altitude and size
-        altitude_factor = self._get_altitude_factor(altitude)
-        size_factor = self._get_size_factor(object_size)
-        
-        final_probability = base_probability * altitude_factor * size_factor
-        final_probability = max(0.0, min(1.0, final_probability))
-        
+        Uses default TLE covariances for both objects since only the miss
+        distance of each approach is known.
+        """
+        return nominal_probability(np.asarray(miss_distances, dtype=np.float64), REFERENCE_SIZE_M,
+                                   np.asarray(object_sizes, dtype=np.float64))
+    
+    def _prediction(self, features: Dict, probability: float) -> Dict:
+        """Prediction record for one approach"""
         # Calculate confidence based on feature similarity to training data
         confidence = self._calculate_confidence(features)
         
         return {
-            "probability": round(final_probability, 6),
+            "probability": round(probability, 6),
             "confidence": round(confidence, 4),
-            "risk_level": self._get_risk_level(final_probability),
+            "risk_level": self._get_risk_level(probability),
             "contributing_factors": self._identify_factors(features),
             "model_version": "v2.1.0",
             "prediction_timestamp": datetime.utcnow().isoformat()
@@ -91,36 +94,6 @@ class MLCollisionPredictor:
             "velocity_category": self._get_velocity_category(relative_velocity)
         }
     
-    def _calculate_base_probability(self, miss_distance: float, relative_velocity: float) -> float:
-        """Calculate base collision probability"""
-        # Inverse relationship with miss distance
-        distance_factor = 1.0 / (1.0 + miss_distance)
-        
-        # Direct relationship with velocity
-        velocity_factor = relative_velocity / 15.0
-        
-        return distance_factor * velocity_factor * 0.1
-    
-    def _get_altitude_factor(self, altitude: float) -> float:
-        """Get altitude risk factor"""
-        if 400 <= altitude <= 600:  # ISS altitude - highest traffic
-            return 1.5
-        elif 200 <= altitude <= 1000:  # LEO
-            return 1.2
-        elif 1000 <= altitude <= 2000:  # Higher LEO
-            return 1.0
-        else:
-            return 0.8
-    
-    def _get_size_factor(self, object_size: float) -> float:
-        """Get object size risk factor"""
-        if object_size > 1.0:  # Large objects
-            return 1.3
-        elif object_size > 0.1:  # Medium objects
-            return 1.0
-        else:  # Small objects
-            return 0.7
-    
     def _get_altitude_band(self, altitude: float) -> str:
         """Categorize altitude"""
         if altitude < 500:
@@ -155,12 +128,15 @@ class MLCollisionPredictor:
         return max(0.5, min(0.99, base_confidence + random.uniform(-0.05, 0.05)))
     
     def _get_risk_level(self, probability: float) -> str:
-        """Determine risk level from probability"""
-        if probability > 0.1:
+        """Determine risk level from probability, on the risk analyzer's Pc scale
+
+        Critical and high are both alert-level there, medium is watch.
+        """
+        if probability >= PROBABILITY_THRESHOLDS["alert"] * 10:
             return "critical"
-        elif probability > 0.01:
+        elif probability >= PROBABILITY_THRESHOLDS["alert"]:
             return "high"
-        elif probability > 0.001:
+        elif probability >= PROBABILITY_THRESHOLDS["watch"]:
             return "medium"
         else:
             return "low"
@@ -183,23 +159,24 @@ class MLCollisionPredictor:
         return factors if factors else ["Normal orbital parameters"]
     
     async def batch_predict(self, conjunctions: List[Dict]) -> List[Dict]:
-        """Predict probabilities for multiple conjunctions"""
-        predictions = []
-        
-        for conj in conjunctions:
-            prediction = await self.predict_collision_probability(
-                miss_distance=conj.get("miss_distance", 10.0),
-                relative_velocity=conj.get("relative_velocity", 7.5),
-                altitude=conj.get("altitude", 500.0),
-                object_size=conj.get("object_size", 0.5)
+        """Predict probabilities for multiple conjunctions in one batched evaluation"""
+        features = [
+            self._extract_features(
+                conj.get("miss_distance", 10.0),
+                conj.get("relative_velocity", 7.5),
+                conj.get("altitude", 500.0),
+                conj.get("object_size", 0.5)
             )
-            
-            predictions.append({
-                "conjunction_id": conj.get("id"),
-                **prediction
-            })
+            for conj in conjunctions
+        ]
+        probabilities = self._collision_probabilities(
+            [f["miss_distance"] for f in features], [f["object_size"] for f in features]
+        )
         
-        return predictions
+        return [
+            {"conjunction_id": conj.get("id"), **self._prediction(f, float(probability))}
+            for conj, f, probability in zip(conjunctions, features, probabilities.tolist())
+        ]
     
     async def get_model_stats(self) -> Dict:
         """Get model statistics and performance metrics"""
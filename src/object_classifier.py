@@ -0,0 +1,202 @@
+"""
+Batch object classification for catalog ingestion
+Every name keyword rule is compiled into one regular expression that runs
+once over a whole batch of names; object type, mission, size and debris risk
+come back as arrays of small integer codes into fixed label tables
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+MU_EARTH = 398600.4418  # km^3/s^2
+EARTH_RADIUS = 6371.0  # km, mean radius used by the risk scores
+
+# Label tables; classifier outputs index into these (-1 = not applicable)
+OBJECT_TYPES = ("satellite", "debris")
+MISSION_TYPES = ("other", "crewed_station", "communication", "navigation", "weather", "science", "military")
+RISK_LEVELS = ("low", "medium", "high")
+
+SATELLITE, DEBRIS = range(len(OBJECT_TYPES))
+LOW, MEDIUM, HIGH = range(len(RISK_LEVELS))
+
+# One bit per keyword family found in a name
+(STATION, STARLINK, COMMUNICATION, GPS, NAVIGATION, WEATHER,
+ SCIENCE, MILITARY, DEBRIS_NAME, FRAGMENT, COLLISION) = (1 << bit for bit in range(11))
+
+KEYWORD_FLAGS = {
+    "ISS": STATION, "STATION": STATION,
+    "STARLINK": STARLINK, "ONEWEB": COMMUNICATION,
+    "GPS": GPS, "GLONASS": NAVIGATION, "GALILEO": NAVIGATION,
+    "WEATHER": WEATHER, "GOES": WEATHER, "NOAA": WEATHER,
+    "HUBBLE": SCIENCE, "TELESCOPE": SCIENCE,
+    "MILITARY": MILITARY, "DEFENSE": MILITARY,
+    "DEB": DEBRIS_NAME, "FRAG": FRAGMENT,  # also cover DEBRIS / FRAGMENT
+    "COSMOS": COLLISION, "IRIDIUM": COLLISION,  # parents of known collision debris
+}
+
+# A zero-width lookahead reports every keyword occurrence, overlapping ones
+# included, so one scan gives the same answer as a substring test per keyword
+_KEYWORD_PATTERN = re.compile("(?=(" + "|".join(sorted(KEYWORD_FLAGS, key=len, reverse=True)) + "))")
+
+# Priority-ordered (flags, value) rules: the first rule whose flags match wins
+SIZE_RULES = (
+    (STATION, 50.0),       # large space station
+    (STARLINK, 2.5),
+    (GPS, 5.0),
+    (DEBRIS_NAME, 0.1),    # small debris
+    (FRAGMENT, 0.05),      # very small fragment
+)
+DEFAULT_SIZE = 1.0
+
+MISSION_RULES = (
+    (STATION, MISSION_TYPES.index("crewed_station")),
+    (STARLINK | COMMUNICATION, MISSION_TYPES.index("communication")),
+    (GPS | NAVIGATION, MISSION_TYPES.index("navigation")),
+    (WEATHER, MISSION_TYPES.index("weather")),
+    (SCIENCE, MISSION_TYPES.index("science")),
+    (MILITARY, MISSION_TYPES.index("military")),
+)
+
+# Celestrak groups that imply the mission regardless of name
+CATEGORY_MISSIONS = {
+    "stations": MISSION_TYPES.index("crewed_station"),
+    "starlink": MISSION_TYPES.index("communication"),
+    "gps-ops": MISSION_TYPES.index("navigation"),
+    "weather": MISSION_TYPES.index("weather"),
+}
+
+# Space-Track radar cross-section classes -> size estimate (m)
+RCS_SIZES = {"LARGE": 5.0, "MEDIUM": 0.5, "SMALL": 0.05}
+RCS_SCORES = {"LARGE": 3, "MEDIUM": 2, "SMALL": 1}
+DEFAULT_RCS_SIZE = 0.1
+
+
+def name_flags(names: Sequence[str]) -> np.ndarray:
+    """Keyword flag bits for each name, from one regex pass over the batch"""
+    count = len(names)
+    flags = np.zeros(count, dtype=np.uint16)
+    if count == 0:
+        return flags
+
+    text = "\n".join(names)
+    upper = text.upper()
+    if len(upper) != len(text):
+        # A few non-ASCII letters change length when upper-cased
+        names = [name.upper() for name in names]
+        upper = "\n".join(names)
+    lengths = np.fromiter((len(name) + 1 for name in names), dtype=np.int64, count=count)
+    starts = np.cumsum(lengths) - lengths
+
+    positions, bits = [], []
+    for match in _KEYWORD_PATTERN.finditer(upper):
+        positions.append(match.start())
+        bits.append(KEYWORD_FLAGS[match.group(1)])
+    if positions:
+        rows = np.searchsorted(starts, positions, side="right") - 1
+        np.bitwise_or.at(flags, rows, np.array(bits, dtype=np.uint16))
+    return flags
+
+
+def _first_match(flags: np.ndarray, rules, default, dtype) -> np.ndarray:
+    result = np.full(len(flags), default, dtype=dtype)
+    # Apply the lowest-priority rule first so higher ones overwrite it
+    for mask, value in reversed(rules):
+        result[(flags & mask) != 0] = value
+    return result
+
+
+def classify(names: Sequence[str], category: Optional[str] = None,
+             object_types: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+    """Object type, mission and size for a batch of names
+
+    ``category`` is the Celestrak group the batch came from ("debris" marks
+    every object as debris). ``object_types`` are source-supplied types such
+    as Space-Track's OBJECT_TYPE; when given they decide debris vs satellite
+    instead of the name.
+    """
+    flags = name_flags(names)
+
+    if object_types is not None:
+        debris = np.array([str(t or "").lower() == "debris" for t in object_types], dtype=bool)
+    elif category == "debris":
+        debris = np.ones(len(flags), dtype=bool)
+    else:
+        debris = (flags & (DEBRIS_NAME | FRAGMENT)) != 0
+
+    if category in CATEGORY_MISSIONS:
+        mission = np.full(len(flags), CATEGORY_MISSIONS[category], dtype=np.int8)
+    else:
+        mission = _first_match(flags, MISSION_RULES, MISSION_TYPES.index("other"), np.int8)
+    mission[debris] = -1  # debris carries no mission type
+
+    return {
+        "flags": flags,
+        "object_type": debris.astype(np.int8),
+        "mission_type": mission,
+        "size_estimate": _first_match(flags, SIZE_RULES, DEFAULT_SIZE, np.float64),
+    }
+
+
+def field_array(records: Iterable[Dict], key: str, default: float) -> np.ndarray:
+    """Numeric field of each record as float64 (NaN where unparsable)"""
+    values = []
+    for record in records:
+        try:
+            value = record.get(key)
+            values.append(float(default if value is None else value))
+        except (TypeError, ValueError):
+            values.append(np.nan)
+    return np.array(values, dtype=np.float64)
+
+
+def _risk_codes(score: np.ndarray, high: int, medium: int, valid: np.ndarray) -> np.ndarray:
+    codes = np.where(score >= high, HIGH, np.where(score >= medium, MEDIUM, LOW)).astype(np.int8)
+    codes[~valid] = MEDIUM  # missing or bad elements: assume medium
+    return codes
+
+
+def _eccentricity_score(eccentricity: np.ndarray) -> np.ndarray:
+    return np.where(eccentricity > 0.1, 2, np.where(eccentricity > 0.05, 1, 0))
+
+
+def gp_debris_risk(mean_motion: np.ndarray, eccentricity: np.ndarray,
+                   inclination: np.ndarray, flags: np.ndarray) -> np.ndarray:
+    """Risk codes for GP debris from mean motion, shape and name"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        n_rad_s = mean_motion * 2.0 * np.pi / 86400.0
+        altitude = np.cbrt(MU_EARTH / (n_rad_s * n_rad_s)) - EARTH_RADIUS
+    score = (
+        np.where((altitude >= 200) & (altitude <= 1000), 3,      # LEO
+                 np.where((altitude > 1000) & (altitude <= 2000), 2, 1))  # higher LEO / MEO-GEO
+        + _eccentricity_score(eccentricity)
+        + (inclination > 80)                                     # polar orbits cross more paths
+        + 2 * ((flags & COLLISION) != 0)                         # known collision debris
+    )
+    valid = np.isfinite(altitude) & np.isfinite(eccentricity) & np.isfinite(inclination)
+    return _risk_codes(score, high=5, medium=3, valid=valid)
+
+
+def rcs_debris_risk(semi_major_axis: np.ndarray, rcs_sizes: Sequence[Optional[str]],
+                    eccentricity: np.ndarray) -> np.ndarray:
+    """Risk codes for Space-Track debris from altitude, radar size and shape"""
+    altitude = semi_major_axis - EARTH_RADIUS
+    rcs = np.array([RCS_SCORES.get(size, 0) for size in rcs_sizes], dtype=np.int64)
+    score = (
+        np.where((altitude >= 200) & (altitude <= 2000), 3,      # LEO
+                 np.where((altitude > 2000) & (altitude <= 35786), 2, 1))  # MEO / GEO or very low
+        + rcs
+        + _eccentricity_score(eccentricity)
+    )
+    valid = np.isfinite(altitude) & np.isfinite(eccentricity)
+    return _risk_codes(score, high=6, medium=4, valid=valid)
+
+
+def rcs_size_estimates(rcs_sizes: Sequence[Optional[str]]) -> np.ndarray:
+    return np.array([RCS_SIZES.get(size, DEFAULT_RCS_SIZE) for size in rcs_sizes], dtype=np.float64)
+
+
+def labels(table: Sequence[str], codes: np.ndarray) -> List[Optional[str]]:
+    """Decode classifier codes to their labels (None for -1)"""
+    return [table[code] if code >= 0 else None for code in codes.tolist()]
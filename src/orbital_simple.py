@@ -4,7 +4,30 @@ Simple orbital mechanics fallback for when Skyfield is not available
 
 import math
 from datetime import datetime
-from typing import Dict, Tuple
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+MU_EARTH = 398600.4418  # km^3/s^2
+J2 = 1.08262668e-3
+EQUATORIAL_RADIUS = 6378.137  # km
+
+# Fixed-width TLE fields parsed by the batch API: (line, start, end)
+TLE_FIELDS = {
+    "epoch_year": (1, 18, 20),
+    "epoch_day": (1, 20, 32),
+    "ndot": (1, 33, 43),
+    "inclination": (2, 8, 16),
+    "raan": (2, 17, 25),
+    "eccentricity": (2, 26, 33),
+    "arg_perigee": (2, 34, 42),
+    "mean_anomaly": (2, 43, 51),
+    "mean_motion": (2, 52, 63),
+}
 
 class SimpleOrbitalMechanics:
     """Simple orbital calculations without external dependencies"""
@@ -12,9 +35,21 @@ class SimpleOrbitalMechanics:
     def __init__(self):
         self.earth_radius = 6371.0  # km
         
-    def tle_to_position(self, tle_line1: str, tle_line2: str) -> Dict:
+    def tle_to_position(self, tle_line1: str, tle_line2: str, when: Optional[datetime] = None) -> Dict:
         """Convert TLE to approximate position (simplified)"""
         try:
+            if HAS_NUMPY:
+                # Two-body + J2 propagation through the batch API
+                result = self.batch_tle_to_position([tle_line1], [tle_line2], when)
+                if not result["valid"][0]:
+                    raise ValueError("Invalid TLE")
+                return {
+                    "latitude": float(result["latitude"][0]),
+                    "longitude": float(result["longitude"][0]),
+                    "altitude": float(result["altitude"][0]),
+                    "velocity": float(result["velocity"][0])
+                }
+            
             # Parse basic orbital elements from TLE
             elements = self.parse_tle(tle_line1, tle_line2)
             
@@ -175,5 +210,132 @@ class SimpleOrbitalMechanics:
                 random.uniform(200, 2000)
             )
 
+    def parse_tle_batch(self, lines1: Sequence[str], lines2: Sequence[str]) -> Dict:
+        """Parse many TLEs at once by slicing fixed-width byte columns"""
+        count = len(lines1)
+        chars = {
+            1: np.array([l.ljust(69)[:69].encode("ascii", "replace") for l in lines1], dtype="S69").view("S1").reshape(count, 69),
+            2: np.array([l.ljust(69)[:69].encode("ascii", "replace") for l in lines2], dtype="S69").view("S1").reshape(count, 69),
+        }
+
+        elements = {}
+        valid = np.ones(count, dtype=bool)
+        for name, (line, start, end) in TLE_FIELDS.items():
+            raw = chars[line][:, start:end].copy().view(f"S{end - start}").ravel()
+            try:
+                elements[name] = raw.astype(np.float64)
+            except ValueError:
+                # Fall back to per-row conversion so one bad TLE does not sink the batch
+                values = np.full(count, np.nan)
+                for i, text in enumerate(raw):
+                    try:
+                        values[i] = float(text)
+                    except ValueError:
+                        valid[i] = False
+                elements[name] = values
+
+        elements["eccentricity"] = elements["eccentricity"] / 1e7
+        elements["epoch_jd"] = self._epoch_to_jd(elements.pop("epoch_year"), elements.pop("epoch_day"))
+        elements["valid"] = valid & np.isfinite(elements["mean_motion"]) & (elements["mean_motion"] > 0)
+        return elements
+
+    def batch_tle_to_position(self, lines1: Sequence[str], lines2: Sequence[str],
+                              when: Union[None, datetime, Sequence[datetime]] = None) -> Dict:
+        """Positions for a whole catalog of TLEs at one or more epochs"""
+        return self.propagate_elements(self.parse_tle_batch(lines1, lines2), when)
+
+    def propagate_elements(self, elements: Dict,
+                           when: Union[None, datetime, Sequence[datetime]] = None) -> Dict:
+        """Two-body propagation with J2 secular drift for arrays of mean elements
+
+        ``elements`` holds arrays of epoch_jd, mean_motion (rev/day),
+        eccentricity, inclination, raan, arg_perigee, mean_anomaly (degrees)
+        and optionally ndot (rev/day^2 / 2). Returns arrays shaped (objects,)
+        for a single time or (objects, times) for a sequence of times.
+        """
+        from .batch_propagator import batch_propagator
+        from .frames import frame_cache
+
+        single = when is None or isinstance(when, datetime)
+        times = [when or datetime.utcnow()] if single else list(when)
+        jd_whole, jd_frac = batch_propagator.split_julian_dates(times)
+        jd = jd_whole + jd_frac
+
+        e = np.clip(np.asarray(elements["eccentricity"], dtype=np.float64), 0.0, 0.999)[:, None]
+        inclination = np.radians(np.asarray(elements["inclination"], dtype=np.float64))[:, None]
+        n = (np.asarray(elements["mean_motion"], dtype=np.float64) * 2.0 * np.pi / 86400.0)[:, None]  # rad/s
+        ndot = np.asarray(elements.get("ndot", np.zeros(len(e))), dtype=np.float64)[:, None]
+        dt_days = jd[None, :] - np.asarray(elements["epoch_jd"], dtype=np.float64)[:, None]
+        dt = dt_days * 86400.0
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            a = np.cbrt(MU_EARTH / (n * n))
+            p = a * (1.0 - e * e)
+            cos_i = np.cos(inclination)
+            j2_factor = 1.5 * J2 * (EQUATORIAL_RADIUS / p) ** 2 * n
+
+            raan = np.radians(np.asarray(elements["raan"], dtype=np.float64))[:, None] - j2_factor * cos_i * dt
+            arg_perigee = (np.radians(np.asarray(elements["arg_perigee"], dtype=np.float64))[:, None]
+                           + 0.5 * j2_factor * (5.0 * cos_i * cos_i - 1.0) * dt)
+            mean_anomaly = (np.radians(np.asarray(elements["mean_anomaly"], dtype=np.float64))[:, None]
+                            + (n + 0.5 * j2_factor * np.sqrt(1.0 - e * e) * (3.0 * cos_i * cos_i - 1.0)) * dt
+                            + 2.0 * np.pi * ndot * dt_days * dt_days)
+            mean_anomaly = np.mod(mean_anomaly, 2.0 * np.pi)
+
+            eccentric_anomaly = self.solve_kepler(mean_anomaly, e)
+            cos_ea = np.cos(eccentric_anomaly)
+            sin_ea = np.sin(eccentric_anomaly)
+            x_p = a * (cos_ea - e)
+            y_p = a * np.sqrt(1.0 - e * e) * sin_ea
+            radius = a * (1.0 - e * cos_ea)
+            velocity = np.sqrt(MU_EARTH * (2.0 / radius - 1.0 / a))
+
+            cos_o, sin_o = np.cos(raan), np.sin(raan)
+            cos_w, sin_w = np.cos(arg_perigee), np.sin(arg_perigee)
+            sin_i = np.sin(inclination)
+            position = np.stack([
+                x_p * (cos_o * cos_w - sin_o * sin_w * cos_i) - y_p * (cos_o * sin_w + sin_o * cos_w * cos_i),
+                x_p * (sin_o * cos_w + cos_o * sin_w * cos_i) + y_p * (cos_o * cos_w * cos_i - sin_o * sin_w),
+                x_p * (sin_w * sin_i) + y_p * (cos_w * sin_i)
+            ], axis=-1)
+
+            latitude, longitude, altitude = frame_cache.teme_to_geodetic(position, jd)
+
+        valid = np.isfinite(altitude) & np.isfinite(velocity)
+        if "valid" in elements:
+            valid &= np.asarray(elements["valid"], dtype=bool)[:, None]
+
+        result = {
+            "latitude": latitude,
+            "longitude": longitude,
+            "altitude": altitude,
+            "velocity": velocity,
+            "valid": valid
+        }
+        if single:
+            result = {key: value[:, 0] for key, value in result.items()}
+        return result
+
+    def solve_kepler(self, mean_anomaly, eccentricity, tolerance: float = 1e-12, max_iterations: int = 20):
+        """Vectorized Newton iteration for Kepler's equation E - e sin E = M"""
+        # Starting guess that converges for all eccentricities below 1
+        eccentric_anomaly = np.where(eccentricity > 0.8, np.pi, mean_anomaly)
+        eccentric_anomaly = np.broadcast_to(eccentric_anomaly, np.broadcast(mean_anomaly, eccentricity).shape).copy()
+        for _ in range(max_iterations):
+            delta = ((eccentric_anomaly - eccentricity * np.sin(eccentric_anomaly) - mean_anomaly)
+                     / (1.0 - eccentricity * np.cos(eccentric_anomaly)))
+            eccentric_anomaly -= delta
+            if np.nanmax(np.abs(delta), initial=0.0) < tolerance:
+                break
+        return eccentric_anomaly
+
+    def _epoch_to_jd(self, epoch_year, epoch_day):
+        """Julian dates from TLE two-digit years and fractional days of year"""
+        epoch_year = np.nan_to_num(epoch_year)
+        year = np.where(epoch_year < 57, 2000 + epoch_year, 1900 + epoch_year).astype(np.int64)
+        previous = year - 1
+        jan0 = 1721424.5 + 365 * previous + previous // 4 - previous // 100 + previous // 400
+        return jan0 + epoch_day
+
 # Global instance
 simple_orbital = SimpleOrbitalMechanics()
\ No newline at end of file
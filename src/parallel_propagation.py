@@ -0,0 +1,138 @@
+"""
+Process-pool sharded propagation for very large catalogs
+Splits the catalog into shards, propagates them in worker processes and
+gathers the results without blocking the asyncio event loop
+"""
+
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .batch_propagator import batch_propagator
+
+# Per-process cache of parsed shards: shard key -> SatrecArray.
+# Satrec objects cannot be pickled, so workers parse the TLE text they are
+# sent and keep the result for later calls on the same catalog version.
+# Calls send only the shard key first; the text follows only on a miss.
+_WORKER_SHARDS: Dict[tuple, object] = {}
+_WORKER_SHARD_LIMIT = 64
+
+
+def _propagate_shard(shard_key: tuple, jd, fr, lines1: Optional[List[str]] = None,
+                     lines2: Optional[List[str]] = None):
+    """Worker entry point: propagate one shard at every requested time
+
+    Returns None when the shard is not cached here and no TLE text was sent.
+    """
+    from sgp4.api import Satrec, SatrecArray, WGS72
+
+    satrec_array = _WORKER_SHARDS.get(shard_key)
+    if satrec_array is None:
+        if lines1 is None:
+            return None
+        satrec_array = SatrecArray([
+            Satrec.twoline2rv(line1, line2, WGS72) for line1, line2 in zip(lines1, lines2)
+        ])
+        if len(_WORKER_SHARDS) >= _WORKER_SHARD_LIMIT:
+            _WORKER_SHARDS.clear()
+        _WORKER_SHARDS[shard_key] = satrec_array
+
+    error, position, velocity = satrec_array.sgp4(jd, fr)
+    return error.astype(np.uint8), position.astype(np.float32), velocity.astype(np.float32)
+
+
+def _warm_worker():
+    """No-op task used to force worker processes to start"""
+    return os.getpid()
+
+
+class ShardedPropagator:
+    """Propagates catalog shards in a ProcessPoolExecutor"""
+
+    def __init__(self, workers: Optional[int] = None, shard_size: int = 5000):
+        self.workers = workers or os.cpu_count() or 1
+        self.shard_size = max(1, shard_size)
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.calls = 0
+        self.shard_hits = 0
+        self.shard_misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.executor is not None
+
+    def start(self):
+        """Start the worker pool"""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+            print(f"⚙️  Sharded propagation enabled ({self.workers} workers, {self.shard_size} objects/shard)")
+
+    async def warm_up(self):
+        """Spawn every worker ahead of the first propagation"""
+        if self.executor is None:
+            return
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[
+            loop.run_in_executor(self.executor, _warm_worker) for _ in range(self.workers)
+        ])
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    async def _propagate_shard(self, shard_key: tuple, lines1: Sequence[str], lines2: Sequence[str],
+                               jd, fr):
+        """Run one shard by key, sending its TLE text only if the worker lacks it"""
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(self.executor, _propagate_shard, shard_key, jd, fr)
+        if result is not None:
+            self.shard_hits += 1
+            return result
+        self.shard_misses += 1
+        return await loop.run_in_executor(
+            self.executor, _propagate_shard, shard_key, jd, fr, list(lines1), list(lines2)
+        )
+
+    async def propagate(self, catalog_key: tuple, lines1: Sequence[str], lines2: Sequence[str],
+                        times: Sequence[datetime]) -> Dict:
+        """Propagate every object at every time, sharded across the pool
+
+        ``catalog_key`` identifies the element sets (e.g. collection and
+        catalog version) so workers can reuse shards they already parsed.
+        Returns arrays shaped (objects, times[, 3]).
+        """
+        jd, fr = batch_propagator.split_julian_dates(list(times))
+
+        tasks = []
+        for first in range(0, len(lines1), self.shard_size):
+            last = min(first + self.shard_size, len(lines1))
+            shard_key = (*catalog_key, first, last)
+            tasks.append(self._propagate_shard(shard_key, lines1[first:last], lines2[first:last], jd, fr))
+
+        self.calls += 1
+        if not tasks:
+            empty = np.zeros((0, len(jd)), dtype=np.uint8)
+            return {"error": empty, "position": np.zeros((0, len(jd), 3), dtype=np.float32),
+                    "velocity_vector": np.zeros((0, len(jd), 3), dtype=np.float32)}
+
+        shards = await asyncio.gather(*tasks)
+        return {
+            "error": np.concatenate([shard[0] for shard in shards]),
+            "position": np.concatenate([shard[1] for shard in shards]),
+            "velocity_vector": np.concatenate([shard[2] for shard in shards])
+        }
+
+    def get_stats(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "workers": self.workers,
+            "shard_size": self.shard_size,
+            "calls": self.calls,
+            "shard_hits": self.shard_hits,
+            "shard_misses": self.shard_misses  # shards whose TLE text had to be sent
+        }
@@ -0,0 +1,256 @@
+"""
+Pass prediction for ground observers
+Scans elevation on a coarse time grid for many satellites at once, then
+refines rise, culmination and set times by vectorized bisection
+"""
+
+import math
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .batch_propagator import batch_propagator
+from .frames import frame_cache, geodetic_to_ecef
+from .lru_cache import LRUCache
+
+
+# Ground observer: WGS84 latitude, longitude (degrees) and altitude (km)
+Observer = Tuple[float, float, float]
+
+
+def observer_key(observer: Observer) -> Observer:
+    """Cache key for an observer, rounded to ~10 m so nearby requests share entries"""
+    latitude, longitude, altitude = observer
+    return (round(latitude, 4), round(longitude, 4), round(altitude, 3))
+
+
+class PassPredictor:
+    """Finds rise/culmination/set events above a minimum elevation"""
+
+    def __init__(self, step_seconds: float = 60.0, tolerance_seconds: float = 0.5,
+                 chunk_steps: int = 240, padding_hours: float = 12.0, cache_entries: int = 2048):
+        self.step_seconds = step_seconds
+        self.tolerance_seconds = tolerance_seconds
+        self.chunk_steps = chunk_steps
+        # Extra search window so repeated "from now" queries keep hitting the cache
+        self.padding_hours = padding_hours
+        self.cache = LRUCache(cache_entries)
+        # predict() runs in worker threads; the LRU reorders itself on every read
+        self._lock = threading.Lock()
+        self.searches = 0
+
+    def predict(self, objects: Sequence[Tuple[int, tuple, object]], observer: Observer,
+                start: datetime, hours: float, min_elevation: float = 0.0) -> Dict[int, List[Dict]]:
+        """Passes for each (norad_id, epoch_key, satrec) between start and start + hours
+
+        Cached results are reused while the object's element set epoch is
+        unchanged and the cached search window covers the request.
+        """
+        end = start + timedelta(hours=hours)
+        results: Dict[int, List[Dict]] = {}
+        missing = []
+
+        location = observer_key(observer)
+        with self._lock:
+            for norad_id, epoch_key, satrec in objects:
+                key = (location, min_elevation, norad_id)
+                entry = self.cache.get(key)
+                if entry is not None and entry["epoch"] == epoch_key \
+                        and entry["start"] <= start and entry["end"] >= end:
+                    results[norad_id] = self._select(entry["passes"], start, end)
+                else:
+                    missing.append((norad_id, epoch_key, satrec))
+
+        if missing:
+            # Align to the grid step so near-simultaneous requests share a search
+            step = timedelta(seconds=self.step_seconds)
+            search_start = start - (start - datetime.min) % step
+            search_end = end + timedelta(hours=self.padding_hours)
+            found = self.find_passes(
+                [satrec for _, _, satrec in missing], observer, search_start, search_end, min_elevation
+            )
+            with self._lock:
+                for (norad_id, epoch_key, _), passes in zip(missing, found):
+                    self.cache.put((location, min_elevation, norad_id), {
+                        "epoch": epoch_key,
+                        "start": search_start,
+                        "end": search_end,
+                        "passes": passes
+                    })
+                    results[norad_id] = self._select(passes, start, end)
+
+        return results
+
+    def find_passes(self, satrecs: List, observer: Observer, start: datetime, end: datetime,
+                    min_elevation: float = 0.0) -> List[List[Dict]]:
+        """Search [start, end] for complete passes of every satellite"""
+        self.searches += 1
+        count = len(satrecs)
+        steps = int((end - start).total_seconds() // self.step_seconds) + 1
+        if count == 0 or steps < 2:
+            return [[] for _ in range(count)]
+
+        station, enu = self._observer_frame(observer)
+        jd0, fr0 = batch_propagator.split_julian_dates([start])
+        jd0, fr0 = float(jd0[0]), float(fr0[0])
+        satrec_array = batch_propagator.build_array(satrecs)
+
+        # Coarse elevation grid (objects, steps), propagated in time chunks
+        elevation = np.empty((count, steps), dtype=np.float32)
+        for first in range(0, steps, self.chunk_steps):
+            last = min(first + self.chunk_steps, steps)
+            seconds = np.arange(first, last) * self.step_seconds
+            jd = np.full(len(seconds), jd0)
+            fr = fr0 + seconds / 86400.0
+            error, position, _ = satrec_array.sgp4(jd, fr)
+            el, _ = self._look_angles(position, jd + fr, station, enu)
+            elevation[:, first:last] = np.where(error == 0, el, -90.0)
+
+        above = elevation >= min_elevation
+        rise_sat, rise_k = np.nonzero(~above[:, :-1] & above[:, 1:])
+        set_sat, set_k = np.nonzero(above[:, :-1] & ~above[:, 1:])
+
+        # Drop a set with no rise (pass already under way at the start) and a
+        # rise with no set (pass still under way at the end)
+        first_set = np.r_[True, set_sat[1:] != set_sat[:-1]] if len(set_sat) else np.zeros(0, bool)
+        keep_set = ~(first_set & above[set_sat, 0])
+        set_sat, set_k = set_sat[keep_set], set_k[keep_set]
+        last_rise = np.r_[rise_sat[1:] != rise_sat[:-1], True] if len(rise_sat) else np.zeros(0, bool)
+        keep_rise = ~(last_rise & above[rise_sat, -1])
+        rise_sat, rise_k = rise_sat[keep_rise], rise_k[keep_rise]
+
+        passes: List[List[Dict]] = [[] for _ in range(count)]
+        if len(rise_sat) == 0:
+            return passes
+
+        # Crossings alternate per satellite, so rises and sets now pair up in order
+        sat = rise_sat
+        h = self.step_seconds
+
+        def elevation_offset(el, _azimuth):
+            return el - min_elevation
+
+        rise_s = self._bisect(satrecs, sat, rise_k * h, (rise_k + 1) * h, jd0, fr0,
+                              station, enu, elevation_offset)
+        set_s = self._bisect(satrecs, sat, set_k * h, (set_k + 1) * h, jd0, fr0,
+                             station, enu, elevation_offset)
+
+        # Culmination: grid maximum, refined where the elevation rate changes sign
+        peak_k = np.array([
+            first + int(np.argmax(elevation[s, first:last + 1]))
+            for s, first, last in zip(sat, rise_k + 1, set_k)
+        ])
+        lo = np.maximum(peak_k * h - h, rise_s)
+        hi = np.minimum(peak_k * h + h, set_s)
+        delta = min(self.tolerance_seconds, h / 4.0)
+
+        def elevation_rate(seconds):
+            ahead, _ = self._evaluate(satrecs, sat, seconds + delta, jd0, fr0, station, enu)
+            behind, _ = self._evaluate(satrecs, sat, seconds - delta, jd0, fr0, station, enu)
+            return ahead - behind
+
+        peak_s = self._bisect_function(lo, hi, elevation_rate)
+
+        _, rise_az = self._evaluate(satrecs, sat, rise_s, jd0, fr0, station, enu)
+        peak_el, peak_az = self._evaluate(satrecs, sat, peak_s, jd0, fr0, station, enu)
+        _, set_az = self._evaluate(satrecs, sat, set_s, jd0, fr0, station, enu)
+
+        for i, s in enumerate(sat.tolist()):
+            passes[s].append({
+                "rise_time": start + timedelta(seconds=float(rise_s[i])),
+                "rise_azimuth": round(float(rise_az[i]), 2),
+                "culmination_time": start + timedelta(seconds=float(peak_s[i])),
+                "max_elevation": round(float(peak_el[i]), 2),
+                "culmination_azimuth": round(float(peak_az[i]), 2),
+                "set_time": start + timedelta(seconds=float(set_s[i])),
+                "set_azimuth": round(float(set_az[i]), 2),
+                "duration_seconds": round(float(set_s[i] - rise_s[i]), 1)
+            })
+        return passes
+
+    def _bisect(self, satrecs, sat, lo, hi, jd0, fr0, station, enu, function):
+        """Root of ``function(elevation, azimuth)`` inside each [lo, hi] bracket"""
+        def evaluate(seconds):
+            return function(*self._evaluate(satrecs, sat, seconds, jd0, fr0, station, enu))
+        return self._bisect_function(lo.astype(np.float64), hi.astype(np.float64), evaluate)
+
+    def _bisect_function(self, lo: np.ndarray, hi: np.ndarray, function) -> np.ndarray:
+        """Vectorized bisection on a sign change of ``function`` over each bracket"""
+        lo = lo.astype(np.float64)
+        hi = hi.astype(np.float64)
+        width = float(np.max(hi - lo)) if len(lo) else 0.0
+        iterations = max(1, math.ceil(math.log2(max(width, self.tolerance_seconds) / self.tolerance_seconds)))
+
+        f_lo = function(lo)
+        for _ in range(iterations):
+            mid = 0.5 * (lo + hi)
+            f_mid = function(mid)
+            same = np.sign(f_mid) == np.sign(f_lo)
+            lo = np.where(same, mid, lo)
+            f_lo = np.where(same, f_mid, f_lo)
+            hi = np.where(same, hi, mid)
+        return 0.5 * (lo + hi)
+
+    def _evaluate(self, satrecs, sat: np.ndarray, seconds: np.ndarray, jd0: float, fr0: float,
+                  station, enu) -> Tuple[np.ndarray, np.ndarray]:
+        """Elevation/azimuth of satellite ``sat[i]`` at ``seconds[i]`` after the start"""
+        position = np.full((len(sat), 3), np.nan)
+        fr = fr0 + seconds / 86400.0
+        jd = np.full(len(sat), jd0)
+
+        # One vectorized SGP4 call per distinct satellite
+        order = np.argsort(sat, kind="stable")
+        boundaries = np.flatnonzero(np.diff(sat[order])) + 1
+        for group in np.split(order, boundaries):
+            if len(group) == 0:
+                continue
+            error, r, _ = satrecs[sat[group[0]]].sgp4_array(jd[group], fr[group])
+            position[group] = np.where((error == 0)[:, None], r, np.nan)
+
+        return self._look_angles(position, jd + fr, station, enu)
+
+    def _observer_frame(self, observer: Observer):
+        """Observer Earth-fixed position and east/north/up unit vectors"""
+        latitude, longitude, altitude = observer
+        station = geodetic_to_ecef(latitude, longitude, altitude)
+        lat = math.radians(latitude)
+        lon = math.radians(longitude)
+        east = np.array([-math.sin(lon), math.cos(lon), 0.0])
+        north = np.array([-math.sin(lat) * math.cos(lon), -math.sin(lat) * math.sin(lon), math.cos(lat)])
+        up = np.array([math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat)])
+        return station, np.stack([east, north, up])
+
+    def _look_angles(self, position: np.ndarray, jd_ut1: np.ndarray, station, enu):
+        """Topocentric elevation and azimuth (degrees) of TEME positions"""
+        x, y, z = frame_cache.teme_to_ecef(position, jd_ut1, cache=False)
+        relative = np.stack([x - station[0], y - station[1], z - station[2]], axis=-1)
+        east, north, up = np.moveaxis(relative @ enu.T, -1, 0)
+        elevation = np.degrees(np.arctan2(up, np.hypot(east, north)))
+        azimuth = np.degrees(np.arctan2(east, north)) % 360.0
+        return elevation, azimuth
+
+    def _select(self, passes: List[Dict], start: datetime, end: datetime) -> List[Dict]:
+        """Passes overlapping [start, end], including one already in progress"""
+        return [p for p in passes if p["set_time"] >= start and p["rise_time"] <= end]
+
+    def get_stats(self) -> Dict:
+        return {
+            "step_seconds": self.step_seconds,
+            "tolerance_seconds": self.tolerance_seconds,
+            "searches": self.searches,
+            "cache": self.cache.get_stats()
+        }
+
+
+def serialize_pass(event: Dict) -> Dict:
+    """JSON-ready copy of a pass with ISO timestamps"""
+    return {
+        key: value.isoformat() if isinstance(value, datetime) else value
+        for key, value in event.items()
+    }
+
+
+# Global instance
+pass_predictor = PassPredictor()
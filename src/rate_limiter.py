@@ -0,0 +1,57 @@
+"""
+Async token-bucket rate limiting for upstream APIs
+Callers await a token before each request; bursts up to the bucket size go
+straight through and sustained traffic is paced to the refill rate
+"""
+
+import asyncio
+import time
+from typing import Dict, Optional
+
+
+class TokenBucket:
+    """``rate`` tokens per ``per`` seconds, holding at most ``capacity``"""
+
+    def __init__(self, rate: float, per: float = 1.0, capacity: Optional[float] = None):
+        self.rate = rate / per
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.granted = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """Wait until ``tokens`` are available and take them; returns seconds waited"""
+        waited = 0.0
+        # Waiters queue on the lock, so tokens are granted in arrival order
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    self.granted += 1
+                    if waited:
+                        self.waits += 1
+                        self.wait_seconds += waited
+                    return waited
+                delay = (tokens - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def get_stats(self) -> Dict:
+        self._refill()
+        return {
+            "rate_per_second": round(self.rate, 4),
+            "capacity": self.capacity,
+            "available": round(self.tokens, 2),
+            "granted": self.granted,
+            "waits": self.waits,
+            "wait_seconds": round(self.wait_seconds, 3)
+        }
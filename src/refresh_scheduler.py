@@ -0,0 +1,191 @@
+"""
+Background refresh scheduler for orbital data sources
+Each source refreshes on its own interval with jitter and failure backoff;
+manual refreshes are queued as jobs so no request ever waits on upstream I/O
+"""
+
+import asyncio
+import random
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+# A refresh returns True on success, False on failure, None when it had
+# nothing to do (e.g. a backup source while the primary is healthy)
+RefreshFunction = Callable[[], Awaitable[Optional[bool]]]
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.utcfromtimestamp(timestamp).isoformat() if timestamp else None
+
+
+class RefreshScheduler:
+    """Per-source refresh loops plus a queue of manually requested jobs"""
+
+    def __init__(self, max_jobs: int = 100):
+        self.sources: Dict[str, Dict] = {}
+        self.jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self.max_jobs = max_jobs
+        self._loops: List[asyncio.Task] = []
+        self._job_tasks = set()
+
+    def add_source(self, name: str, refresh: RefreshFunction, interval_seconds: float,
+                   jitter: float = 0.1, retry_seconds: float = 60.0):
+        """Register a source refreshed every ``interval_seconds`` (+/- jitter)
+
+        Failures retry after ``retry_seconds``, doubling per consecutive
+        failure up to the normal interval.
+        """
+        self.sources[name] = {
+            "refresh": refresh,
+            "interval": interval_seconds,
+            "jitter": jitter,
+            "retry": min(retry_seconds, interval_seconds),
+            "lock": asyncio.Lock(),
+            "runs": 0,
+            "failures": 0,
+            "last_attempt": None,
+            "last_success": None,
+            "last_outcome": None,
+            "last_duration": None,
+            "last_error": None,
+            "next_run": None
+        }
+
+    def start(self, immediate: bool = False):
+        """Start every source's loop; first runs are due now if ``immediate``,
+        otherwise after one interval (or sooner if the last run failed)"""
+        if self._loops:
+            return
+        self._loops = [
+            asyncio.create_task(self._source_loop(name, 0.0 if immediate else None))
+            for name in self.sources
+        ]
+
+    async def stop(self):
+        tasks = self._loops + list(self._job_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loops = []
+
+    async def _source_loop(self, name: str, delay: Optional[float]):
+        source = self.sources[name]
+        if delay is None:
+            delay = self._next_delay(source)
+        while True:
+            source["next_run"] = time.time() + delay
+            await asyncio.sleep(delay)
+
+            # A manual job may have refreshed the source while we slept
+            since_success = time.time() - (source["last_success"] or 0)
+            if source["failures"] == 0 and since_success < source["interval"] * (1 - source["jitter"]):
+                delay = self._next_delay(source) - since_success
+                continue
+
+            await self.run_source(name)
+            delay = self._next_delay(source)
+
+    def _next_delay(self, source: Dict) -> float:
+        if source["failures"]:
+            base = min(source["interval"], source["retry"] * 2 ** (source["failures"] - 1))
+        else:
+            base = source["interval"]
+        return base * random.uniform(1 - source["jitter"], 1 + source["jitter"])
+
+    async def run_source(self, name: str) -> str:
+        """Refresh one source now (serialized with its scheduled runs)"""
+        source = self.sources[name]
+        async with source["lock"]:
+            started = time.time()
+            source["runs"] += 1
+            source["last_attempt"] = started
+            error = None
+            try:
+                result = await source["refresh"]()
+            except Exception as e:
+                result, error = False, str(e)
+
+            source["last_duration"] = time.time() - started
+            if result is None:
+                outcome = "skipped"
+            elif result:
+                outcome = "succeeded"
+                source["failures"] = 0
+                source["last_success"] = time.time()
+                source["last_error"] = None
+            else:
+                outcome = "failed"
+                source["failures"] += 1
+                source["last_error"] = error or "no data returned"
+            source["last_outcome"] = outcome
+        detail = f": {source['last_error']}" if outcome == "failed" else ""
+        print(f"🔄 {name} refresh {outcome} in {source['last_duration']:.2f}s{detail}")
+        return outcome
+
+    # ------------------------------------------------------------------
+    # Manual jobs
+    # ------------------------------------------------------------------
+
+    def enqueue(self, sources: Optional[List[str]] = None) -> str:
+        """Queue a refresh of some (default: all) sources; returns the job id"""
+        names = list(self.sources) if not sources else list(sources)
+        unknown = [name for name in names if name not in self.sources]
+        if unknown:
+            raise ValueError(f"Unknown data source: {', '.join(unknown)}")
+
+        job_id = uuid.uuid4().hex[:12]
+        self.jobs[job_id] = {
+            "job_id": job_id,
+            "sources": names,
+            "status": "queued",
+            "created": datetime.utcnow().isoformat(),
+            "started": None,
+            "finished": None,
+            "results": {}
+        }
+        while len(self.jobs) > self.max_jobs:
+            self.jobs.popitem(last=False)
+
+        task = asyncio.create_task(self._run_job(self.jobs[job_id]))
+        self._job_tasks.add(task)
+        task.add_done_callback(self._job_tasks.discard)
+        return job_id
+
+    async def _run_job(self, job: Dict):
+        job["status"] = "running"
+        job["started"] = datetime.utcnow().isoformat()
+        for name in job["sources"]:
+            job["results"][name] = await self.run_source(name)
+        outcomes = set(job["results"].values())
+        job["status"] = "failed" if outcomes == {"failed"} else "completed"
+        job["finished"] = datetime.utcnow().isoformat()
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        return self.jobs.get(job_id)
+
+    # ------------------------------------------------------------------
+    # Freshness
+    # ------------------------------------------------------------------
+
+    def get_freshness(self) -> Dict[str, Dict]:
+        """Age of each source's last successful refresh and its schedule"""
+        now = time.time()
+        freshness = {}
+        for name, source in self.sources.items():
+            last_success = source["last_success"]
+            freshness[name] = {
+                "interval_seconds": source["interval"],
+                "last_success": _iso(last_success),
+                "age_seconds": round(now - last_success, 1) if last_success else None,
+                "last_attempt": _iso(source["last_attempt"]),
+                "last_outcome": source["last_outcome"],
+                "last_duration_seconds": round(source["last_duration"], 3) if source["last_duration"] is not None else None,
+                "last_error": source["last_error"],
+                "consecutive_failures": source["failures"],
+                "next_run_in_seconds": round(max(0.0, source["next_run"] - now), 1) if source["next_run"] else None,
+                "runs": source["runs"]
+            }
+        return freshness
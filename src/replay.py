@@ -0,0 +1,467 @@
+"""
+Offline replay stand-in for Celestrak and Space-Track
+Serves recorded or synthetic GP data (OMM JSON, TLE, 3LE) with configurable
+latency, bandwidth, error rate and rate limit, either in-process as an httpx
+transport or as a local HTTP server the clients point at by base URL
+
+Usage:
+    python -m src.replay serve [--port 8800]
+    python -m src.replay record [group ...]
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+import time
+import zlib
+from collections import deque
+from datetime import datetime, timedelta
+from email.utils import formatdate
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+
+from .catalog_store import omm_to_tle_lines
+
+# In-process replay for the Celestrak and Space-Track clients
+ORBITAL_DATA_REPLAY = os.getenv("ORBITAL_DATA_REPLAY", "false").lower() == "true"
+# Recorded payloads: <dir>/celestrak/<group>.json, <dir>/spacetrack/tle_latest.json
+REPLAY_DIR = os.getenv("REPLAY_DIR", "")
+REPLAY_OBJECTS = int(os.getenv("REPLAY_OBJECTS", "10000"))  # synthetic "active" group
+REPLAY_GROUP_OBJECTS = int(os.getenv("REPLAY_GROUP_OBJECTS", "1500"))  # per debris group
+REPLAY_SEED = int(os.getenv("REPLAY_SEED", "42"))
+
+# Simulated network conditions (0 disables each; bandwidth is per response)
+REPLAY_LATENCY_MS = float(os.getenv("REPLAY_LATENCY_MS", "0"))
+REPLAY_LATENCY_JITTER_MS = float(os.getenv("REPLAY_LATENCY_JITTER_MS", "0"))
+REPLAY_BANDWIDTH_KBPS = float(os.getenv("REPLAY_BANDWIDTH_KBPS", "0"))
+REPLAY_ERROR_RATE = float(os.getenv("REPLAY_ERROR_RATE", "0"))
+REPLAY_RATE_LIMIT_PER_MINUTE = float(os.getenv("REPLAY_RATE_LIMIT_PER_MINUTE", "0"))
+
+BODY_CHUNK_BYTES = 1 << 16
+MU_EARTH = 398600.4418  # km^3/s^2
+EARTH_RADIUS = 6378.137  # km
+
+# Orbit families used to synthesize groups (altitude/spread km, inclination deg)
+SATELLITE_PROFILES = {
+    "stations": {"name": "ISS MODULE", "altitude": 420, "spread": 15, "inclination": 51.64, "eccentricity": 0.0005, "weight": 0.01},
+    "starlink": {"name": "STARLINK", "altitude": 550, "spread": 10, "inclination": 53.05, "eccentricity": 0.0001, "weight": 0.6},
+    "gps-ops": {"name": "NAVSTAR", "altitude": 20180, "spread": 50, "inclination": 55.0, "eccentricity": 0.01, "weight": 0.03},
+    "weather": {"name": "NOAA", "altitude": 830, "spread": 30, "inclination": 98.7, "eccentricity": 0.001, "weight": 0.06},
+    "other": {"name": "SAT", "altitude": 700, "spread": 250, "inclination": 75.0, "eccentricity": 0.005, "weight": 0.3}
+}
+DEBRIS_PROFILES = {
+    "cosmos-2251-debris": {"name": "COSMOS 2251 DEB", "altitude": 790, "spread": 80, "inclination": 74.0, "eccentricity": 0.01},
+    "iridium-33-debris": {"name": "IRIDIUM 33 DEB", "altitude": 780, "spread": 70, "inclination": 86.4, "eccentricity": 0.008},
+    "fengyun-1c-debris": {"name": "FENGYUN 1C DEB", "altitude": 850, "spread": 120, "inclination": 98.8, "eccentricity": 0.012},
+    "cosmos-1408-debris": {"name": "COSMOS 1408 DEB", "altitude": 480, "spread": 40, "inclination": 82.6, "eccentricity": 0.004}
+}
+# Synthetic NORAD ID ranges: debris groups below, active satellites above
+ACTIVE_BASE_ID = 40000
+DEBRIS_BASE_ID = 1000
+ISS_NORAD_ID = 25544
+
+
+def _mean_motion(altitude_km: float) -> float:
+    """Revolutions per day of a circular orbit"""
+    semi_major = EARTH_RADIUS + altitude_km
+    return 86400.0 / (2 * math.pi) * math.sqrt(MU_EARTH / semi_major ** 3)
+
+
+class ReplayService:
+    """Answers Celestrak GP and Space-Track query URLs from replay data
+
+    Groups are read from ``directory`` when recorded, otherwise generated
+    deterministically from ``seed``. Network conditions are applied per
+    request and can be changed between runs via ``conditions``.
+    """
+
+    def __init__(self, directory: str = REPLAY_DIR, objects: int = REPLAY_OBJECTS,
+                 group_objects: int = REPLAY_GROUP_OBJECTS, seed: int = REPLAY_SEED,
+                 **conditions):
+        self.directory = directory
+        self.objects = min(objects, 99999 - ACTIVE_BASE_ID)
+        self.group_objects = min(group_objects, (ACTIVE_BASE_ID - DEBRIS_BASE_ID) // len(DEBRIS_PROFILES))
+        self.seed = seed
+        # Element sets are dated to the start of the current UTC day
+        self.epoch = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.conditions = {
+            "latency_ms": REPLAY_LATENCY_MS,
+            "latency_jitter_ms": REPLAY_LATENCY_JITTER_MS,
+            "bandwidth_kbps": REPLAY_BANDWIDTH_KBPS,
+            "error_rate": REPLAY_ERROR_RATE,
+            "rate_limit_per_minute": REPLAY_RATE_LIMIT_PER_MINUTE,
+            **conditions
+        }
+        self._rng = random.Random(seed)
+        self._groups: Dict[str, List[Dict]] = {}
+        self._spacetrack: Optional[List[Dict]] = None
+        self._bodies: Dict[str, Tuple[bytes, str]] = {}
+        self._recent = deque()
+        self.stats = {
+            "requests": 0,
+            "served": 0,
+            "not_modified": 0,
+            "errors_injected": 0,
+            "rate_limited": 0,
+            "not_found": 0,
+            "bytes_sent": 0
+        }
+
+    # -- data ----------------------------------------------------------------
+
+    def _load_recorded(self, *parts: str) -> Optional[List[Dict]]:
+        if not self.directory:
+            return None
+        path = os.path.join(self.directory, *parts)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def _synthetic_record(self, rng: random.Random, norad_id: int, name: str, profile: Dict) -> Dict:
+        altitude = max(160.0, rng.gauss(profile["altitude"], profile["spread"]))
+        launch_year = rng.randint(1998, self.epoch.year)
+        epoch = self.epoch - timedelta(hours=rng.uniform(0, 72))
+        return {
+            "OBJECT_NAME": name,
+            "OBJECT_ID": f"{launch_year}-{rng.randint(1, 300):03d}{rng.choice('ABCDEFGH')}",
+            "EPOCH": epoch.strftime("%Y-%m-%dT%H:%M:%S.%f"),
+            "MEAN_MOTION": round(_mean_motion(altitude), 8),
+            "ECCENTRICITY": round(min(0.5, abs(rng.gauss(profile["eccentricity"], 0.002))), 7),
+            "INCLINATION": round(min(179.9, max(0.0, rng.gauss(profile["inclination"], 0.5))), 4),
+            "RA_OF_ASC_NODE": round(rng.uniform(0, 360), 4),
+            "ARG_OF_PERICENTER": round(rng.uniform(0, 360), 4),
+            "MEAN_ANOMALY": round(rng.uniform(0, 360), 4),
+            "EPHEMERIS_TYPE": 0,
+            "CLASSIFICATION_TYPE": "U",
+            "NORAD_CAT_ID": norad_id,
+            "ELEMENT_SET_NO": 999,
+            "REV_AT_EPOCH": rng.randint(1, 99999),
+            "BSTAR": round(rng.uniform(1e-5, 5e-4), 8),
+            "MEAN_MOTION_DOT": round(rng.uniform(0, 5e-5), 8),
+            "MEAN_MOTION_DDOT": 0
+        }
+
+    def _synthetic_active(self) -> List[Dict]:
+        rng = random.Random(self.seed)
+        families = list(SATELLITE_PROFILES)
+        weights = [SATELLITE_PROFILES[family]["weight"] for family in families]
+        records = []
+        for offset in range(self.objects):
+            norad_id = ACTIVE_BASE_ID + offset
+            family = rng.choices(families, weights)[0]
+            profile = SATELLITE_PROFILES[family]
+            record = self._synthetic_record(rng, norad_id, f"{profile['name']}-{norad_id}", profile)
+            record["_family"] = family
+            records.append(record)
+        return records
+
+    def _synthetic_debris(self, group: str) -> List[Dict]:
+        index = list(DEBRIS_PROFILES).index(group)
+        rng = random.Random(self.seed + zlib.crc32(group.encode("utf-8")))
+        profile = DEBRIS_PROFILES[group]
+        base = DEBRIS_BASE_ID + index * self.group_objects
+        return [
+            self._synthetic_record(rng, base + offset, profile["name"], profile)
+            for offset in range(self.group_objects)
+        ]
+
+    def group(self, group: str) -> Optional[List[Dict]]:
+        """OMM records of a Celestrak GP group (None if unknown)"""
+        group = group.lower()
+        if group in self._groups:
+            return self._groups[group]
+
+        records = self._load_recorded("celestrak", f"{group}.json")
+        if records is None:
+            if group in DEBRIS_PROFILES:
+                records = self._synthetic_debris(group)
+            elif group == "active":
+                records = self._synthetic_active()
+            elif group in SATELLITE_PROFILES:
+                records = [r for r in self.group("active") if r.get("_family") == group]
+            elif group == "supplemental":
+                records = self.group("active")[::10]
+            else:
+                return None
+        self._groups[group] = records
+        return records
+
+    def lookup(self, norad_id: int) -> Dict:
+        """One object by NORAD ID, synthesized if no group holds it"""
+        for group in ["active", *DEBRIS_PROFILES]:
+            for record in self.group(group) or []:
+                if record["NORAD_CAT_ID"] == norad_id:
+                    return record
+        rng = random.Random(self.seed + norad_id)
+        name = "ISS (ZARYA)" if norad_id == ISS_NORAD_ID else f"OBJECT {norad_id}"
+        return self._synthetic_record(rng, norad_id, name, SATELLITE_PROFILES["stations"])
+
+    def spacetrack_catalog(self) -> List[Dict]:
+        """Space-Track tle_latest rows (strings, with TLE lines and object type)"""
+        if self._spacetrack is None:
+            rows = self._load_recorded("spacetrack", "tle_latest.json")
+            if rows is None:
+                rows = []
+                groups = [("PAYLOAD", "active")] + [("DEBRIS", group) for group in DEBRIS_PROFILES]
+                for object_type, group in groups:
+                    for record in self.group(group):
+                        line1, line2 = omm_to_tle_lines(record)
+                        row = {key: str(value) for key, value in record.items() if not key.startswith("_")}
+                        row.update({
+                            "OBJECT_TYPE": object_type,
+                            "COUNTRY_CODE": "US" if object_type == "PAYLOAD" else "CIS",
+                            "LAUNCH_DATE": record["OBJECT_ID"][:4] + "-01-01",
+                            "DECAY_DATE": None,
+                            "RCS_SIZE": "LARGE" if object_type == "PAYLOAD" else "SMALL",
+                            "ORDINAL": "1",
+                            "TLE_LINE0": f"0 {record['OBJECT_NAME']}",
+                            "TLE_LINE1": line1,
+                            "TLE_LINE2": line2
+                        })
+                        rows.append(row)
+            self._spacetrack = rows
+        return self._spacetrack
+
+    # -- formats -------------------------------------------------------------
+
+    def _encode(self, records: List[Dict], fmt: str) -> Optional[Tuple[bytes, str]]:
+        fmt = fmt.lower()
+        if fmt == "json":
+            clean = [{k: v for k, v in r.items() if not k.startswith("_")} for r in records]
+            return json.dumps(clean).encode("utf-8"), "application/json"
+        if fmt in ("tle", "3le", "2le"):
+            lines = []
+            for record in records:
+                if record.get("TLE_LINE1"):
+                    line1, line2 = record["TLE_LINE1"], record["TLE_LINE2"]
+                else:
+                    line1, line2 = omm_to_tle_lines(record)
+                if fmt == "tle":
+                    lines.append(record["OBJECT_NAME"])
+                elif fmt == "3le":
+                    lines.append(f"0 {record['OBJECT_NAME']}")
+                lines += [line1, line2]
+            return ("\r\n".join(lines) + "\r\n").encode("ascii"), "text/plain"
+        return None
+
+    def _celestrak(self, query: Dict[str, List[str]]) -> Tuple[int, Optional[List[Dict]], str]:
+        fmt = query.get("FORMAT", ["tle"])[0]
+        if "GROUP" in query:
+            records = self.group(query["GROUP"][0])
+            if records is None:
+                return 404, None, fmt
+            return 200, records, fmt
+        if "CATNR" in query:
+            return 200, [self.lookup(int(query["CATNR"][0]))], fmt
+        return 400, None, fmt
+
+    def _spacetrack_query(self, path: str) -> Tuple[int, Optional[List[Dict]], str]:
+        # /basicspacedata/query/class/<class>/<FIELD>/<value>/.../format/<fmt>
+        parts = [p for p in path.split("/") if p][2:]
+        if len(parts) < 2 or parts[0] != "class" or parts[1] not in ("tle_latest", "gp"):
+            return 404, None, "json"
+        predicates = dict(zip(parts[2::2], parts[3::2]))
+        fmt = predicates.pop("format", "tle")
+        limit = int(predicates.pop("limit")) if "limit" in predicates else None
+        predicates.pop("ORDINAL", None)
+        predicates.pop("orderby", None)
+
+        rows = self.spacetrack_catalog()
+        if "OBJECT_TYPE" in predicates:
+            wanted = predicates.pop("OBJECT_TYPE").upper()
+            rows = [row for row in rows if row["OBJECT_TYPE"] == wanted]
+        if "NORAD_CAT_ID" in predicates:
+            ids = set()
+            for term in predicates.pop("NORAD_CAT_ID").split(","):
+                if "--" in term:
+                    low, high = term.split("--")
+                    ids.update(range(int(low), int(high) + 1))
+                else:
+                    ids.add(int(term))
+            rows = [row for row in rows if int(row["NORAD_CAT_ID"]) in ids]
+        if limit is not None:
+            rows = rows[:limit]
+        return 200, rows, fmt
+
+    # -- requests ------------------------------------------------------------
+
+    def _rate_limited(self) -> bool:
+        limit = self.conditions["rate_limit_per_minute"]
+        if not limit:
+            return False
+        now = time.monotonic()
+        while self._recent and now - self._recent[0] > 60.0:
+            self._recent.popleft()
+        if len(self._recent) >= limit:
+            return True
+        self._recent.append(now)
+        return False
+
+    def _body(self, key: str, records: List[Dict], fmt: str) -> Optional[Tuple[bytes, str]]:
+        # Encoded bodies are reused; replay data does not change during a run
+        if key not in self._bodies:
+            encoded = self._encode(records, fmt)
+            if encoded is None:
+                return None
+            self._bodies[key] = encoded
+        return self._bodies[key]
+
+    async def respond(self, method: str, url: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        """Status, headers and body for one request, after the simulated latency"""
+        self.stats["requests"] += 1
+        conditions = self.conditions
+        latency = conditions["latency_ms"] + self._rng.uniform(0, conditions["latency_jitter_ms"])
+        if latency:
+            await asyncio.sleep(latency / 1000.0)
+
+        if self._rate_limited():
+            self.stats["rate_limited"] += 1
+            return 429, {"retry-after": "60", "content-type": "text/plain"}, b"Rate limit exceeded"
+        if conditions["error_rate"] and self._rng.random() < conditions["error_rate"]:
+            self.stats["errors_injected"] += 1
+            return 503, {"content-type": "text/plain"}, b"Service temporarily unavailable"
+
+        parts = urlsplit(url)
+        if method == "POST" and parts.path == "/ajaxauth/login":
+            self.stats["served"] += 1
+            return 200, {"set-cookie": "chocolatechip=replay; Path=/", "content-type": "application/json"}, b'""'
+
+        if parts.path == "/NORAD/elements/gp.php":
+            status, records, fmt = self._celestrak(parse_qs(parts.query))
+        elif parts.path.startswith("/basicspacedata/query/"):
+            status, records, fmt = self._spacetrack_query(parts.path)
+        else:
+            status, records, fmt = 404, None, "json"
+
+        body = self._body(parts.path + "?" + parts.query, records, fmt) if records is not None else None
+        if body is None:
+            self.stats["not_found"] += 1
+            return status if status != 200 else 400, {"content-type": "text/plain"}, b"No GP data found"
+
+        content, content_type = body
+        etag = '"' + hashlib.sha1(content).hexdigest()[:16] + '"'
+        response_headers = {
+            "content-type": content_type,
+            "etag": etag,
+            "last-modified": formatdate(self.epoch.timestamp(), usegmt=True)
+        }
+        if headers.get("if-none-match") == etag:
+            self.stats["not_modified"] += 1
+            return 304, response_headers, b""
+        self.stats["served"] += 1
+        return 200, response_headers, content
+
+    async def throttle(self, content: bytes) -> AsyncIterator[bytes]:
+        """Deliver a body in chunks at the configured bandwidth"""
+        bandwidth = self.conditions["bandwidth_kbps"] * 1000.0
+        for start in range(0, len(content), BODY_CHUNK_BYTES):
+            chunk = content[start:start + BODY_CHUNK_BYTES]
+            if bandwidth:
+                await asyncio.sleep(len(chunk) / bandwidth)
+            self.stats["bytes_sent"] += len(chunk)
+            yield chunk
+
+    def get_stats(self) -> Dict:
+        return {"conditions": dict(self.conditions), **self.stats}
+
+
+class _ThrottledBody(httpx.AsyncByteStream):
+    def __init__(self, service: ReplayService, content: bytes):
+        self.service = service
+        self.content = content
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.service.throttle(self.content):
+            yield chunk
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """httpx transport answering every request from a ReplayService"""
+
+    def __init__(self, service: ReplayService):
+        self.service = service
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        headers = {key.lower(): value for key, value in request.headers.items()}
+        status, response_headers, content = await self.service.respond(request.method, str(request.url), headers)
+        return httpx.Response(status, headers=response_headers,
+                              stream=_ThrottledBody(self.service, content), request=request)
+
+
+def replay_transport() -> Optional[ReplayTransport]:
+    """Transport for the orbital data clients: replay if enabled, else real network (None)"""
+    return ReplayTransport(replay_service) if ORBITAL_DATA_REPLAY else None
+
+
+def create_app(service: ReplayService):
+    """Minimal ASGI app serving the replay over real HTTP"""
+    async def app(scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        more_body = True
+        while more_body:
+            message = await receive()
+            more_body = message.get("more_body", False)
+
+        query = scope["query_string"].decode("latin-1")
+        url = f"http://replay{scope['path']}" + (f"?{query}" if query else "")
+        headers = {key.decode("latin-1").lower(): value.decode("latin-1") for key, value in scope["headers"]}
+        status, response_headers, content = await service.respond(scope["method"], url, headers)
+        response_headers["content-length"] = str(len(content))
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(key.encode("latin-1"), value.encode("latin-1")) for key, value in response_headers.items()]
+        })
+        async for chunk in service.throttle(content):
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+    return app
+
+
+async def record(groups: List[str], directory: str):
+    """Save live Celestrak GP groups for later replay"""
+    os.makedirs(os.path.join(directory, "celestrak"), exist_ok=True)
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        for group in groups:
+            response = await client.get(f"https://celestrak.org/NORAD/elements/gp.php?GROUP={group}&FORMAT=json")
+            if response.status_code != 200:
+                print(f"⚠️  {group}: HTTP {response.status_code}")
+                continue
+            with open(os.path.join(directory, "celestrak", f"{group}.json"), "wb") as f:
+                f.write(response.content)
+            print(f"💾 Recorded {group}: {len(response.json())} objects")
+
+
+# Global instance
+replay_service = ReplayService()
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "serve"
+    if command == "record":
+        groups = sys.argv[2:] or ["active", *DEBRIS_PROFILES]
+        asyncio.run(record(groups, REPLAY_DIR or ".cache/replay"))
+    else:
+        import uvicorn
+
+        port = int(sys.argv[sys.argv.index("--port") + 1]) if "--port" in sys.argv else 8800
+        print(f"🎞️  Replaying Celestrak/Space-Track on http://127.0.0.1:{port}")
+        uvicorn.run(create_app(replay_service), host="127.0.0.1", port=port, log_level="warning")
@@ -1,77 +1,315 @@
 import numpy as np
 import asyncio
+import os
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, List, Optional
 import random
 from .database import get_database
+from .single_flight import single_flight
+from .batch_propagator import batch_propagator
+from .conjunction_screening import ConjunctionScreener, CandidatePairs, orbit_prefilter, PREFILTER_MARGIN_KM
+from .collision_probability import conjunction_probability, COLLISION_PROBABILITY_METHOD, PROBABILITY_THRESHOLDS
+
+# The catalog is rescreened on this interval (rolling the window forward)
+# and shortly after every catalog change
+SCREENING_INTERVAL_MINUTES = float(os.getenv("SCREENING_INTERVAL_MINUTES", "60"))
+SCREENING_DEBOUNCE_SECONDS = 10.0  # let a burst of change events settle first
+MAX_REPORTED_CONJUNCTIONS = 50
+FORECAST_DAYS = 7
 
 class RiskAnalyzer:
-    def __init__(self):
+    def __init__(self, debris_tracker=None):
         self.db = None
+        self.tracker = debris_tracker
         self.risk_thresholds = {
             "safe": 50,      # km
             "watch": 20,     # km
             "alert": 5       # km
         }
+        # Collision probability that raises a conjunction to watch / alert
+        # whatever its miss distance
+        self.probability_thresholds = dict(PROBABILITY_THRESHOLDS)
+        self.screener = ConjunctionScreener()
+        if self.screener.radius_km < self.risk_thresholds["safe"]:
+            print(f"⚠️  Screening radius {self.screener.radius_km} km is below the {self.risk_thresholds['safe']} km "
+                  f"safe threshold; conjunctions beyond it are not screened")
+        self.screening: Optional[Dict] = None
+        self.screenings = 0
+        self._screening_task = None
+        self._catalog_changed = asyncio.Event()
         
     async def initialize(self):
-        """Initialize the risk analyzer"""
+        """Initialize the risk analyzer and start screening the tracker's catalog"""
         self.db = await get_database()
+        if self.tracker is not None:
+            self.tracker.add_catalog_listener(self._on_catalog_change)
+            self._screening_task = asyncio.create_task(self._screening_loop())
+
+    def _on_catalog_change(self, event: Dict):
+        self._catalog_changed.set()
+
+    async def _screening_loop(self):
+        """Rescreen on a fixed interval, or soon after the catalog changes"""
+        while True:
+            try:
+                await self.screen_conjunctions()
+            except Exception as e:
+                print(f"⚠️  Conjunction screening failed: {e}")
+            try:
+                await asyncio.wait_for(self._catalog_changed.wait(), SCREENING_INTERVAL_MINUTES * 60)
+                await asyncio.sleep(SCREENING_DEBOUNCE_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._catalog_changed.clear()
+
+    async def screen_conjunctions(self) -> Optional[Dict]:
+        """Screen the whole catalog for close approaches over the coming window
+
+        Propagation and pair search run in a worker thread; the finished
+        result replaces the previous one.
+        """
+        tracker = self.tracker
+        if tracker is None or not batch_propagator.available or len(tracker.catalog) < 2:
+            return None
+        catalog = tracker.catalog
+        version = catalog.version
+        rows, satrec_array = tracker.catalog_satrecs()
+        if satrec_array is None:
+            return None
+
+        # Copy what the prefilters and the report need; the catalog may
+        # change while screening runs
+        start = datetime.utcnow()
+        jd, fr = batch_propagator.split_julian_dates([start])
+        elements = {
+            name: catalog[name][rows]
+            for name in ("mean_motion", "eccentricity", "inclination", "raan", "arg_perigee")
+        }
+        objects = {
+            "norad_id": catalog["norad_id"].copy(),
+            "name": catalog["name"].copy(),
+            "debris": catalog.mask(object_type="debris"),
+            "altitude": (catalog["perigee"] + catalog["apogee"]) / 2.0,
+            "size": catalog["size_estimate"].copy(),
+            "age_days": jd[0] + fr[0] - catalog.epoch_jd()  # element set age at the window start
+        }
+        rows = np.asarray(rows)
+        elements["age_days"] = objects["age_days"][rows]
+        result = await asyncio.to_thread(self._screen, satrec_array, rows, elements, objects, start)
+        result.update(start=start, version=version, objects=objects)
+        result["conjunctions"], result["tca"] = self._build_conjunctions(result)
+        self.screening = result
+        self.screenings += 1
+
+        stats = result["stats"]
+        prefilter = stats["prefilter"]
+        print(f"🧮 Conjunction prefilter: {prefilter['surviving_pairs']} of {prefilter['total_pairs']} pairs can meet "
+              f"({prefilter['apogee_perigee_removed']} ruled out by apogee/perigee, "
+              f"{prefilter['orbit_path_removed']} by orbit path; built in {prefilter['seconds']:.2f}s), "
+              f"{stats['prefilter_rejected_pairs']} index matches dropped")
+        print(f"💥 Conjunction screening: {stats['conjunctions']} conjunctions within {stats['radius_km']} km "
+              f"among {stats['objects']} objects over {stats['window_hours']}h in {stats['seconds']:.1f}s "
+              f"({stats['candidate_pairs']} candidate pairs)")
+        return result
+
+    def _screen(self, satrec_array, rows: np.ndarray, elements: Dict, objects: Dict,
+                start: datetime) -> Dict:
+        """Prefilter the pairs, screen the survivors, then score them (blocking; runs in a worker thread)
+
+        Payloads are put first in each pair so miss components are given in
+        the payload's radial/in-track/cross-track frame.
+        """
+        candidates = self.prefilter_pairs(elements)
+        result = self.screener.screen(satrec_array, rows, start, candidates, primary=~objects["debris"][rows])
+        result["stats"]["prefilter"] = candidates.stats
+        result["collision_probability"], result["hard_body_radius"] = self.collision_probability(result, objects)
+        result["stats"]["probability_method"] = COLLISION_PROBABILITY_METHOD
+        return result
+
+    def prefilter_pairs(self, elements: Dict[str, np.ndarray]) -> CandidatePairs:
+        """Apogee/perigee then orbit-path filters over catalog element arrays
+
+        Pairs that could never pass within the screening radius (plus a
+        margin for mean vs osculating radius) over the window are ruled
+        out; the result holds the survivors and per-stage removal counts.
+        """
+        return orbit_prefilter(
+            elements, self.screener.radius_km + PREFILTER_MARGIN_KM, self.screener.window_hours / 24.0
+        )
+
+    def _build_conjunctions(self, result: Dict):
+        """Conjunction records, most probable first, with their TCA offsets"""
+        objects = result["objects"]
+        # The screen puts the payload first when only one side is debris
+        primary, secondary = result["rows"]
+
+        miss = result["miss_distance"]
+        probability = result["collision_probability"]
+        order = np.argsort(-probability, kind="stable")
+
+        conjunctions = []
+        for rank, k in enumerate(order.tolist()):
+            a, b = int(primary[k]), int(secondary[k])
+            tca = result["start"] + timedelta(seconds=float(result["tca_seconds"][k]))
+            conjunctions.append({
+                "id": f"CONJ-{rank + 1:03d}",
+                "primary_object": objects["name"][a].decode("ascii"),
+                "primary_norad_id": int(objects["norad_id"][a]),
+                "secondary_object": objects["name"][b].decode("ascii"),
+                "secondary_norad_id": int(objects["norad_id"][b]),
+                "time_of_closest_approach": tca.isoformat(),
+                "miss_distance": float(miss[k]),  # km
+                "miss_components": {  # km, secondary relative to primary
+                    "radial": float(result["radial"][k]),
+                    "in_track": float(result["in_track"][k]),
+                    "cross_track": float(result["cross_track"][k])
+                },
+                "collision_probability": float(probability[k]),
+                "hard_body_radius": float(result["hard_body_radius"][k]),  # km
+                "risk_level": self._calculate_risk_level(float(miss[k]), float(probability[k])),
+                "relative_velocity": float(result["relative_velocity"][k]),  # km/s
+                "altitude": float(objects["altitude"][a])  # km, mean orbital altitude of the primary
+            })
+        return conjunctions, result["tca_seconds"][order]
+
+    def collision_probability(self, result: Dict, objects: Dict):
+        """Short-encounter collision probability and hard-body radius for every screened conjunction
+
+        Each object's covariance comes from its size estimate and the age
+        of its element set at closest approach.
+        """
+        first, second = result["rows"]
+        tca_days = result["tca_seconds"] / 86400.0
+        return conjunction_probability(
+            result["position"], result["velocity"],
+            result["relative_position"], result["relative_velocity_vector"],
+            sizes=(objects["size"][first], objects["size"][second]),
+            age_days=(objects["age_days"][first] + tca_days, objects["age_days"][second] + tca_days)
+        )
+
+    def upcoming_conjunctions(self, hours: Optional[float] = None) -> List[Dict]:
+        """Screened conjunctions still ahead (within ``hours``), most probable first"""
+        screening = self.screening
+        if screening is None:
+            return []
+        elapsed = (datetime.utcnow() - screening["start"]).total_seconds()
+        ahead = screening["tca"] >= elapsed
+        if hours is not None:
+            ahead &= screening["tca"] <= elapsed + hours * 3600.0
+        conjunctions = screening["conjunctions"]
+        # Copies, so callers can annotate them freely
+        return [dict(conjunctions[k]) for k in np.flatnonzero(ahead).tolist()]
+
+    def collision_forecast(self, days: int = FORECAST_DAYS) -> List[Dict]:
+        """Daily chance of at least one collision among screened conjunctions
+
+        Days (or parts of days) past the screening window are extrapolated
+        at the window's average collision rate; ``screened_fraction`` says
+        how much of each day the screening actually covered.
+        """
+        screening = self.screening
+        now = datetime.utcnow()
+        if screening is None:
+            elapsed = window = rate = 0.0
+            tca = log_miss = np.zeros(0)
+        else:
+            elapsed = (now - screening["start"]).total_seconds()
+            window = screening["stats"]["window_hours"] * 3600.0
+            tca = screening["tca_seconds"]
+            # log(1 - Pc), so independent chances combine by summing
+            log_miss = np.log1p(-np.minimum(screening["collision_probability"], 1.0 - 1e-12))
+            rate = log_miss.sum() / window  # per second over the whole window
+
+        forecast = []
+        for day in range(days):
+            start, end = elapsed + day * 86400.0, elapsed + (day + 1) * 86400.0
+            covered = max(0.0, min(end, window) - max(start, 0.0))
+            inside = (tca >= start) & (tca < end)
+            log_day = log_miss[inside].sum() + rate * (86400.0 - covered)
+            forecast.append({
+                "date": (now + timedelta(days=day)).strftime("%Y-%m-%d"),
+                "probability": max(0.0, float(-np.expm1(log_day))),
+                "conjunctions": int(np.count_nonzero(inside)),
+                "screened_fraction": covered / 86400.0
+            })
+        return forecast
+
+    def get_screening_stats(self) -> Dict:
+        """Configuration and outcome of the latest catalog screening"""
+        screening = self.screening
+        stats = {"screenings": self.screenings, **self.screener.get_config()}
+        if screening is None:
+            stats["status"] = "pending" if self.tracker is not None and batch_propagator.available else "unavailable"
+            return stats
+        stats.update(screening["stats"])
+        stats.update(
+            status="complete",
+            window_start=screening["start"].isoformat(),
+            catalog_version=screening["version"],
+            current=self.tracker is not None and screening["version"] == self.tracker.catalog.version
+        )
+        return stats
         
+    @single_flight()
     async def analyze_current_risks(self) -> Dict:
-        """Analyze current collision risks"""
-        # Simulate risk analysis
+        """Analyze current collision risks from the catalog and the latest screening"""
+        catalog = self.tracker.catalog if self.tracker is not None else None
+        risk_counts = catalog.count_by("risk_level") if catalog is not None else {}
+        if catalog is not None:
+            mean_altitude = (catalog["perigee"] + catalog["apogee"]) / 2.0
+        else:
+            mean_altitude = np.zeros(0, dtype=np.float32)
+
+        conjunctions = self.upcoming_conjunctions()
+        levels = [conjunction["risk_level"] for conjunction in conjunctions]
+
+        # Chance of at least one collision in the next day, as the forecast
+        # gives it, extrapolated at the same daily rate beyond that
+        next_24h = self.collision_forecast(1)[0]["probability"]
+
+        regions = {
+            "leo": (0, 2000),
+            "meo": (2000, 35786),
+            "geo": (35786, np.inf)
+        }
+        orbital_regions = {}
+        for region, (low, high) in regions.items():
+            region_levels = [c["risk_level"] for c in conjunctions if low < c["altitude"] <= high]
+            orbital_regions[region] = {
+                "objects": int(np.count_nonzero((mean_altitude > low) & (mean_altitude <= high))),
+                "risk": "high" if "alert" in region_levels else "medium" if "watch" in region_levels else "low"
+            }
+
         current_risks = {
-            "total_objects": random.randint(150, 200),
-            "high_risk_objects": random.randint(5, 15),
-            "medium_risk_objects": random.randint(20, 40),
-            "low_risk_objects": random.randint(100, 150),
-            "active_alerts": random.randint(0, 3),
+            "total_objects": len(catalog) if catalog is not None else 0,
+            "high_risk_objects": risk_counts.get("high", 0),
+            "medium_risk_objects": risk_counts.get("medium", 0),
+            "low_risk_objects": risk_counts.get("low", 0),
+            "active_alerts": levels.count("alert"),
             "risk_zones": {
-                "safe": random.randint(80, 95),
-                "watch": random.randint(15, 25),
-                "alert": random.randint(0, 8)
+                "safe": levels.count("safe"),
+                "watch": levels.count("watch"),
+                "alert": levels.count("alert")
             },
             "collision_probability": {
-                "next_24h": random.uniform(0.001, 0.05),
-                "next_week": random.uniform(0.01, 0.15),
-                "next_month": random.uniform(0.05, 0.3)
-            },
-            "critical_conjunctions": await self._generate_conjunctions(),
-            "orbital_regions": {
-                "leo": {"objects": random.randint(80, 120), "risk": "medium"},
-                "meo": {"objects": random.randint(20, 40), "risk": "low"},
-                "geo": {"objects": random.randint(10, 25), "risk": "low"}
+                "next_24h": next_24h,
+                "next_week": 1.0 - (1.0 - next_24h) ** 7,
+                "next_month": 1.0 - (1.0 - next_24h) ** 30
             },
+            "total_conjunctions": len(conjunctions),
+            "critical_conjunctions": conjunctions[:MAX_REPORTED_CONJUNCTIONS],
+            "orbital_regions": orbital_regions,
+            "screening": self.get_screening_stats(),
             "timestamp": datetime.utcnow().isoformat()
         }
         
         return current_risks
         
-    async def _generate_conjunctions(self) -> List[Dict]:
-        """Generate simulated conjunction events"""
-        conjunctions = []
-        
-        for i in range(random.randint(2, 6)):
-            conjunction = {
-                "id": f"CONJ-{i+1:03d}",
-                "primary_object": f"SAT-{random.randint(1000, 9999)}",
-                "secondary_object": f"DEB-{random.randint(1000, 9999)}",
-                "time_of_closest_approach": (datetime.utcnow() + timedelta(hours=random.uniform(1, 48))).isoformat(),
-                "miss_distance": random.uniform(0.1, 15.0),  # km
-                "collision_probability": random.uniform(0.0001, 0.1),
-                "risk_level": self._calculate_risk_level(random.uniform(0.1, 15.0)),
-                "relative_velocity": random.uniform(5.0, 15.0)  # km/s
-            }
-            conjunctions.append(conjunction)
-            
-        return sorted(conjunctions, key=lambda x: x["collision_probability"], reverse=True)
-        
-    def _calculate_risk_level(self, miss_distance: float) -> str:
-        """Calculate risk level based on miss distance"""
-        if miss_distance <= self.risk_thresholds["alert"]:
+    def _calculate_risk_level(self, miss_distance: float, probability: float = 0.0) -> str:
+        """Calculate risk level based on miss distance and collision probability"""
+        if miss_distance <= self.risk_thresholds["alert"] or probability >= self.probability_thresholds["alert"]:
             return "alert"
-        elif miss_distance <= self.risk_thresholds["watch"]:
+        elif miss_distance <= self.risk_thresholds["watch"] or probability >= self.probability_thresholds["watch"]:
             return "watch"
         else:
             return "safe"
@@ -110,4 +348,9 @@ class RiskAnalyzer:
             "peak_risk_time": (datetime.utcnow() + timedelta(hours=random.uniform(6, 18))).isoformat()
         }
         
-        return predictions
\ No newline at end of file
+        return predictions
+
+    async def close(self):
+        """Stop background screening"""
+        if self._screening_task:
+            self._screening_task.cancel()
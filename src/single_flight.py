@@ -0,0 +1,79 @@
+"""
+Single-flight coalescing for expensive async calls
+Concurrent callers asking for the same key await one shared task instead of
+each repeating the upstream request or computation
+"""
+
+import asyncio
+import functools
+from typing import Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Every decorated function's group, by name, for stats reporting
+_groups: Dict[str, "SingleFlight"] = {}
+
+
+class SingleFlight:
+    """At most one in-flight call per key; later callers share its result
+
+    The work runs as its own task, so a caller that is cancelled (e.g. a
+    disconnected client) does not cancel it for the others. Nothing is
+    kept once the call finishes: results are shared, not cached.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.executions = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.create_task(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Retrieve the exception so a call whose callers all left isn't reported unhandled
+        if not task.cancelled():
+            task.exception()
+
+    def get_stats(self) -> Dict:
+        return {
+            "executions": self.executions,
+            "shared": self.shared,
+            "in_flight": len(self._calls)
+        }
+
+
+def single_flight(key: Optional[Callable[..., Hashable]] = None, name: Optional[str] = None):
+    """Coalesce concurrent calls of an async function (or method)
+
+    Calls share a flight when ``key(*args, **kwargs)`` matches; by default
+    the key is the arguments themselves, including ``self`` for methods.
+    """
+    def decorator(func):
+        group = SingleFlight(name or func.__qualname__)
+        _groups[group.name] = group
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            flight_key = key(*args, **kwargs) if key else (args, tuple(sorted(kwargs.items())))
+            return await group.do(flight_key, lambda: func(*args, **kwargs))
+
+        wrapper.single_flight = group
+        return wrapper
+    return decorator
+
+
+def get_stats() -> Dict[str, Dict]:
+    """Executions vs. shared callers for every coalesced function"""
+    return {name: group.get_stats() for name, group in _groups.items()}
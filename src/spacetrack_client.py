@@ -2,28 +2,77 @@ import httpx
 import asyncio
 import os
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Sequence
 import json
 
+import numpy as np
+
+from .http_cache import http_cache
+from .object_classifier import (
+    DEBRIS, LOW, MISSION_TYPES, OBJECT_TYPES, RISK_LEVELS,
+    classify, field_array, labels, rcs_debris_risk, rcs_size_estimates
+)
+from .rate_limiter import TokenBucket
+from .replay import replay_transport
+from .single_flight import single_flight
+
+# Space-Track's published limits are 30 requests/minute and 300/hour
+SPACETRACK_REQUESTS_PER_MINUTE = float(os.getenv("SPACETRACK_REQUESTS_PER_MINUTE", "30"))
+SPACETRACK_REQUESTS_PER_HOUR = float(os.getenv("SPACETRACK_REQUESTS_PER_HOUR", "300"))
+
+# NORAD ID lookups arriving within this window share one query
+SPACETRACK_BATCH_WINDOW_SECONDS = float(os.getenv("SPACETRACK_BATCH_WINDOW_SECONDS", "0.05"))
+SPACETRACK_BATCH_SIZE = int(os.getenv("SPACETRACK_BATCH_SIZE", "500"))  # IDs per query URL
+
+# Point at the local replay server (python -m src.replay serve) for offline runs
+SPACETRACK_BASE_URL = os.getenv("SPACETRACK_BASE_URL", "https://www.space-track.org").rstrip("/")
+
 class SpaceTrackClient:
     """Client for Space-Track.org API"""
     
     def __init__(self):
-        self.base_url = "https://www.space-track.org"
+        self.base_url = SPACETRACK_BASE_URL
+        # None uses the network; ORBITAL_DATA_REPLAY swaps in the offline replay
+        self.transport = replay_transport()
         self.username = os.getenv("SPACETRACK_USERNAME")
         self.password = os.getenv("SPACETRACK_PASSWORD")
         self.session = None
         self.cache = {}
         self.cache_duration = timedelta(hours=2)  # Cache for 2 hours
+        self.logged_in = False
+        self._login_lock = asyncio.Lock()
+        self.rate_limits = [
+            TokenBucket(SPACETRACK_REQUESTS_PER_MINUTE, per=60.0),
+            TokenBucket(SPACETRACK_REQUESTS_PER_HOUR, per=3600.0)
+        ]
+        self.batch_window = SPACETRACK_BATCH_WINDOW_SECONDS
+        self.batch_size = max(1, SPACETRACK_BATCH_SIZE)
+        self._pending_lookups: Dict[int, List[asyncio.Future]] = {}
+        self._flush_task = None
+        self.lookup_stats = {"lookups": 0, "batches": 0, "ids_queried": 0, "logins": 0}
+
+    async def _throttle(self, request: httpx.Request):
+        """Request hook: every call on the session waits for a rate-limit token"""
+        for bucket in self.rate_limits:
+            await bucket.acquire()
         
     async def login(self):
-        """Login to Space-Track.org"""
+        """Login to Space-Track.org, reusing the session while it is valid"""
         if not self.username or not self.password:
             print("⚠️  Space-Track.org credentials not found in environment")
             return False
-            
+
+        async with self._login_lock:
+            if self.logged_in and self.session is not None and not self.session.is_closed:
+                return True
+            return await self._login()
+
+    async def _login(self):
         try:
-            self.session = httpx.AsyncClient(timeout=30.0)
+            if self.session is None or self.session.is_closed:
+                # One client for the process: keeps the auth cookie and pooled connections
+                self.session = httpx.AsyncClient(timeout=30.0, transport=self.transport,
+                                                 event_hooks={"request": [self._throttle]})
             
             login_data = {
                 'identity': self.username,
@@ -35,7 +84,9 @@ class SpaceTrackClient:
                 data=login_data
             )
             
-            if response.status_code == 200:
+            self.lookup_stats["logins"] += 1
+            self.logged_in = response.status_code == 200
+            if self.logged_in:
                 print("✅ Space-Track.org login successful")
                 return True
             else:
@@ -58,7 +109,27 @@ class SpaceTrackClient:
     def cache_data(self, cache_key: str, data: List[Dict]):
         """Cache data with timestamp"""
         self.cache[cache_key] = (data, datetime.now())
+
+    async def query(self, url: str) -> httpx.Response:
+        """Run a query through the disk cache, logging in only when needed
+
+        A fresh cached copy needs no session at all; without credentials or
+        network any stored copy is served (HTTP 504 when there is none).
+        """
+        max_age = self.cache_duration.total_seconds()
+        if http_cache.is_fresh(url, max_age):
+            return await http_cache.get(self.session, url, max_age)
+        if not await self.login():
+            return await http_cache.get(self.session, url, max_age, offline=True)
+        response = await http_cache.get(self.session, url, max_age)
+        if response.status_code == 401:
+            # Session cookie expired: log in again once and retry
+            self.logged_in = False
+            if await self.login():
+                response = await http_cache.get(self.session, url, max_age)
+        return response
     
+    @single_flight()
     async def get_latest_tle(self, limit: int = 100) -> List[Dict]:
         """Get latest TLE data for all objects"""
         cache_key = f"latest_tle_{limit}"
@@ -68,14 +139,10 @@ class SpaceTrackClient:
         if cached_data:
             return cached_data
         
-        if not self.session:
-            if not await self.login():
-                return []
-        
         try:
             query = f"{self.base_url}/basicspacedata/query/class/tle_latest/ORDINAL/1/limit/{limit}/format/json"
             
-            response = await self.session.get(query)
+            response = await self.query(query)
             
             if response.status_code == 200:
                 data = response.json()
@@ -90,6 +157,7 @@ class SpaceTrackClient:
             print(f"❌ Error fetching TLE data: {e}")
             return []
     
+    @single_flight()
     async def get_debris_objects(self, limit: int = 50) -> List[Dict]:
         """Get debris objects specifically"""
         cache_key = f"debris_{limit}"
@@ -99,14 +167,10 @@ class SpaceTrackClient:
         if cached_data:
             return cached_data
         
-        if not self.session:
-            if not await self.login():
-                return []
-        
         try:
             query = f"{self.base_url}/basicspacedata/query/class/tle_latest/OBJECT_TYPE/DEBRIS/limit/{limit}/format/json"
             
-            response = await self.session.get(query)
+            response = await self.query(query)
             
             if response.status_code == 200:
                 data = response.json()
@@ -121,6 +185,7 @@ class SpaceTrackClient:
             print(f"❌ Error fetching debris data: {e}")
             return []
     
+    @single_flight()
     async def get_active_satellites(self, limit: int = 30) -> List[Dict]:
         """Get active satellites"""
         cache_key = f"satellites_{limit}"
@@ -130,15 +195,11 @@ class SpaceTrackClient:
         if cached_data:
             return cached_data
         
-        if not self.session:
-            if not await self.login():
-                return []
-        
         try:
             # Get payloads (active satellites)
             query = f"{self.base_url}/basicspacedata/query/class/tle_latest/OBJECT_TYPE/PAYLOAD/limit/{limit}/format/json"
             
-            response = await self.session.get(query)
+            response = await self.query(query)
             
             if response.status_code == 200:
                 data = response.json()
@@ -156,155 +217,157 @@ class SpaceTrackClient:
             return []
     
     async def get_object_by_norad_id(self, norad_id: int) -> Optional[Dict]:
-        """Get specific object by NORAD ID"""
+        """Get specific object by NORAD ID
+
+        Lookups are queued for a short window and answered together by one
+        comma-separated NORAD_CAT_ID query per batch.
+        """
         cache_key = f"object_{norad_id}"
         
         # Check cache first
         cached_data = await self.get_cached_data(cache_key)
         if cached_data and len(cached_data) > 0:
             return cached_data[0]
-        
-        if not self.session:
-            if not await self.login():
-                return None
-        
+
+        self.lookup_stats["lookups"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending_lookups.setdefault(int(norad_id), []).append(future)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_lookups())
+        return await future
+
+    async def get_objects_by_norad_ids(self, norad_ids: Sequence[int]) -> Dict[int, Optional[Dict]]:
+        """Look up many objects at once; they share the same batched queries"""
+        unique = list(dict.fromkeys(int(norad_id) for norad_id in norad_ids))
+        results = await asyncio.gather(*(self.get_object_by_norad_id(norad_id) for norad_id in unique))
+        return dict(zip(unique, results))
+
+    async def _flush_lookups(self):
+        """Answer every lookup queued during the batch window"""
+        await asyncio.sleep(self.batch_window)
+        pending, self._pending_lookups = self._pending_lookups, {}
+        self._flush_task = None
+
+        norad_ids = sorted(pending)
+        batches = [norad_ids[i:i + self.batch_size] for i in range(0, len(norad_ids), self.batch_size)]
+        found = await asyncio.gather(*(self._query_batch(batch) for batch in batches))
+
+        records = {}
+        for batch_records in found:
+            records.update(batch_records)
+        for norad_id, futures in pending.items():
+            record = records.get(norad_id)
+            if record is not None:
+                self.cache_data(f"object_{norad_id}", [record])
+            for future in futures:
+                if not future.done():
+                    future.set_result(record)
+
+    async def _query_batch(self, norad_ids: List[int]) -> Dict[int, Dict]:
+        """Latest element set for each NORAD ID in one query"""
+        self.lookup_stats["batches"] += 1
+        self.lookup_stats["ids_queried"] += len(norad_ids)
+        id_list = ",".join(str(norad_id) for norad_id in norad_ids)
         try:
-            query = f"{self.base_url}/basicspacedata/query/class/tle_latest/NORAD_CAT_ID/{norad_id}/format/json"
+            query = f"{self.base_url}/basicspacedata/query/class/tle_latest/ORDINAL/1/NORAD_CAT_ID/{id_list}/format/json"
             
-            response = await self.session.get(query)
+            response = await self.query(query)
             
             if response.status_code == 200:
-                data = response.json()
-                if data:
-                    self.cache_data(cache_key, data)
-                    print(f"✅ Retrieved object {norad_id} from Space-Track.org")
-                    return data[0]
-                else:
-                    print(f"⚠️  Object {norad_id} not found")
-                    return None
+                records = {int(item['NORAD_CAT_ID']): item for item in response.json()}
+                missing = len(norad_ids) - len(records)
+                print(f"✅ Retrieved {len(records)} objects from Space-Track.org in one query"
+                      + (f" ({missing} not found)" if missing else ""))
+                return records
             else:
                 print(f"❌ Space-Track API error: {response.status_code}")
-                return None
+                return {}
                 
         except Exception as e:
-            print(f"❌ Error fetching object {norad_id}: {e}")
-            return None
-    
-    def convert_spacetrack_to_tle(self, spacetrack_data: Dict) -> Dict:
-        """Convert Space-Track.org format to our internal TLE format"""
-        try:
-            # Determine object type and risk level
-            object_type = spacetrack_data.get('OBJECT_TYPE', 'UNKNOWN').lower()
-            if object_type == 'debris':
-                risk_level = self.calculate_debris_risk(spacetrack_data)
-            else:
-                risk_level = 'low'
-            
-            # Convert to our format
-            tle_data = {
-                "name": spacetrack_data.get('OBJECT_NAME', 'UNKNOWN'),
-                "norad_id": int(spacetrack_data.get('NORAD_CAT_ID', 0)),
-                "line1": spacetrack_data.get('TLE_LINE1', ''),
-                "line2": spacetrack_data.get('TLE_LINE2', ''),
-                "object_type": "debris" if object_type == 'debris' else "satellite",
-                "size_estimate": self.estimate_size(spacetrack_data),
-                "risk_level": risk_level,
-                "country_code": spacetrack_data.get('COUNTRY_CODE', 'UNKNOWN'),
-                "launch_date": spacetrack_data.get('LAUNCH_DATE'),
-                "decay_date": spacetrack_data.get('DECAY_DATE'),
-                "rcs_size": spacetrack_data.get('RCS_SIZE', 'UNKNOWN'),
-                "last_updated": datetime.now().isoformat()
+            print(f"❌ Error fetching {len(norad_ids)} objects: {e}")
+            return {}
+
+    def get_stats(self) -> Dict:
+        """Batching and rate-limit counters"""
+        return {
+            **self.lookup_stats,
+            "logged_in": self.logged_in,
+            "rate_limits": {
+                "per_minute": self.rate_limits[0].get_stats(),
+                "per_hour": self.rate_limits[1].get_stats()
             }
-            
-            # Add mission type for satellites
-            if object_type != 'debris':
-                tle_data["mission_type"] = self.determine_mission_type(spacetrack_data)
-            
-            return tle_data
-            
-        except Exception as e:
-            print(f"❌ Error converting Space-Track data: {e}")
-            return None
-    
-    def calculate_debris_risk(self, spacetrack_data: Dict) -> str:
-        """Calculate risk level for debris objects"""
-        try:
-            # Factors for risk assessment
-            altitude = float(spacetrack_data.get('SEMIMAJOR_AXIS', 0)) - 6371  # Convert to altitude
-            rcs_size = spacetrack_data.get('RCS_SIZE', 'UNKNOWN')
-            eccentricity = float(spacetrack_data.get('ECCENTRICITY', 0))
-            
-            risk_score = 0
-            
-            # Altitude risk (LEO is higher risk)
-            if 200 <= altitude <= 2000:  # LEO
-                risk_score += 3
-            elif 2000 < altitude <= 35786:  # MEO
-                risk_score += 2
-            else:  # GEO or very low
-                risk_score += 1
-            
-            # Size risk
-            if rcs_size == 'LARGE':
-                risk_score += 3
-            elif rcs_size == 'MEDIUM':
-                risk_score += 2
-            elif rcs_size == 'SMALL':
-                risk_score += 1
-            
-            # Eccentricity risk (highly elliptical orbits cross more paths)
-            if eccentricity > 0.1:
-                risk_score += 2
-            elif eccentricity > 0.05:
-                risk_score += 1
-            
-            # Convert score to risk level
-            if risk_score >= 6:
-                return 'high'
-            elif risk_score >= 4:
-                return 'medium'
-            else:
-                return 'low'
-                
-        except Exception:
-            return 'medium'  # Default to medium if calculation fails
-    
-    def estimate_size(self, spacetrack_data: Dict) -> float:
-        """Estimate object size based on RCS"""
-        rcs_size = spacetrack_data.get('RCS_SIZE', 'UNKNOWN')
-        
-        size_map = {
-            'LARGE': 5.0,    # > 1m
-            'MEDIUM': 0.5,   # 10cm - 1m
-            'SMALL': 0.05,   # < 10cm
-            'UNKNOWN': 0.1   # Default estimate
         }
-        
-        return size_map.get(rcs_size, 0.1)
-    
-    def determine_mission_type(self, spacetrack_data: Dict) -> str:
-        """Determine mission type for satellites"""
-        name = spacetrack_data.get('OBJECT_NAME', '').upper()
-        
-        if 'ISS' in name or 'STATION' in name:
-            return 'crewed_station'
-        elif 'STARLINK' in name or 'ONEWEB' in name:
-            return 'communication'
-        elif 'GPS' in name or 'GLONASS' in name or 'GALILEO' in name:
-            return 'navigation'
-        elif 'WEATHER' in name or 'GOES' in name or 'NOAA' in name:
-            return 'weather'
-        elif 'HUBBLE' in name or 'TELESCOPE' in name:
-            return 'science'
-        elif 'MILITARY' in name or 'DEFENSE' in name:
-            return 'military'
-        else:
-            return 'other'
     
+    def convert_spacetrack_to_tle(self, spacetrack_data: Dict) -> Optional[Dict]:
+        """Convert one Space-Track.org record to our internal TLE format"""
+        converted = self.convert_spacetrack_batch([spacetrack_data])
+        return converted[0] if converted else None
+
+    def convert_spacetrack_batch(self, items: List[Dict]) -> List[Dict]:
+        """Convert Space-Track.org records, classifying the whole batch in one pass"""
+        if not items:
+            return []
+        names = [item.get('OBJECT_NAME') or 'UNKNOWN' for item in items]
+        rcs_sizes = [item.get('RCS_SIZE', 'UNKNOWN') for item in items]
+        classes = classify(names, object_types=[item.get('OBJECT_TYPE', 'UNKNOWN') for item in items])
+
+        # Risk only matters for debris; everything else is low
+        risk = np.full(len(items), LOW, dtype=np.int8)
+        debris_rows = np.flatnonzero(classes["object_type"] == DEBRIS)
+        if len(debris_rows):
+            debris_items = [items[i] for i in debris_rows]
+            risk[debris_rows] = rcs_debris_risk(
+                field_array(debris_items, 'SEMIMAJOR_AXIS', 0.0),
+                [rcs_sizes[i] for i in debris_rows],
+                field_array(debris_items, 'ECCENTRICITY', 0.0)
+            )
+
+        object_types = labels(OBJECT_TYPES, classes["object_type"])
+        missions = labels(MISSION_TYPES, classes["mission_type"])
+        risk_levels = labels(RISK_LEVELS, risk)
+        sizes = rcs_size_estimates(rcs_sizes).tolist()
+        last_updated = datetime.now().isoformat()
+
+        converted = []
+        for i, item in enumerate(items):
+            try:
+                tle_data = {
+                    "name": names[i],
+                    "norad_id": int(item.get('NORAD_CAT_ID', 0)),
+                    "line1": item.get('TLE_LINE1', ''),
+                    "line2": item.get('TLE_LINE2', ''),
+                    "object_type": object_types[i],
+                    "size_estimate": sizes[i],
+                    "risk_level": risk_levels[i],
+                    "country_code": item.get('COUNTRY_CODE', 'UNKNOWN'),
+                    "launch_date": item.get('LAUNCH_DATE'),
+                    "decay_date": item.get('DECAY_DATE'),
+                    "rcs_size": rcs_sizes[i],
+                    "data_source": "spacetrack",
+                    "last_updated": last_updated
+                }
+                # Mission type only for satellites
+                if missions[i] is not None:
+                    tle_data["mission_type"] = missions[i]
+                converted.append(tle_data)
+            except Exception as e:
+                print(f"❌ Error converting Space-Track data: {e}")
+        return converted
+
     async def close(self):
         """Close the HTTP session"""
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        for futures in self._pending_lookups.values():
+            for future in futures:
+                if not future.done():
+                    future.set_result(None)
+        self._pending_lookups = {}
         if self.session:
             await self.session.aclose()
+            self.session = None
+            self.logged_in = False
             print("📴 Space-Track.org session closed")
 
 # Global instance
@@ -0,0 +1,126 @@
+"""
+Parse-once cache of initialised SGP4 records
+Keyed by NORAD ID and TLE epoch so records are rebuilt only for new element sets
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .batch_propagator import batch_propagator
+
+
+class SatrecCache:
+    """Holds one initialised SGP4 record per NORAD ID for its current epoch"""
+
+    def __init__(self):
+        self._records: Dict[int, Tuple[str, object]] = {}
+        self._arrays: Dict[str, Tuple[int, List[int], object]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.array_hits = 0
+        self.array_builds = 0
+
+    @staticmethod
+    def epoch_key(line1: str) -> str:
+        """TLE epoch field (YYDDD.DDDDDDDD) used as the cache version"""
+        return line1[18:32].strip()
+
+    def get(self, obj: Dict):
+        """Get the SGP4 record for a catalog object, parsing only on a miss"""
+        norad_id = obj["norad_id"]
+        epoch = self.epoch_key(obj["line1"])
+
+        entry = self._records.get(norad_id)
+        if entry is not None and entry[0] == epoch:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        return self._store(norad_id, epoch, obj)
+
+    def get_array(self, collection: str, version: int,
+                  load_objects: Callable[[], Sequence[Dict]]) -> Tuple[List[int], object]:
+        """Get a packed SatrecArray for a catalog collection
+
+        Returns the positions of the objects that parsed successfully and the
+        array of their records. The packed array is reused until the catalog
+        version changes, so ``load_objects`` is only called on a rebuild.
+        """
+        packed = self._arrays.get(collection)
+        if packed is not None and packed[0] == version:
+            self.array_hits += 1
+            return packed[1], packed[2]
+
+        self.array_builds += 1
+        objects = load_objects()
+
+        rows = []
+        satrecs = []
+        for index, obj in enumerate(objects):
+            try:
+                satrecs.append(self.get(obj))
+                rows.append(index)
+            except Exception as e:
+                print(f"Error parsing TLE for {obj.get('name')}: {e}")
+
+        satrec_array = batch_propagator.build_array(satrecs) if satrecs else None
+        self._arrays[collection] = (version, rows, satrec_array)
+        return rows, satrec_array
+
+    def warm(self, objects: Iterable[Dict]) -> int:
+        """Parse any new element sets ahead of propagation requests"""
+        parsed = 0
+        for obj in objects:
+            try:
+                norad_id = obj["norad_id"]
+                epoch = self.epoch_key(obj["line1"])
+                entry = self._records.get(norad_id)
+                if entry is None or entry[0] != epoch:
+                    self._store(norad_id, epoch, obj)
+                    parsed += 1
+            except Exception as e:
+                print(f"Error parsing TLE for {obj.get('name')}: {e}")
+        return parsed
+
+    def prune(self, norad_ids: Iterable[int]):
+        """Drop records for objects no longer in the catalog"""
+        keep = set(norad_ids)
+        for norad_id in [n for n in self._records if n not in keep]:
+            del self._records[norad_id]
+
+    def discard(self, norad_ids: Iterable[int]):
+        """Drop records for specific objects (removed from the catalog)"""
+        for norad_id in norad_ids:
+            self._records.pop(norad_id, None)
+
+    def invalidate_arrays(self, collection: Optional[str] = None):
+        """Forget packed arrays after a collection is replaced"""
+        if collection is None:
+            self._arrays.clear()
+        else:
+            self._arrays.pop(collection, None)
+
+    def _store(self, norad_id: int, epoch: str, obj: Dict):
+        if norad_id in self._records:
+            self.invalidations += 1
+        satrec = batch_propagator.satrec_from_tle(obj["line1"], obj["line2"])
+        self._records[norad_id] = (epoch, satrec)
+        return satrec
+
+    def get_stats(self) -> Dict:
+        """Cache hit/miss counters (hit rate is per record; packed array reuse is counted separately)"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._records),
+            "packed_collections": len(self._arrays),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "array_hits": self.array_hits,
+            "array_builds": self.array_builds
+        }
+
+
+# Global instance
+satrec_cache = SatrecCache()
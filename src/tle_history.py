@@ -0,0 +1,141 @@
+"""
+Multi-epoch TLE history
+Keeps a bounded number of element sets per NORAD ID in sorted columnar
+arrays so propagation can use the element set nearest the target time
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from .batch_propagator import batch_propagator
+from .catalog_store import ELEMENT_COLUMNS
+from .lru_cache import LRUCache
+
+# Element columns needed to rebuild an SGP4 record
+HISTORY_COLUMNS = {
+    name: ELEMENT_COLUMNS[name]
+    for name in ("norad_id", "ndot", "nddot", "bstar", "inclination", "raan",
+                 "eccentricity", "arg_perigee", "mean_anomaly", "mean_motion")
+}
+HISTORY_COLUMNS["epoch_jd"] = np.float64
+
+SGP4_EPOCH_ORIGIN_JD = 2433281.5  # 1949 Dec 31 00:00 UT
+
+
+class TLEHistory:
+    """Element sets sorted by (NORAD ID, epoch), at most ``depth`` per object"""
+
+    def __init__(self, depth: int = 8, satrec_entries: int = 4096):
+        self.depth = max(1, depth)
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.zeros(0, dtype=dtype) for name, dtype in HISTORY_COLUMNS.items()
+        }
+        # Sort key: NORAD ID in the high 32 bits, epoch seconds since 1950 in the low 32
+        self.keys = np.zeros(0, dtype=np.int64)
+        self._satrecs = LRUCache(satrec_entries)
+        self.lookups = 0
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    @staticmethod
+    def make_keys(norad_ids, epoch_jd) -> np.ndarray:
+        seconds = np.rint((np.asarray(epoch_jd, dtype=np.float64) - SGP4_EPOCH_ORIGIN_JD) * 86400.0)
+        seconds = np.clip(seconds, 0, 2 ** 32 - 1).astype(np.int64)
+        return (np.asarray(norad_ids, dtype=np.int64) << 32) | seconds
+
+    def record(self, catalog, indices: Optional[Sequence[int]] = None) -> int:
+        """Add the catalog's current element sets; returns how many were new"""
+        if indices is None:
+            indices = np.arange(len(catalog))
+        incoming = {name: catalog[name][indices] for name in HISTORY_COLUMNS if name != "epoch_jd"}
+        incoming["epoch_jd"] = catalog.epoch_jd(indices)
+        incoming_keys = self.make_keys(incoming["norad_id"], incoming["epoch_jd"])
+        new_count = int(np.count_nonzero(~np.isin(incoming_keys, self.keys)))
+        if new_count == 0:
+            return 0
+
+        keys = np.concatenate([self.keys, incoming_keys])
+        columns = {
+            name: np.concatenate([self.columns[name], incoming[name].astype(dtype)])
+            for name, dtype in HISTORY_COLUMNS.items()
+        }
+
+        # Stable sort keeps the newest copy last within runs of equal keys
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        keep = np.r_[keys[1:] != keys[:-1], True]
+
+        # Trim each object to its ``depth`` most recent epochs
+        kept = np.flatnonzero(keep)
+        kept_norad = keys[kept] >> 32
+        newer_or_same = np.searchsorted(kept_norad, kept_norad, side="right") - np.arange(len(kept))
+        kept = kept[newer_or_same <= self.depth]
+
+        self.keys = keys[kept]
+        self.columns = {name: column[order][kept] for name, column in columns.items()}
+        return new_count
+
+    def nearest(self, norad_ids, target_jd) -> np.ndarray:
+        """History row whose epoch is nearest each target time (-1 if unknown)
+
+        Binary search on the sorted keys finds the first element set at or
+        after the target; the nearer of it and its predecessor wins.
+        """
+        self.lookups += 1
+        norad_ids = np.asarray(norad_ids, dtype=np.int64)
+        target_jd = np.asarray(target_jd, dtype=np.float64)
+        norad_ids, target_jd = np.broadcast_arrays(norad_ids, target_jd)
+        if len(self.keys) == 0:
+            return np.full(norad_ids.shape, -1, dtype=np.int64)
+
+        first = np.searchsorted(self.keys, norad_ids << 32, side="left")
+        stop = np.searchsorted(self.keys, (norad_ids + 1) << 32, side="left")
+        after = np.searchsorted(self.keys, self.make_keys(norad_ids, target_jd), side="left")
+        before = after - 1
+
+        epochs = self.columns["epoch_jd"]
+        last = len(epochs) - 1
+        has_before = before >= first
+        has_after = after < stop
+        before_gap = np.where(has_before, target_jd - epochs[np.clip(before, 0, last)], np.inf)
+        after_gap = np.where(has_after, epochs[np.clip(after, 0, last)] - target_jd, np.inf)
+
+        choice = np.where(after_gap < before_gap, after, before)
+        return np.where(has_before | has_after, choice, -1)
+
+    def epochs(self, norad_id: int) -> np.ndarray:
+        """Julian dates of every stored element set for one object"""
+        first, stop = np.searchsorted(self.keys, [norad_id << 32, (norad_id + 1) << 32])
+        return self.columns["epoch_jd"][first:stop]
+
+    def elements(self, rows) -> Dict[str, np.ndarray]:
+        """Element columns for history rows, in the layout propagate_elements expects"""
+        return {name: column[rows] for name, column in self.columns.items() if name != "norad_id"}
+
+    def satrec(self, row: int):
+        """SGP4 record for one history row, initialised from its mean elements"""
+        key = int(self.keys[row])
+        satrec = self._satrecs.get(key)
+        if satrec is None:
+            elements = {name: float(column[row]) for name, column in self.columns.items()}
+            satrec = batch_propagator.satrec_from_elements(
+                int(self.columns["norad_id"][row]), elements["epoch_jd"], elements
+            )
+            self._satrecs.put(key, satrec)
+        return satrec
+
+    def get_stats(self) -> Dict:
+        nbytes = self.keys.nbytes + sum(column.nbytes for column in self.columns.values())
+        return {
+            "depth": self.depth,
+            "element_sets": len(self.keys),
+            "objects": int(len(np.unique(self.keys >> 32))),
+            "memory_kb": round(nbytes / 1024, 1),
+            "lookups": self.lookups,
+            "satrec_cache": self._satrecs.get_stats()
+        }
@@ -13,6 +13,10 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Set both to the replay server (python -m src.replay serve) to test offline
+CELESTRAK_BASE_URL = os.getenv("CELESTRAK_BASE_URL", "https://celestrak.org").rstrip("/")
+SPACETRACK_BASE_URL = os.getenv("SPACETRACK_BASE_URL", "https://www.space-track.org").rstrip("/")
+
 class Colors:
     HEADER = '\033[95m'
     OKBLUE = '\033[94m'
@@ -51,7 +55,7 @@ async def test_celestrak():
         print_info("Test 1: Fetching ISS data...")
         try:
             response = await client.get(
-                "https://celestrak.org/NORAD/elements/gp.php?CATNR=25544&FORMAT=json"
+                f"{CELESTRAK_BASE_URL}/NORAD/elements/gp.php?CATNR=25544&FORMAT=json"
             )
             if response.status_code == 200:
                 data = response.json()
@@ -74,7 +78,7 @@ async def test_celestrak():
         print_info("Test 2: Fetching Starlink satellites...")
         try:
             response = await client.get(
-                "https://celestrak.org/NORAD/elements/gp.php?GROUP=starlink&FORMAT=json"
+                f"{CELESTRAK_BASE_URL}/NORAD/elements/gp.php?GROUP=starlink&FORMAT=json"
             )
             if response.status_code == 200:
                 data = response.json()
@@ -93,7 +97,7 @@ async def test_celestrak():
         print_info("Test 3: Fetching debris objects...")
         try:
             response = await client.get(
-                "https://celestrak.org/NORAD/elements/gp.php?GROUP=cosmos-2251-debris&FORMAT=json"
+                f"{CELESTRAK_BASE_URL}/NORAD/elements/gp.php?GROUP=cosmos-2251-debris&FORMAT=json"
             )
             if response.status_code == 200:
                 data = response.json()
@@ -112,7 +116,7 @@ async def test_celestrak():
         print_info("Test 4: Fetching GPS satellites...")
         try:
             response = await client.get(
-                "https://celestrak.org/NORAD/elements/gp.php?GROUP=gps-ops&FORMAT=json"
+                f"{CELESTRAK_BASE_URL}/NORAD/elements/gp.php?GROUP=gps-ops&FORMAT=json"
             )
             if response.status_code == 200:
                 data = response.json()
@@ -153,7 +157,7 @@ async def test_spacetrack():
             }
             
             response = await client.post(
-                "https://www.space-track.org/ajaxauth/login",
+                f"{SPACETRACK_BASE_URL}/ajaxauth/login",
                 data=login_data
             )
             
@@ -163,7 +167,7 @@ async def test_spacetrack():
                 # Test data fetch
                 print_info("Fetching TLE data...")
                 response = await client.get(
-                    "https://www.space-track.org/basicspacedata/query/class/tle_latest/ORDINAL/1/limit/10/format/json"
+                    f"{SPACETRACK_BASE_URL}/basicspacedata/query/class/tle_latest/ORDINAL/1/limit/10/format/json"
                 )
                 
                 if response.status_code == 200: